@@ -12,6 +12,8 @@ from bootstrap import init_app
 from dotenv import load_dotenv
 from routes.etf_routes import etf_bp
 from routes.index_routes import index_bp
+from routes.health_routes import health_bp
+from routes.job_routes import job_bp
 import atexit
 
 # Load environment variables from .env file
@@ -51,15 +53,22 @@ with app.app_context():
     init_app(app, db)
     app.register_blueprint(blueprint=etf_bp)
     app.register_blueprint(blueprint=index_bp)
+    app.register_blueprint(blueprint=health_bp)
+    app.register_blueprint(blueprint=job_bp)
     logger.info("Starting UpdateQuotesCronJob...")
     app.update_quotes_cronjob.run()  # type: ignore[attr-defined]
+    logger.info("Starting QuoteJobQueue...")
+    app.quote_job_queue.start()  # type: ignore[attr-defined]
 
 # Register cleanup function to stop cron job on exit
 def cleanup() -> None:
-    """Stop cron job when application exits"""
+    """Stop cron job and job queue when application exits"""
     if hasattr(app, "update_quotes_cronjob"):
         logger.info("Stopping UpdateQuotesCronJob...")
         app.update_quotes_cronjob.stop()  # type: ignore[attr-defined]
+    if hasattr(app, "quote_job_queue"):
+        logger.info("Stopping QuoteJobQueue...")
+        app.quote_job_queue.stop()  # type: ignore[attr-defined]
 
 
 atexit.register(cleanup)
@@ -9,6 +9,9 @@ if TYPE_CHECKING:
     from controllers.etf_controller import EtfController
     from controllers.quote_controller import QuoteController
     from controllers.index_controller import IndexController
+    from controllers.health_controller import HealthController
+    from controllers.job_controller import JobController
+    from services.quote_job_queue import QuoteJobQueue
     from services.update_quotes_cronjob import UpdateQuotesCronJob
 
 
@@ -19,4 +22,7 @@ class ApplicationContainer(Protocol):
     etf_controller: EtfController
     quote_controller: QuoteController
     index_controller: IndexController
+    health_controller: HealthController
+    job_controller: JobController
     update_quotes_cronjob: UpdateQuotesCronJob
+    quote_job_queue: QuoteJobQueue
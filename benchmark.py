@@ -0,0 +1,414 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Performance benchmarks for the quote read and ingestion paths.
+
+Runs against an existing SQLite database (default: database/etfs.db) without
+starting the web server or the cron jobs.
+
+Usage:
+    uv run python benchmark.py quotes -t SWDA.MI
+    uv run python benchmark.py ingest --workers 4    # offline replay of database/quotes/*.csv
+    uv run python benchmark.py insert -t SWDA.MI     # quote insert paths on a full-history ticker
+"""
+from __future__ import annotations
+import argparse
+import csv
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+from flask import Flask
+from pandas import DataFrame
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from tabulate import tabulate
+from core.config import DatabaseConfig
+from core.database import db, DatabaseManager
+from core.log import setup_logging
+from dto import QuotePeriod, QuoteResponse
+from models import EtfDAO, QuoteDAO
+from services import QuoteService, ColumnarQuoteStore, EtfService, CsvReplayProvider, FileQuoteProvider
+from services.quote_service import QUOTE_COLUMNS, QUOTE_UPSERT_SQL
+
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+DEFAULT_DATABASE_PATH = Path(DatabaseConfig().relative_path)
+DEFAULT_STORE_PATH = Path(DatabaseConfig().columnar_path)
+DEFAULT_REPEAT = 20
+ETF_DATABASE_PATH = Path("database/ETF.csv")
+QUOTES_DIR = Path("database/quotes")
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+
+
+def create_app(db_path: Path) -> Flask:
+    """Create a minimal Flask app bound to the given SQLite database."""
+    app = Flask(import_name=__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path.resolve()}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    return app
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the median wall time of func in milliseconds (after one warm-up call)."""
+    func()
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+# -----------------------------------------------------------------------------
+# Benchmarks
+# -----------------------------------------------------------------------------
+
+
+def bench_quotes(app: Flask, args: argparse.Namespace) -> None:
+    """Compare the ORM/Pydantic read path with the columnar (Date, Close) path for every period."""
+    rows = []
+    with app.app_context():
+        quote_service = QuoteService(DatabaseManager(db_instance=db))
+        store_service = QuoteService(DatabaseManager(db_instance=db), quote_store=ColumnarQuoteStore(args.store))
+
+        for period in QuotePeriod:
+
+            def orm_path() -> QuoteResponse:
+                quotes = quote_service.get_quotes(args.ticker, period)
+                return QuoteResponse(
+                    ticker=args.ticker,
+                    labels=[quote.date for quote in quotes],
+                    data=[float(quote.close) for quote in quotes],
+                )
+
+            def columnar_path() -> QuoteResponse:
+                dates, closes = quote_service.get_quote_series(args.ticker, period)
+                return QuoteResponse(ticker=args.ticker, labels=dates, data=closes)
+
+            def mmap_path() -> QuoteResponse:
+                dates, closes = store_service.get_quote_series(args.ticker, period)
+                return QuoteResponse(ticker=args.ticker, labels=dates, data=closes)
+
+            points = len(columnar_path().labels)
+            orm_ms = measure(orm_path, args.repeat)
+            columnar_ms = measure(columnar_path, args.repeat)
+            mmap_ms = measure(mmap_path, args.repeat)
+            speedup = orm_ms / columnar_ms if columnar_ms > 0 else float("inf")
+            rows.append(
+                [period.value, points, f"{orm_ms:.2f}", f"{columnar_ms:.2f}", f"{speedup:.1f}x", f"{mmap_ms:.2f}"]
+            )
+
+    headers = ["Period", "Points", "ORM (ms)", "Core SQL (ms)", "Speedup", "Mmap store (ms)"]
+    print(f"Quote read latency for {args.ticker} (median of {args.repeat} runs)")
+    print(tabulate(rows, headers=headers, tablefmt="orgtbl"))
+
+
+class StageTimer:
+    """Thread-safe accumulator of time spent per ingestion stage"""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {"fetch": 0.0, "transform": 0.0, "upsert": 0.0}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[stage] += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self.seconds = dict.fromkeys(self.seconds, 0.0)
+
+
+class TimedReplayProvider(CsvReplayProvider):
+    """CsvReplayProvider recording the time spent in download()"""
+
+    def __init__(self, timer: StageTimer, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.timer = timer
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, DataFrame]:
+        start_time = time.perf_counter()
+        try:
+            return super().download(tickers, start, end)
+        finally:
+            self.timer.add("fetch", time.perf_counter() - start_time)
+
+
+class TimedQuoteService(QuoteService):
+    """QuoteService recording the time spent in the transform and in the whole upsert"""
+
+    def __init__(self, timer: StageTimer, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.timer = timer
+
+    def _prepare_quotes_dataframe(self, df: DataFrame) -> DataFrame:
+        start_time = time.perf_counter()
+        try:
+            return super()._prepare_quotes_dataframe(df)
+        finally:
+            self.timer.add("transform", time.perf_counter() - start_time)
+
+    def _bulk_insert_quotes(self, *args: Any, **kwargs: Any) -> dict[str, int]:
+        start_time = time.perf_counter()
+        try:
+            return super()._bulk_insert_quotes(*args, **kwargs)
+        finally:
+            self.timer.add("upsert", time.perf_counter() - start_time)
+
+    def store_staged_quotes(self, *args: Any, **kwargs: Any) -> tuple[dict[str, dict[str, int]], dict[str, str]]:
+        start_time = time.perf_counter()
+        try:
+            return super().store_staged_quotes(*args, **kwargs)
+        finally:
+            self.timer.add("upsert", time.perf_counter() - start_time)
+
+
+def create_ingestion_database(app: Flask) -> int:
+    """Create the schema in an empty database and load the ETF universe from ETF.csv; return the ETF count."""
+    with app.app_context():
+        db.create_all()
+        with open(ETF_DATABASE_PATH) as csvfile:
+            for row in csv.DictReader(csvfile):
+                # Only the ticker matters to the ingestion; the other NOT NULL fields get placeholders
+                db.session.add(
+                    EtfDAO(
+                        ticker=row["Ticker"],
+                        name=row["Name"][:50],
+                        isin=row["ISIN"],
+                        launchDate="1970-01-01",
+                        currency=row["Currency"] if row["Currency"] in ("EUR", "USD") else "EUR",
+                        dividendType=row["Dividend"] or "Accumulazione",
+                    )
+                )
+        db.session.commit()
+        return db.session.execute(text("SELECT COUNT(*) FROM etfs")).scalar_one()
+
+
+def bench_ingest(app: Flask, args: argparse.Namespace) -> None:
+    """Run update_all_etf_quotes end to end on an empty and on a one-day-stale database (offline replay)."""
+    timer = StageTimer()
+    provider = TimedReplayProvider(
+        timer, quotes_dir=args.quotes_dir, max_concurrency=args.workers, latency_ms=args.latency_ms, preload=True
+    )
+
+    rows = []
+    with app.app_context():
+        db_manager = DatabaseManager(db_instance=db)
+        db_manager.configure_sqlite(DatabaseConfig())
+        quote_service = TimedQuoteService(
+            timer,
+            db_manager,
+            provider=provider,
+            download_batch_size=args.batch_size,
+            max_workers=args.workers,
+            engine=args.engine,
+            commit_mode=args.commit_mode,
+        )
+        etf_service = EtfService(db_manager, quote_service)
+
+        scenarios: list[tuple[str, list[str]]] = [
+            ("Empty database", []),
+            # Drop every ticker's last quote: the nightly incremental case (sync state rewound to match)
+            (
+                "One day stale",
+                [
+                    "DELETE FROM quotes WHERE (Ticker, Date) IN (SELECT Ticker, MAX(Date) FROM quotes GROUP BY Ticker)",
+                    "UPDATE quote_sync_state SET "
+                    "last_date = (SELECT MAX(Date) FROM quotes WHERE Ticker = quote_sync_state.ticker), "
+                    "row_count = (SELECT COUNT(*) FROM quotes WHERE Ticker = quote_sync_state.ticker)",
+                ],
+            ),
+        ]
+        for scenario, setup_sql in scenarios:
+            if setup_sql:
+                with db_manager.write_session() as session:
+                    for statement in setup_sql:
+                        session.execute(text(statement))
+            timer.reset()
+
+            start_time = time.perf_counter()
+            summary: dict[str, Any] = etf_service.update_all_etf_quotes()
+            wall = time.perf_counter() - start_time
+
+            inserted: int = sum(result.get("inserted", 0) for result in summary["results"])
+            stages = timer.seconds
+            insert = stages["upsert"] - stages["transform"]
+            rows.append(
+                [
+                    scenario,
+                    summary["success_count"],
+                    inserted,
+                    f"{wall:.2f}",
+                    f"{summary['total'] / wall:.1f}",
+                    f"{inserted / wall:,.0f}",
+                    f"{stages['fetch']:.2f}",
+                    f"{stages['transform']:.2f}",
+                    f"{insert:.2f}",
+                ]
+            )
+
+    headers = ["Scenario", "Tickers", "Rows", "Wall (s)", "Tickers/s", "Rows/s"]
+    headers += ["Fetch (s)", "Transform (s)", "Insert (s)"]
+    print(
+        f"Ingestion throughput (replay of {args.quotes_dir}, engine={args.engine}, commit={args.commit_mode}, "
+        f"workers={args.workers}, batch={args.batch_size}, latency={args.latency_ms} ms)"
+    )
+    print(tabulate(rows, headers=headers, tablefmt="orgtbl"))
+    if args.workers > 1:
+        print("Stage times are summed over workers and can exceed the wall time")
+
+
+def bench_insert(app: Flask, args: argparse.Namespace) -> None:
+    """Compare the quote insert paths on the full history of one ticker (empty table, then all conflicts)."""
+    with app.app_context():
+        quote_service = QuoteService(DatabaseManager(db_instance=db))
+        frames = FileQuoteProvider(args.quotes_dir).download([args.ticker], datetime(1970, 1, 1), datetime.now())
+        if args.ticker not in frames:
+            raise SystemExit(f"No quotes for {args.ticker} in {args.quotes_dir}")
+        quotes_df = quote_service._prepare_quotes_dataframe(
+            quote_service._normalize_download_frame(args.ticker, frames[args.ticker])
+        )
+
+        def pandas_to_sql() -> None:
+            # Pre-upsert path: no conflict handling, so it only runs against an empty table
+            with db.engine.begin() as connection:
+                quotes_df.to_sql(name="quotes", con=connection, if_exists="append", index=False)
+
+        def core_executemany() -> None:
+            # Dict records through SQLAlchemy, 124-row executemany batches
+            records = quotes_df.astype(object).where(quotes_df.notna(), None).to_dict(orient="records")
+            stmt = sqlite_insert(QuoteDAO).on_conflict_do_nothing(index_elements=[QuoteDAO.Ticker, QuoteDAO.Date])
+            batch_rows = 999 // len(QUOTE_COLUMNS)
+            with db.engine.begin() as connection:
+                for offset in range(0, len(records), batch_rows):
+                    connection.execute(stmt, records[offset : offset + batch_rows])
+
+        def dbapi_executemany() -> None:
+            # Current path: NumPy tuples, one prepared statement on the raw sqlite3 cursor
+            rows = quote_service._to_rows(quotes_df)
+            with db.engine.begin() as connection:
+                cursor = connection.connection.dbapi_connection.cursor()
+                cursor.executemany(QUOTE_UPSERT_SQL["ignore"], rows)
+                cursor.close()
+
+        def clear() -> None:
+            with db.engine.begin() as connection:
+                connection.execute(text("DELETE FROM quotes WHERE Ticker = :ticker"), {"ticker": args.ticker})
+
+        def measure_insert(insert: Callable[[], None], empty_table: bool) -> float:
+            """Median milliseconds of insert (one warm-up); the table is emptied or refilled before each run."""
+            timings: list[float] = []
+            for run in range(args.repeat + 1):
+                clear()
+                if not empty_table:
+                    dbapi_executemany()
+                start = time.perf_counter()
+                insert()
+                if run:
+                    timings.append((time.perf_counter() - start) * 1000)
+            return statistics.median(timings)
+
+        paths: list[tuple[str, Callable[[], None], bool]] = [
+            ("pandas to_sql", pandas_to_sql, False),
+            ("SQLAlchemy executemany (dict records)", core_executemany, True),
+            ("DBAPI executemany (NumPy tuples)", dbapi_executemany, True),
+        ]
+        results: list[tuple[str, float, float | None]] = [
+            (name, measure_insert(insert, True), measure_insert(insert, False) if upsert else None)
+            for name, insert, upsert in paths
+        ]
+
+    baseline = results[0][1]
+    rows = [
+        [
+            name,
+            f"{empty_ms:.2f}",
+            f"{len(quotes_df) / empty_ms * 1000:,.0f}",
+            f"{baseline / empty_ms:.1f}x",
+            f"{conflict_ms:.2f}" if conflict_ms is not None else "n/a",
+        ]
+        for name, empty_ms, conflict_ms in results
+    ]
+    headers = ["Path", "Empty table (ms)", "Rows/s", "Speedup", "All conflicts (ms)"]
+    print(f"Quote insert of {args.ticker}, {len(quotes_df)} rows (median of {args.repeat} runs)")
+    print(tabulate(rows, headers=headers, tablefmt="orgtbl"))
+
+
+# -----------------------------------------------------------------------------
+# CLI arguments
+# -----------------------------------------------------------------------------
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark quote read and ingestion paths")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DATABASE_PATH, help="SQLite database path")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per measurement")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    quotes_parser = subparsers.add_parser("quotes", help="Quote read latency per QuotePeriod")
+    quotes_parser.add_argument("-t", "--ticker", type=str, default="SWDA.MI", help="ETF ticker (e.g. SWDA.MI)")
+    quotes_parser.add_argument(
+        "--store", type=Path, default=DEFAULT_STORE_PATH, help="Columnar store directory (rebuild_quote_store.py)"
+    )
+    quotes_parser.set_defaults(func=bench_quotes)
+
+    ingest_parser = subparsers.add_parser(
+        "ingest", help="Bulk update throughput on a scratch database (offline CSV replay, --db is ignored)"
+    )
+    ingest_parser.add_argument("--quotes-dir", type=Path, default=QUOTES_DIR, help="Replayed quote CSV directory")
+    ingest_parser.add_argument("-w", "--workers", type=int, default=1, help="Concurrent downloads")
+    ingest_parser.add_argument("-b", "--batch-size", type=int, default=20, help="Tickers per provider call")
+    ingest_parser.add_argument("--engine", choices=["threads", "asyncio"], default="threads", help="Bulk engine")
+    ingest_parser.add_argument(
+        "--commit-mode", choices=["per_ticker", "staged"], default="per_ticker", help="Bulk update commit mode"
+    )
+    ingest_parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency per provider call")
+    ingest_parser.set_defaults(func=bench_ingest)
+
+    insert_parser = subparsers.add_parser(
+        "insert", help="Quote insert paths on one full-history ticker (scratch database, --db is ignored)"
+    )
+    insert_parser.add_argument("-t", "--ticker", type=str, default="SWDA.MI", help="ETF ticker (e.g. SWDA.MI)")
+    insert_parser.add_argument("--quotes-dir", type=Path, default=QUOTES_DIR, help="Quote CSV directory")
+    insert_parser.set_defaults(func=bench_insert)
+
+    return parser.parse_args()
+
+
+# -----------------------------------------------------------------------------
+# Entry point
+# -----------------------------------------------------------------------------
+def main() -> None:
+    args = parse_args()
+
+    # Keep service logging out of the measurements
+    setup_logging(level="WARNING")
+
+    if args.command in ("ingest", "insert"):
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            app = create_app(Path(scratch_dir) / "ingest.db")
+            create_ingestion_database(app)
+            args.func(app, args)
+        return
+
+    app = create_app(args.db)
+    args.func(app, args)
+
+
+if __name__ == "__main__":
+    main()
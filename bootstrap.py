@@ -6,9 +6,22 @@
 Application bootstrap module.
 Handles initialization of services, controllers, and cron jobs using the init_app pattern.
 """
+from pathlib import Path
+from core.config import Settings, get_settings
 from core.database import DatabaseManager
-from controllers import QuoteController, EtfController, IndexController
-from services import EtfService, QuoteService, UpdateQuotesCronJob, IndexService
+from core.rate_limiter import get_rate_limiter
+from controllers import QuoteController, EtfController, IndexController, HealthController, JobController
+from services import (
+    EtfService,
+    QuoteService,
+    UpdateQuotesCronJob,
+    UpdateRunService,
+    QuoteJobQueue,
+    IndexService,
+    QuoteCache,
+    ColumnarQuoteStore,
+    YFinanceQuoteProvider,
+)
 
 
 def init_app(app, db) -> None:
@@ -25,27 +38,80 @@ def init_app(app, db) -> None:
     Returns:
         None (modifies app in place by adding attributes)
     """
+    settings: Settings = get_settings()
+
     # Initialize DatabaseManager
     db_manager: DatabaseManager = DatabaseManager(db_instance=db)
 
+    # Apply SQLite pragmas (WAL, cache, mmap, ...) on every pooled connection
+    db_manager.configure_sqlite(settings.database)
+
+    # Initialize the quote series cache (shared by HTTP reads and the cron job writes)
+    quote_cache: QuoteCache | None = None
+    if settings.cache.quotes_enabled:
+        quote_cache = QuoteCache(max_bytes=settings.cache.quotes_max_mb * 1024 * 1024)
+
+    # Initialize the columnar quote store when selected as quote read backend
+    quote_store: ColumnarQuoteStore | None = None
+    if settings.database.quotes_backend == "columnar":
+        quote_store = ColumnarQuoteStore(settings.database.get_columnar_path(Path(app.root_path)))
+
     # Initialize Services (Domain Services first, then Application Services)
-    quote_service: QuoteService = QuoteService(db_manager)
-    etf_service: EtfService = EtfService(db_manager, quote_service)
+    quote_service: QuoteService = QuoteService(
+        db_manager,
+        cache=quote_cache,
+        quote_store=quote_store,
+        provider=YFinanceQuoteProvider(
+            max_concurrency=settings.ingestion.max_workers,
+            rate_limiter=get_rate_limiter("yfinance", config=settings.rate_limit),
+        ),
+        download_batch_size=settings.ingestion.download_batch_size,
+        max_workers=settings.ingestion.max_workers,
+        engine=settings.ingestion.engine,
+        commit_mode=settings.ingestion.commit_mode,
+        restatement_overlap_days=settings.ingestion.restatement_overlap_days,
+        restatement_tolerance=settings.ingestion.restatement_tolerance,
+    )
+    # Refuse to start on a database not yet migrated to integer day-number dates
+    quote_service.check_quote_schema()
+    # Bulk update planning reads start dates from quote_sync_state; dividends are ingested with quotes
+    quote_service.ensure_ingestion_tables()
+
+    # Bulk updates are checkpointed per ticker so interrupted runs can be resumed
+    run_service: UpdateRunService = UpdateRunService(db_manager)
+    run_service.ensure_tables()
+
+    etf_service: EtfService = EtfService(db_manager, quote_service, run_service=run_service)
     index_service: IndexService = IndexService(db_manager)
 
+    # Background quote updates (HTTP update endpoints answer 202 and return immediately)
+    quote_job_queue: QuoteJobQueue = QuoteJobQueue(
+        db_manager, app, etf_service=etf_service, max_workers=settings.jobs.max_workers
+    )
+    quote_job_queue.ensure_tables()
+
     # Initialize Controllers (Presentation Layer)
     etf_controller: EtfController = EtfController(etf_service, index_service)
-    quote_controller: QuoteController = QuoteController(quote_service, etf_service)
+    quote_controller: QuoteController = QuoteController(quote_service, etf_service, quote_job_queue)
     index_controller: IndexController = IndexController(index_service)
+    health_controller: HealthController = HealthController(db_manager)
+    job_controller: JobController = JobController(quote_job_queue)
 
-    # Initialize Cron Jobs (pass app for context)
-    update_quotes_cronjob: UpdateQuotesCronJob = UpdateQuotesCronJob(db_manager, app)
+    # Initialize Cron Jobs (pass app for context and the shared EtfService so writes invalidate the cache)
+    update_quotes_cronjob: UpdateQuotesCronJob = UpdateQuotesCronJob(
+        db_manager, app, etf_service=etf_service, resume=settings.cron.quotes_resume
+    )
 
     # Attach controllers to app instance
     # This allows access via current_app in routes
     app.etf_controller = etf_controller
     app.quote_controller = quote_controller
     app.index_controller = index_controller
+    app.health_controller = health_controller
+    app.job_controller = job_controller
 
     # Attach cron job to app instance
     app.update_quotes_cronjob = update_quotes_cronjob
+
+    # Attach the job queue (started with the cron job, so jobs are not run at import time)
+    app.quote_job_queue = quote_job_queue
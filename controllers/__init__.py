@@ -6,5 +6,15 @@ from .etf_controller import EtfController
 from .quote_controller import QuoteController
 from .types import WebResponse, APIResponse
 from .index_controller import IndexController
+from .health_controller import HealthController
+from .job_controller import JobController
 
-__all__ = ["EtfController", "QuoteController", "WebResponse", "APIResponse", "IndexController"]
+__all__ = [
+    "EtfController",
+    "QuoteController",
+    "WebResponse",
+    "APIResponse",
+    "IndexController",
+    "HealthController",
+    "JobController",
+]
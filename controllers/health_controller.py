@@ -0,0 +1,34 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from flask import jsonify
+from core import LoggerManager
+from core.database import DatabaseManager
+from controllers.types import APIResponse
+
+
+class HealthController:
+    """Controller for the health check endpoint (Presentation Layer - HTTP only)"""
+
+    def __init__(self, db_manager: DatabaseManager) -> None:
+        """
+        Initialize HealthController
+
+        Args:
+            db_manager: DatabaseManager instance
+        """
+        self.db_manager = db_manager
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+        self.logger.info("HealthController initialized")
+
+    def health(self) -> APIResponse:
+        """
+        Report database connectivity and the SQLite pragmas in effect
+
+        Returns:
+            JSON API response (200 if the database is reachable, 503 otherwise)
+        """
+        result = self.db_manager.health_check()
+        status_code: int = 503 if result["status"] == "error" else 200
+        return jsonify(result), status_code
@@ -0,0 +1,41 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from typing import Any
+from flask import jsonify
+from core import LoggerManager
+from controllers.types import APIResponse
+from dto import ErrorResponse
+from services import QuoteJobQueue
+
+
+class JobController:
+    """Controller for background job status (Presentation Layer - HTTP only)"""
+
+    def __init__(self, job_queue: QuoteJobQueue) -> None:
+        """
+        Initialize JobController
+
+        Args:
+            job_queue: QuoteJobQueue holding the quote update jobs
+        """
+        self.job_queue = job_queue
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+        self.logger.info("JobController initialized")
+
+    def get_job(self, job_id: str) -> APIResponse:
+        """
+        Return the status (and result, once finished) of a background job
+
+        Args:
+            job_id: Job id returned by the 202 response of an update endpoint
+
+        Returns:
+            JSON API response (404 if the job does not exist)
+        """
+        job: dict[str, Any] | None = self.job_queue.get(job_id)
+        if job is None:
+            error_response = ErrorResponse(error=f"Job {job_id} non trovato")
+            return jsonify(error_response.model_dump()), 404
+        return jsonify(job), 200
@@ -2,29 +2,38 @@
 # Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
+import datetime as dt
+import hashlib
 from typing import Any
-from dto import Quote, QuoteResponse, ErrorResponse, QuotePeriod
-from flask import jsonify, request, Response, current_app
+from dto import QuoteResponse, QuoteMatrixResponse, ErrorResponse, QuotePeriod
+from flask import jsonify, request, Response, current_app, url_for
 from core import LoggerManager
 from controllers.types import APIResponse
 from controllers.quote_sse_handler import QuoteSSEHandler
-from services import QuoteService, EtfService
+from services import QuoteService, EtfService, QuoteJobQueue
 
 
 class QuoteController:
     """Controller for managing Quote routes (Presentation Layer - HTTP only)"""
 
-    def __init__(self, quote_service: QuoteService, etf_service: EtfService) -> None:
+    # LTTB always keeps the first and last point, so fewer than 3 is meaningless
+    MIN_CHART_POINTS = 3
+    # Upper bound on tickers per aligned quotes request (one IN (...) query)
+    MAX_ALIGNED_TICKERS = 100
+
+    def __init__(self, quote_service: QuoteService, etf_service: EtfService, job_queue: QuoteJobQueue) -> None:
         """
         Initialize QuoteController with services
 
         Args:
             quote_service: QuoteService instance (Domain Service)
             etf_service: EtfService instance (Application Service - Orchestration)
+            job_queue: QuoteJobQueue running quote updates in the background
         """
         self.quote_service = quote_service
         self.etf_service = etf_service
-        self.sse_handler = QuoteSSEHandler()
+        self.job_queue = job_queue
+        self.sse_handler = QuoteSSEHandler(max_workers=quote_service.max_workers)
         self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
         self.logger.info("QuoteController initialized")
 
@@ -38,68 +47,315 @@ class QuoteController:
         Returns:
             JSON API response with explicit status code
         """
-        # Get period from query parameter (default 1Y)
+        # Get period from query parameter (default 1Y) and optional downsampling target
         period_str: str = request.args.get("period", "1Y")
-        self.logger.info(f"HTTP request: get quotes for {ticker}, period: {period_str}")
+        points_str: str | None = request.args.get("points")
+        self.logger.info(f"HTTP request: get quotes for {ticker}, period: {period_str}, points: {points_str}")
+
+        # Parsed explicitly: type=int would silently drop a malformed value and serve the raw series
+        try:
+            points: int | None = int(points_str) if points_str is not None else None
+        except ValueError:
+            error_response = ErrorResponse(error=f"points must be an integer, got '{points_str}'")
+            return jsonify(error_response.model_dump()), 400
+        if points is not None and points < self.MIN_CHART_POINTS:
+            error_response = ErrorResponse(error=f"points must be at least {self.MIN_CHART_POINTS}")
+            return jsonify(error_response.model_dump()), 400
 
         try:
             # Convert string to QuotePeriod enum
             period: QuotePeriod = QuotePeriod.from_string(period_str)
+        except ValueError as e:
+            error_response = ErrorResponse(error=str(e))
+            return jsonify(error_response.model_dump()), 400
 
-            # Delegate to Domain Service
-            quotes: list[Quote] = self.quote_service.get_quotes(ticker, period)
+        try:
+            # Validate conditional requests from a cheap metadata lookup before the range query
+            last_date, row_count, version, updated_at = self.quote_service.get_quote_metadata(ticker)
+            if last_date is None:
+                self.logger.warning(f"No quotes available for ETF {ticker}")
+                error_response = ErrorResponse(error="No quotes available")
+                return jsonify(error_response.model_dump()), 404
 
-            if not quotes:
+            etag, last_modified = self._build_cache_validators(
+                ticker, period, points, last_date, row_count, version, updated_at
+            )
+            if self._is_not_modified(etag, last_modified):
+                self.logger.info(f"Quotes for ETF {ticker}, period {period.value} not modified")
+                return self._with_cache_validators(Response(status=304), etag, last_modified), 304
+
+            # Delegate to Domain Service (columnar read: dates and closes only)
+            dates, closes = self.quote_service.get_quote_series(ticker, period, points)
+
+            if not dates:
                 self.logger.warning(f"No quotes available for ETF {ticker}")
                 error_response = ErrorResponse(error="No quotes available")
                 return jsonify(error_response.model_dump()), 404
 
             # Create response DTO
-            response: QuoteResponse = QuoteResponse(
-                ticker=ticker, labels=[quote.date for quote in quotes], data=[float(quote.close) for quote in quotes]
-            )
+            response: QuoteResponse = QuoteResponse(ticker=ticker, labels=dates, data=closes)
 
-            self.logger.info(f"Retrieved {len(quotes)} quotes for ETF {ticker}")
-            return jsonify(response.model_dump()), 200
+            self.logger.info(f"Retrieved {len(dates)} quotes for ETF {ticker}")
+            return self._with_cache_validators(jsonify(response.model_dump()), etag, last_modified), 200
 
         except Exception as e:
             self.logger.error(f"Error fetching quotes for ETF {ticker}: {str(e)}")
             error_response: ErrorResponse = ErrorResponse(error=str(e))
             return jsonify(error_response.model_dump()), 500
 
-    def update_single(self, ticker: str) -> APIResponse:
+    def get_aligned_quotes(self) -> APIResponse:
+        """
+        Return closing prices for several ETFs as a date x ticker matrix in JSON format
+
+        Query parameters: tickers (comma separated, required), period (default 1Y),
+        normalize (optional base value, e.g. 100)
+
+        Returns:
+            JSON API response with explicit status code
+        """
+        tickers_str: str = request.args.get("tickers", "")
+        period_str: str = request.args.get("period", "1Y")
+        normalize_str: str | None = request.args.get("normalize")
+        self.logger.info(f"HTTP request: get aligned quotes for {tickers_str}, period: {period_str}")
+
+        # Parse tickers preserving order and dropping duplicates
+        tickers: list[str] = list(dict.fromkeys(t.strip().upper() for t in tickers_str.split(",") if t.strip()))
+        if not tickers:
+            return jsonify(ErrorResponse(error="tickers parameter is required").model_dump()), 400
+        if len(tickers) > self.MAX_ALIGNED_TICKERS:
+            error_message = f"At most {self.MAX_ALIGNED_TICKERS} tickers per request"
+            return jsonify(ErrorResponse(error=error_message).model_dump()), 400
+        try:
+            normalize: float | None = float(normalize_str) if normalize_str is not None else None
+        except ValueError:
+            return jsonify(ErrorResponse(error=f"normalize must be a number, got '{normalize_str}'").model_dump()), 400
+        if normalize is not None and not 0 < normalize < float("inf"):
+            return jsonify(ErrorResponse(error="normalize must be positive").model_dump()), 400
+        try:
+            period: QuotePeriod = QuotePeriod.from_string(period_str)
+        except ValueError as e:
+            return jsonify(ErrorResponse(error=str(e)).model_dump()), 400
+
+        try:
+            # Delegate to Domain Service (single range query for all tickers)
+            dates, series = self.quote_service.get_aligned_quotes(tickers, period, normalize)
+
+            if not dates:
+                self.logger.warning(f"No quotes available for ETFs {tickers_str}")
+                return jsonify(ErrorResponse(error="No quotes available").model_dump()), 404
+
+            response: QuoteMatrixResponse = QuoteMatrixResponse(
+                tickers=tickers, labels=dates, series=series, normalize=normalize
+            )
+            return jsonify(response.model_dump()), 200
+
+        except Exception as e:
+            self.logger.error(f"Error fetching aligned quotes for {tickers_str}: {str(e)}")
+            error_response: ErrorResponse = ErrorResponse(error=str(e))
+            return jsonify(error_response.model_dump()), 500
+
+    def _build_cache_validators(
+        self,
+        ticker: str,
+        period: QuotePeriod,
+        points: int | None,
+        last_date: str,
+        row_count: int,
+        version: int = 0,
+        updated_at: dt.datetime | None = None,
+    ) -> tuple[str, dt.datetime]:
         """
-        Update quotes for a single ETF (HTTP handling only)
-        Delegates orchestration to EtfService (Application Service)
+        Build the strong ETag and Last-Modified value for a quotes response
+
+        The ETag derives from the ticker's latest quote date, row count and quote
+        version (bumped by every ingestion that changes rows, including restated
+        history); windowed periods (everything but Max) also slide with the
+        calendar, so it includes the period start date too. Last-Modified is the
+        time of the last ingestion that changed the quotes or, if later, the time
+        the period window last moved (so If-Modified-Since alone never validates
+        yesterday's window).
 
         Args:
             ticker: ETF ticker symbol
+            period: Requested period
+            points: Requested downsampling target (None for the raw series)
+            last_date: Latest stored quote date (YYYY-MM-DD)
+            row_count: Number of stored quotes for the ticker
+            version: Quote version of the ticker
+            updated_at: Last change of the ticker's quotes in UTC (None: unknown, the latest quote date is used)
+
+        Returns:
+            Tuple of (ETag value without quotes, Last-Modified datetime in UTC)
+        """
+        start_date: str = period.get_start_date().strftime("%Y-%m-%d")
+        fingerprint: str = f"{ticker}|{period.value}|{points}|{start_date}|{last_date}|{row_count}|{version}"
+        etag: str = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+
+        if updated_at is not None:
+            # HTTP dates have a resolution of one second
+            last_modified: dt.datetime = updated_at.replace(microsecond=0, tzinfo=dt.timezone.utc)
+        else:
+            last_modified = dt.datetime.strptime(last_date[:10], "%Y-%m-%d").replace(tzinfo=dt.timezone.utc)
+
+        window_moved_at: dt.datetime | None = self._window_moved_at(period)
+        if window_moved_at is not None:
+            last_modified = max(last_modified, window_moved_at)
+
+        return etag, last_modified
+
+    @staticmethod
+    def _window_moved_at(period: QuotePeriod) -> dt.datetime | None:
+        """
+        Return when the window of a period last moved, in UTC
+
+        Period start dates are computed from the local date: sliding windows move at
+        every local midnight, YTD on January 1st, Max never.
+
+        Args:
+            period: Requested period
+
+        Returns:
+            Local midnight of the last window change in UTC, or None for Max
+        """
+        if period == QuotePeriod.MAX:
+            return None
+        if period == QuotePeriod.YEAR_TO_DATE:
+            moved_at: dt.datetime = period.get_start_date()
+        else:
+            moved_at = dt.datetime.combine(dt.date.today(), dt.time())
+        # Naive local time to UTC, at the one-second resolution of HTTP dates
+        return moved_at.astimezone(dt.timezone.utc)
+
+    def _is_not_modified(self, etag: str, last_modified: dt.datetime) -> bool:
+        """
+        Evaluate If-None-Match / If-Modified-Since (If-None-Match takes precedence, RFC 9110)
+
+        Args:
+            etag: Current ETag value
+            last_modified: Current Last-Modified datetime
+
+        Returns:
+            True if the client's cached copy is still valid
+        """
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+
+        if_modified_since: dt.datetime | None = request.if_modified_since
+        return if_modified_since is not None and last_modified <= if_modified_since
+
+    def _with_cache_validators(self, response: Response, etag: str, last_modified: dt.datetime) -> Response:
+        """
+        Attach ETag, Last-Modified and a revalidate-always Cache-Control to a response
+
+        Args:
+            response: Flask response
+            etag: ETag value
+            last_modified: Last-Modified datetime
+
+        Returns:
+            The same response
+        """
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response
+
+    def get_cache_stats(self) -> APIResponse:
+        """
+        Return quote cache hit/miss counters in JSON format
 
         Returns:
             JSON API response with explicit status code
         """
+        if self.quote_service.cache is None:
+            return jsonify({"enabled": False}), 200
+
+        return jsonify({"enabled": True, **self.quote_service.cache.stats()}), 200
+
+    def get_rate_limit_stats(self) -> APIResponse:
+        """
+        Return quote download rate limiter counters (throttle events, retries, wait time) in JSON format
+
+        Returns:
+            JSON API response with explicit status code
+        """
+        rate_limiter = getattr(self.quote_service.provider, "rate_limiter", None)
+        if rate_limiter is None:
+            return jsonify({"enabled": False}), 200
+
+        return jsonify({"enabled": True, **rate_limiter.stats()}), 200
+
+    def get_single_flight_stats(self) -> APIResponse:
+        """
+        Return the single-flight counters of quote updates (tickers in flight, leaders, coalesced calls)
+
+        Returns:
+            JSON API response with explicit status code
+        """
+        return jsonify(self.quote_service.single_flight.stats()), 200
+
+    def update_single(self, ticker: str) -> APIResponse:
+        """
+        Queue a quote update for a single ETF (HTTP handling only)
+        The update runs on the background job queue; poll /jobs/<id> for its result
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            JSON API response: 202 with the job, 404 if the ETF does not exist
+        """
         self.logger.info(f"HTTP request: update quotes for single ETF: {ticker}")
 
         try:
-            # Delegate to Application Service (orchestration)
-            result: dict[str, Any] = self.etf_service.update_etf_quotes(ticker)
+            if not self.etf_service.exists(ticker):
+                return jsonify({"success": False, "ticker": ticker, "message": f"ETF {ticker} non trovato"}), 404
 
-            status_code: int = 200 if result["success"] else (404 if "non trovato" in result["message"] else 500)
-            return jsonify(result), status_code
+            return self._accepted(self.job_queue.submit_ticker(ticker))
 
         except Exception as e:
-            self.logger.exception(f"Unexpected error updating quotes for {ticker}: {str(e)}")
+            self.logger.exception(f"Unexpected error queueing quote update for {ticker}: {str(e)}")
             error_response: ErrorResponse = ErrorResponse(error=str(e))
             return jsonify({"success": False, "ticker": ticker, "message": error_response.error}), 500
 
+    def update_all_async(self) -> APIResponse:
+        """
+        Queue a quote update for all ETFs (HTTP handling only)
+        With ?resume=true only the pending or failed ETFs of an unfinished run are updated
+
+        Returns:
+            JSON API response: 202 with the job
+        """
+        resume: bool = request.args.get("resume", "false").lower() in ("1", "true", "yes")
+        self.logger.info(f"HTTP request: queue quote update for all ETFs (resume: {resume})")
+
+        try:
+            return self._accepted(self.job_queue.submit_all(resume=resume))
+
+        except Exception as e:
+            self.logger.exception(f"Unexpected error queueing bulk quote update: {str(e)}")
+            error_response: ErrorResponse = ErrorResponse(error=str(e))
+            return jsonify({"success": False, "message": error_response.error}), 500
+
+    def _accepted(self, job: dict[str, Any]) -> APIResponse:
+        """Build the 202 Accepted response of a queued job (Location: its status URL)"""
+        status_url: str = url_for("job.get_job", job_id=job["id"])
+        response: Response = jsonify({"success": True, "job_id": job["id"], "status_url": status_url, "job": job})
+        response.headers["Location"] = status_url
+        return response, 202
+
     def update_all(self) -> Response:
         """
         Update quotes for all ETFs with Server-Sent Events (SSE) for real-time progress
 
+        Each ETF is checkpointed in a bulk update run; with ?resume=true an unfinished
+        run (e.g. a closed stream or a restart) continues with its pending or failed ETFs.
+
         Returns:
             SSE stream response with progress updates
         """
-        self.logger.info("HTTP request: update quotes for all ETFs (SSE stream)")
+        resume: bool = request.args.get("resume", "false").lower() in ("1", "true", "yes")
+        self.logger.info(f"HTTP request: update quotes for all ETFs (SSE stream, resume: {resume})")
 
         # Get Flask app instance BEFORE creating the generator
         # _get_current_object() is a Werkzeug LocalProxy method (type checker doesn't know it)
@@ -108,12 +364,29 @@ class QuoteController:
         def generate_events():
             with app.app_context():
                 try:
-                    etfs = self.etf_service.get_all()
+                    run_id, etfs, resumed = self.etf_service.start_update_run("sse", resume=resume)
+                    if resumed and not etfs:
+                        # Nothing left to resume: report the outcome already recorded by the run
+                        self.etf_service.finish_update_run(run_id)
+                        summary: dict[str, Any] = self.etf_service.create_resumed_summary(run_id)
+                        completion: dict[str, Any] = self.sse_handler.create_completion_event(
+                            summary["total"], summary["success_count"], summary["failed_etfs"]
+                        )
+                        completion.update(message=summary["message"], run_id=run_id, resumed=True)
+                        yield self.sse_handler.format_event(completion)
+                        return
+
+                    # Runs on the handler's worker threads, each with its own app context
+                    def update_etf(etf) -> None:
+                        with app.app_context():
+                            result: dict[str, Any] = self.etf_service.update_etf_quotes(etf.ticker, run_id=run_id)
+                        if not result["success"]:
+                            raise ValueError(result["message"])
 
                     # Use QuoteSSEHandler for bulk quote update events
-                    yield from self.sse_handler.generate_bulk_quote_update_events(
-                        etfs=etfs, update_func=lambda etf: self.etf_service.update_etf_quotes(etf.ticker)
-                    )
+                    yield from self.sse_handler.generate_bulk_quote_update_events(etfs=etfs, update_func=update_etf)
+                    # Not reached when the client disconnects: the run stays resumable
+                    self.etf_service.finish_update_run(run_id)
 
                 except Exception as e:
                     self.logger.exception(f"SSE: Unexpected error during bulk update: {str(e)}")
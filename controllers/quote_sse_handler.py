@@ -3,7 +3,10 @@
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
 import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any, Generator, Callable
+import numpy as np
 from sqlalchemy.exc import SQLAlchemyError
 from core import LoggerManager
 from dto import ETF
@@ -13,8 +16,20 @@ class QuoteSSEHandler:
     """Handler for Server-Sent Events (SSE) streaming for quote updates"""
 
     MIMETYPE = "text/event-stream"
+    # SSE comment line: ignored by EventSource, keeps proxies from timing out idle streams
+    HEARTBEAT = ": heartbeat\n\n"
+    LATENCY_PERCENTILES = (50, 90, 95, 99)
 
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, heartbeat_s: float = 15.0):
+        """
+        Initialize QuoteSSEHandler
+
+        Args:
+            max_workers: ETF updates running in parallel during a bulk update stream
+            heartbeat_s: Seconds without completed updates before a heartbeat comment is sent
+        """
+        self.max_workers = max_workers
+        self.heartbeat_s = heartbeat_s
         self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
 
     def format_event(self, data: dict) -> str:
@@ -43,8 +58,17 @@ class QuoteSSEHandler:
             "message": message,
         }
 
-    def create_completion_event(self, total: int, success_count: int, failed_etfs: list) -> dict[str, Any]:
-        """Create completion event data for quote updates"""
+    def create_completion_event(
+        self,
+        total: int,
+        success_count: int,
+        failed_etfs: list,
+        wall_time_s: float = 0.0,
+        latencies_ms: list[float] | None = None,
+    ) -> dict[str, Any]:
+        """Create completion event data for quote updates (with wall time and per-ETF latency percentiles)"""
+        latencies: np.ndarray = np.asarray(latencies_ms or [0.0], dtype=np.float64)
+        percentiles: np.ndarray = np.percentile(latencies, self.LATENCY_PERCENTILES)
         return {
             "done": True,
             "progress": 100,
@@ -52,6 +76,11 @@ class QuoteSSEHandler:
             "success_count": success_count,
             "failed_count": len(failed_etfs),
             "failed_etfs": failed_etfs,
+            "wall_time_s": round(wall_time_s, 3),
+            "latency_ms": {
+                **{f"p{p}": round(float(value), 1) for p, value in zip(self.LATENCY_PERCENTILES, percentiles)},
+                "max": round(float(latencies.max()), 1),
+            },
             "message": (
                 f"Completato: {success_count} successi, {len(failed_etfs)} errori"
                 if failed_etfs
@@ -63,24 +92,41 @@ class QuoteSSEHandler:
         """Create error event data"""
         return {"error": True, "message": message}
 
-    def _process_single_etf(
-        self, etf: ETF, index: int, total: int, update_func: Callable
-    ) -> tuple[str, bool, dict[str, str] | None]:
+    def _run_update(self, etf: ETF, update_func: Callable) -> tuple[float, Exception | None]:
         """
-        Process update for a single ETF
+        Update a single ETF on a worker thread, timing the call
 
         Args:
             etf: ETF object to update
-            index: Current ETF index
-            total: Total number of ETFs
             update_func: Function to call for update
 
         Returns:
-            Tuple of (SSE event string, success boolean, error dict or None)
+            Tuple of (latency in milliseconds, expected update error or None)
         """
+        update_start: float = time.perf_counter()
         try:
             update_func(etf)
+            error: Exception | None = None
+        except (ValueError, SQLAlchemyError) as e:
+            error = e
+        return (time.perf_counter() - update_start) * 1000, error
+
+    def _process_single_etf(
+        self, etf: ETF, index: int, total: int, error: Exception | None
+    ) -> tuple[str, bool, dict[str, str] | None]:
+        """
+        Build the progress event of a completed ETF update
 
+        Args:
+            etf: Updated ETF
+            index: Number of ETFs completed so far (including this one)
+            total: Total number of ETFs
+            error: Update error (None on success)
+
+        Returns:
+            Tuple of (SSE event string, success boolean, error dict or None)
+        """
+        if error is None:
             event_data: dict[str, Any] = self.create_progress_event(
                 index, total, ticker=etf.ticker, name=etf.name, status="success", message="Aggiornato"
             )
@@ -88,28 +134,34 @@ class QuoteSSEHandler:
 
             return self.format_event(data=event_data), True, None
 
-        except (ValueError, SQLAlchemyError) as e:
-            error_message: str = str(e)
-            error_dict: dict[str, str] = {
-                "ticker": etf.ticker,
-                "name": etf.name,
-                "error": error_message,
-            }
-
-            event_data = self.create_progress_event(
-                index, total, ticker=etf.ticker, name=etf.name, status="error", message=error_message
-            )
-            self.logger.warning(f"SSE: Failed to update {etf.ticker}: {error_message}")
+        error_message: str = str(error)
+        error_dict: dict[str, str] = {
+            "ticker": etf.ticker,
+            "name": etf.name,
+            "error": error_message,
+        }
+
+        event_data = self.create_progress_event(
+            index, total, ticker=etf.ticker, name=etf.name, status="error", message=error_message
+        )
+        self.logger.warning(f"SSE: Failed to update {etf.ticker}: {error_message}")
 
-            return self.format_event(data=event_data), False, error_dict
+        return self.format_event(data=event_data), False, error_dict
 
     def generate_bulk_quote_update_events(self, etfs: list, update_func: Callable) -> Generator[str, None, None]:
         """
         Generate SSE events for bulk ETF quote updates
 
+        Updates run on a pool of max_workers threads and one progress event is sent
+        per ETF as soon as its update completes (completion order, not list order).
+        A heartbeat comment is sent whenever no update completes for heartbeat_s
+        seconds, so proxies keep the stream open. Closing the stream cancels the
+        updates not started yet.
+
         Args:
             etfs: List of ETFs to update
-            update_func: Function to call for each ETF update (receives ETF)
+            update_func: Function to call for each ETF update (receives ETF; runs on a worker
+                thread, so it must set up its own app context)
 
         Yields:
             SSE formatted event strings
@@ -120,22 +172,51 @@ class QuoteSSEHandler:
             yield self.format_event(data={"error": "Nessun ETF trovato nel database"})
             return
 
-        self.logger.info(f"Starting bulk quote update for {total} ETFs via SSE")
+        self.logger.info(f"Starting bulk quote update for {total} ETFs via SSE ({self.max_workers} workers)")
 
+        stream_start: float = time.perf_counter()
         success_count = 0
         failed_etfs: list[dict[str, str]] = []
+        latencies_ms: list[float] = []
 
-        for index, etf in enumerate(etfs, 1):
-            event, success, error = self._process_single_etf(etf, index, total, update_func)
-            yield event
-
-            if success:
-                success_count += 1
-            elif error:
-                failed_etfs.append(error)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sse-update")
+        try:
+            futures: dict[Future, ETF] = {executor.submit(self._run_update, etf, update_func): etf for etf in etfs}
+            pending: set[Future] = set(futures)
+
+            while pending:
+                done, pending = wait(pending, timeout=self.heartbeat_s, return_when=FIRST_COMPLETED)
+                if not done:
+                    yield self.HEARTBEAT
+                    continue
+
+                for future in done:
+                    latency_ms, error = future.result()
+                    latencies_ms.append(latency_ms)
+                    event, success, error_dict = self._process_single_etf(
+                        futures[future], len(latencies_ms), total, error
+                    )
+                    yield event
+
+                    if success:
+                        success_count += 1
+                    elif error_dict:
+                        failed_etfs.append(error_dict)
+        finally:
+            # Client gone (or unexpected error): drop the updates not started yet
+            executor.shutdown(wait=False, cancel_futures=True)
 
         # Send completion event
-        completion_data: dict[str, Any] = self.create_completion_event(total, success_count, failed_etfs)
+        completion_data: dict[str, Any] = self.create_completion_event(
+            total,
+            success_count,
+            failed_etfs,
+            wall_time_s=time.perf_counter() - stream_start,
+            latencies_ms=latencies_ms,
+        )
         yield self.format_event(data=completion_data)
 
-        self.logger.info(f"SSE: Bulk quote update completed - {success_count}/{total} successful")
+        self.logger.info(
+            f"SSE: Bulk quote update completed - {success_count}/{total} successful "
+            f"in {completion_data['wall_time_s']}s (p95 {completion_data['latency_ms']['p95']} ms)"
+        )
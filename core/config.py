@@ -12,6 +12,7 @@ from pydantic import Field
 import yaml
 from pathlib import Path
 from functools import lru_cache
+from typing import Literal
 import os
 
 
@@ -19,6 +20,40 @@ class DatabaseConfig(BaseSettings):
     """Database configuration"""
 
     relative_path: str = Field(default="database/etfs.db", description="Database relative path")
+    quotes_backend: Literal["sqlite", "columnar"] = Field(
+        default="sqlite", description="Backend for quote reads (sqlite or columnar memory-mapped files)"
+    )
+    columnar_path: str = Field(default="database/columnar", description="Columnar quote store relative path")
+
+    # SQLite pragmas applied on every new connection
+    journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = Field(
+        default="WAL", description="Journal mode (WAL lets readers run during ingestion)"
+    )
+    synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(
+        default="NORMAL", description="Sync level (NORMAL is durable enough with WAL)"
+    )
+    cache_size: int = Field(default=-65536, description="Page cache size (negative = KiB, positive = pages)")
+    mmap_size: int = Field(default=268435456, ge=0, description="Memory-mapped I/O size in bytes (0 disables)")
+    temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = Field(default="MEMORY", description="Temporary tables location")
+    busy_timeout: int = Field(default=5000, ge=0, description="Milliseconds to wait on a locked database")
+    read_pool_size: int = Field(default=5, ge=1, description="Connections in the read-only pool used by requests")
+
+    def get_sqlite_pragmas(self) -> dict[str, str | int]:
+        """
+        Return the SQLite pragmas to apply on every connection, in application order.
+        busy_timeout comes first so that switching journal_mode waits for other connections.
+
+        Returns:
+            Dictionary pragma name -> value
+        """
+        return {
+            "busy_timeout": self.busy_timeout,
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "cache_size": self.cache_size,
+            "mmap_size": self.mmap_size,
+            "temp_store": self.temp_store,
+        }
 
     def get_absolute_uri(self, project_dir: Path) -> str:
         """
@@ -33,6 +68,18 @@ class DatabaseConfig(BaseSettings):
         abs_path = project_dir / self.relative_path
         return f"sqlite:///{abs_path}"
 
+    def get_columnar_path(self, project_dir: Path) -> Path:
+        """
+        Convert the relative columnar store path to an absolute path.
+
+        Args:
+            project_dir: Project root directory
+
+        Returns:
+            Absolute path of the columnar quote store directory
+        """
+        return project_dir / self.columnar_path
+
 
 class AppConfig(BaseSettings):
     """Application configuration"""
@@ -60,6 +107,51 @@ class CronConfig(BaseSettings):
     quotes_crontab: str = Field(
         default="0 23 * * 1-5", description="Cron expression for quotes update (default: 11 PM Mon-Fri)"
     )
+    quotes_resume: bool = Field(
+        default=False, description="Resume an unfinished quotes update run (pending/failed ETFs only)"
+    )
+
+
+class CacheConfig(BaseSettings):
+    """Quote cache configuration"""
+
+    quotes_enabled: bool = Field(default=True, description="Enable the in-process quote series cache")
+    quotes_max_mb: int = Field(default=64, ge=1, description="Approximate memory budget for the quote cache in MB")
+
+
+class IngestionConfig(BaseSettings):
+    """Quote ingestion configuration"""
+
+    download_batch_size: int = Field(default=20, ge=1, description="Maximum tickers per multi-ticker download")
+    max_workers: int = Field(default=1, ge=1, description="Concurrent downloads in bulk updates (1 = serial)")
+    engine: Literal["threads", "asyncio"] = Field(
+        default="threads", description="Download concurrency of the QuoteIngestionEngine (thread pool or event loop)"
+    )
+    commit_mode: Literal["per_ticker", "staged"] = Field(
+        default="per_ticker", description="Bulk update writes: one transaction per ticker, or one for the whole run"
+    )
+    restatement_overlap_days: int = Field(
+        default=10, ge=0, description="Stored days downloaded again to detect restated Adj Close (0 = off)"
+    )
+    restatement_tolerance: float = Field(
+        default=0.01, ge=0, description="Adj Close difference treated as a restatement (price units)"
+    )
+
+
+class RateLimitConfig(BaseSettings):
+    """Rate limit of quote provider calls (shared by every download call site)"""
+
+    requests_per_second: float = Field(default=2.0, gt=0, description="Sustained requests per second")
+    burst: int = Field(default=10, ge=1, description="Requests allowed back to back (token bucket capacity)")
+    max_retries: int = Field(default=4, ge=0, description="Retries after a throttled or transient failure")
+    backoff_base_s: float = Field(default=1.0, gt=0, description="Backoff ceiling of the first retry in seconds")
+    backoff_max_s: float = Field(default=60.0, gt=0, description="Maximum backoff ceiling in seconds")
+
+
+class JobsConfig(BaseSettings):
+    """Background quote update jobs (in-process worker pool, persisted job table)"""
+
+    max_workers: int = Field(default=2, ge=1, description="Quote update jobs running at the same time")
 
 
 class Settings(BaseSettings):
@@ -73,6 +165,10 @@ class Settings(BaseSettings):
     database: DatabaseConfig
     log: LogConfig
     cron: CronConfig
+    cache: CacheConfig
+    ingestion: IngestionConfig
+    rate_limit: RateLimitConfig
+    jobs: JobsConfig
 
     @classmethod
     def from_yaml(cls, config_path: str | Path = "config.yml") -> "Settings":
@@ -108,6 +204,10 @@ class Settings(BaseSettings):
         db_data = config_data.get("database", {})
         log_data = config_data.get("log", {})
         cron_data = config_data.get("cron", {})
+        cache_data = config_data.get("cache", {})
+        ingestion_data = config_data.get("ingestion", {})
+        rate_limit_data = config_data.get("rate_limit", {})
+        jobs_data = config_data.get("jobs", {})
 
         # Add secret_key to app config
         app_data["secret_key"] = secret_key
@@ -125,6 +225,10 @@ class Settings(BaseSettings):
             database=DatabaseConfig(**db_data),
             log=LogConfig(**log_data),
             cron=CronConfig(**cron_data),
+            cache=CacheConfig(**cache_data),
+            ingestion=IngestionConfig(**ingestion_data),
+            rate_limit=RateLimitConfig(**rate_limit_data),
+            jobs=JobsConfig(**jobs_data),
         )
 
 
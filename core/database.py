@@ -2,18 +2,42 @@
 # Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
+from __future__ import annotations
 from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+from urllib.parse import quote
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Engine, create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 import logging
+import threading
+
+if TYPE_CHECKING:
+    from core.config import DatabaseConfig
 
 db: SQLAlchemy = SQLAlchemy()
 
+# Integer values returned by PRAGMA queries, mapped back to their configured names
+_PRAGMA_VALUE_NAMES: dict[str, dict[int, str]] = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+}
+
+# One writer at a time for the whole process: SQLite allows a single writer anyway,
+# serializing in Python avoids "database is locked" between ingestion and HTTP writes
+_writer_lock = threading.RLock()
+
 
 class DatabaseManager:
     """
     Database manager with context manager for session handling.
     Provides automatic transaction management with commit/rollback.
+
+    Reads and writes go through separate engines:
+      - read_session(): pooled read-only connections (SQLite mode=ro), never block on ingestion
+      - write_session(): the Flask-SQLAlchemy session on the writer engine, serialized process-wide
     """
 
     def __init__(self, db_instance=None) -> None:
@@ -25,15 +49,81 @@ class DatabaseManager:
         """
         self._db = db_instance or db
         self._logger = logging.getLogger(name=__name__)
+        self._pragmas: dict[str, str | int] = {}
+        self._read_pool_size: int = 5
+        self._reader_engine: Engine | None = None
+        self._reader_lock = threading.Lock()
+
+    @property
+    def writer_engine(self) -> Engine:
+        """Engine used for all writes (the Flask-SQLAlchemy engine)"""
+        return self._db.engine
+
+    @property
+    def reader_engine(self) -> Engine:
+        """
+        Read-only engine for request handlers.
+        Falls back to the writer engine for non-SQLite or in-memory databases.
+        """
+        with self._reader_lock:
+            if self._reader_engine is None:
+                self._reader_engine = self._create_reader_engine()
+            return self._reader_engine
+
+    def _create_reader_engine(self) -> Engine:
+        """
+        Create a pool of read-only SQLite connections on the writer's database file
+
+        Returns:
+            Read-only engine (or the writer engine when read-only mode is not applicable)
+        """
+        writer: Engine = self.writer_engine
+        database: str | None = writer.url.database
+        if writer.dialect.name != "sqlite" or not database or database == ":memory:":
+            return writer
+
+        path: str = quote(Path(database).resolve().as_posix())
+        engine: Engine = create_engine(
+            f"sqlite:///file:{path}?mode=ro&uri=true", pool_size=self._read_pool_size, max_overflow=0
+        )
+
+        # journal_mode cannot be changed on a read-only connection: it follows the writer
+        reader_pragmas = {name: value for name, value in self._pragmas.items() if name != "journal_mode"}
+
+        def apply_reader_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+            self._execute_pragmas(dbapi_connection, reader_pragmas)
+
+        event.listen(engine, "connect", apply_reader_pragmas)
+        self._logger.info(f"Read-only engine created for {database} (pool size {self._read_pool_size})")
+        return engine
+
+    @contextmanager
+    def read_session(self) -> Iterator[Session]:
+        """
+        Context manager for read-only sessions on the reader engine.
+        The session is never committed; it is closed (connection returned to the pool) on exit.
+
+        Usage:
+            with db_manager.read_session() as session:
+                rows = session.execute(stmt).all()
+
+        Yields:
+            session: SQLAlchemy session bound to the read-only engine
+        """
+        session = Session(bind=self.reader_engine)
+        try:
+            yield session
+        finally:
+            session.close()
 
     @contextmanager
-    def get_session(self):
+    def write_session(self):
         """
-        Context manager for database sessions.
-        Automatically handles commit, rollback, and session cleanup.
+        Context manager for write sessions on the writer engine.
+        Writers are serialized process-wide; commit, rollback and cleanup are automatic.
 
         Usage:
-            with db_manager.get_session() as session:
+            with db_manager.write_session() as session:
                 # perform database operations
                 session.add(obj)
                 # commit happens automatically on success
@@ -46,17 +136,43 @@ class DatabaseManager:
             Exception: On unexpected errors
         """
         session = self._db.session
-        try:
-            yield session
-            session.commit()
-        except SQLAlchemyError:
-            session.rollback()
-            self._logger.exception("Database session error")
-            raise
-        except Exception:
-            session.rollback()
-            self._logger.exception("Unexpected error in database session")
-            raise
+        with _writer_lock:
+            try:
+                yield session
+                session.commit()
+            except SQLAlchemyError:
+                session.rollback()
+                self._logger.exception("Database session error")
+                raise
+            except Exception:
+                session.rollback()
+                self._logger.exception("Unexpected error in database session")
+                raise
+
+    @contextmanager
+    def write_transaction(self):
+        """
+        Context manager for one explicit write transaction on a single connection.
+
+        Unlike write_session(), the transaction is opened up front with BEGIN IMMEDIATE,
+        so savepoints (connection.begin_nested()) nest inside it and releasing one
+        never commits: everything is committed once, with one fsync, when the block
+        exits, or rolled back entirely on error.
+
+        Usage:
+            with db_manager.write_transaction() as connection:
+                savepoint = connection.begin_nested()
+                ...
+
+        Yields:
+            connection: SQLAlchemy connection of the writer session
+        """
+        with self.write_session() as session:
+            connection = session.connection()
+            # pysqlite only opens a transaction before DML: open it explicitly (and take the write lock)
+            if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+            yield connection
 
     def query(self, model):
         """
@@ -70,7 +186,89 @@ class DatabaseManager:
         """
         return model.query
 
+    def configure_sqlite(self, config: DatabaseConfig) -> None:
+        """
+        Apply the configured SQLite pragmas on every new connection of the engine.
+        Must be called within an application context.
+
+        Args:
+            config: DatabaseConfig with the pragma settings
+        """
+        engine = self._db.engine
+        if engine.dialect.name != "sqlite":
+            return
+
+        self._pragmas = config.get_sqlite_pragmas()
+        self._read_pool_size = config.read_pool_size
+        if not event.contains(engine, "connect", self._apply_pragmas):
+            event.listen(engine, "connect", self._apply_pragmas)
+
+        # Drop pooled connections opened before the listener existed
+        engine.dispose()
+        with self._reader_lock:
+            if self._reader_engine is not None and self._reader_engine is not engine:
+                self._reader_engine.dispose()
+            self._reader_engine = None
+        self._logger.info(f"SQLite pragmas in effect: {self.get_pragmas()}")
+
+    def _apply_pragmas(self, dbapi_connection: Any, connection_record: Any) -> None:
+        """
+        Connect event listener: run PRAGMA statements on a new DBAPI connection
+
+        Args:
+            dbapi_connection: Raw sqlite3 connection
+            connection_record: Pool connection record (unused)
+        """
+        self._execute_pragmas(dbapi_connection, self._pragmas)
+
+    @staticmethod
+    def _execute_pragmas(dbapi_connection: Any, pragmas: dict[str, str | int]) -> None:
+        """Run one PRAGMA statement per entry on a DBAPI connection"""
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    def get_pragmas(self) -> dict[str, str | int]:
+        """
+        Read the pragmas actually in effect on a pooled connection
+
+        Returns:
+            Dictionary pragma name -> current value
+        """
+        names = self._pragmas or {"journal_mode": None, "synchronous": None}
+        in_effect: dict[str, str | int] = {}
+        with self._db.engine.connect() as connection:
+            for name in names:
+                value = connection.execute(text(f"PRAGMA {name}")).scalar()
+                in_effect[name] = _PRAGMA_VALUE_NAMES.get(name, {}).get(value, value)
+        if isinstance(in_effect.get("journal_mode"), str):
+            in_effect["journal_mode"] = str(in_effect["journal_mode"]).upper()
+        return in_effect
+
+    def health_check(self) -> dict[str, Any]:
+        """
+        Check database connectivity and compare the pragmas in effect with the configured ones
+
+        Returns:
+            Dictionary with status ("ok", "degraded" or "error"), pragmas in effect and mismatches
+        """
+        try:
+            in_effect = self.get_pragmas()
+        except SQLAlchemyError as e:
+            self._logger.exception("Database health check failed")
+            return {"status": "error", "error": str(e)}
+
+        mismatches = {
+            name: {"configured": expected, "in_effect": in_effect.get(name)}
+            for name, expected in self._pragmas.items()
+            if in_effect.get(name) != expected
+        }
+        return {"status": "degraded" if mismatches else "ok", "pragmas": in_effect, "mismatches": mismatches}
+
     @property
     def session(self):
-        """Get the current session (for read-only operations)"""
+        """Get the current writer-side session (reads that must see uncommitted writes)"""
         return self._db.session
@@ -0,0 +1,69 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Compact date encoding used for stored quotes.
+
+Quote dates are stored as integer day numbers (days since 1970-01-01) and
+converted to ISO strings (YYYY-MM-DD) only at the DTO/API boundary.
+In SQLite: day = julianday('YYYY-MM-DD') - 2440587.5, date(2440587.5 + day).
+"""
+import datetime as dt
+import numpy as np
+
+EPOCH: dt.date = dt.date(1970, 1, 1)
+EPOCH_ORDINAL: int = EPOCH.toordinal()
+
+
+def to_day_number(value: dt.date | dt.datetime | str) -> int:
+    """
+    Convert a date, datetime or ISO string to days since 1970-01-01
+
+    Args:
+        value: Date to convert (time of day is ignored)
+
+    Returns:
+        Day number
+    """
+    if isinstance(value, str):
+        value = dt.date.fromisoformat(value[:10])
+    elif isinstance(value, dt.datetime):
+        value = value.date()
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def from_day_number(day: int) -> str:
+    """
+    Convert days since 1970-01-01 to an ISO date string
+
+    Args:
+        day: Day number
+
+    Returns:
+        Date in YYYY-MM-DD format
+    """
+    return dt.date.fromordinal(EPOCH_ORDINAL + int(day)).isoformat()
+
+
+def to_date(day: int) -> dt.datetime:
+    """
+    Convert days since 1970-01-01 to a datetime at midnight
+
+    Args:
+        day: Day number
+
+    Returns:
+        datetime for that day
+    """
+    return dt.datetime.combine(dt.date.fromordinal(EPOCH_ORDINAL + int(day)), dt.time())
+
+
+def to_day_numbers(dates: list[str] | np.ndarray) -> np.ndarray:
+    """Vectorized conversion of YYYY-MM-DD strings to int32 day numbers"""
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int32)
+
+
+def to_date_strings(days: list[int] | np.ndarray) -> list[str]:
+    """Vectorized conversion of day numbers to YYYY-MM-DD strings"""
+    return np.datetime_as_string(np.asarray(days, dtype=np.int64).astype("datetime64[D]"), unit="D").tolist()
@@ -0,0 +1,61 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Time series downsampling for charts.
+Implements Largest-Triangle-Three-Buckets (Steinarsson, 2013) with NumPy.
+"""
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The interior is split into
+    threshold - 2 buckets; from each bucket the point forming the largest
+    triangle with the previously selected point and the average of the next
+    bucket is kept. Bucket averages are computed in one pass with reduceat and
+    the triangle areas of each bucket are evaluated vectorized, so the Python
+    loop runs threshold - 2 times regardless of the series length.
+
+    Args:
+        x: Monotonic x values (e.g. day numbers), shape (n,)
+        y: y values (e.g. closing prices), shape (n,)
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted array of selected indices (all indices if no downsampling is needed)
+    """
+    n: int = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # threshold - 2 buckets over the interior points [1, n - 1)
+    edges: np.ndarray = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    starts: np.ndarray = edges[:-1]
+    counts: np.ndarray = np.diff(edges)
+
+    # Average of every bucket; the "next" average of the last bucket is the last point
+    avg_x: np.ndarray = np.add.reduceat(x[: n - 1], starts) / counts
+    avg_y: np.ndarray = np.add.reduceat(y[: n - 1], starts) / counts
+    next_x: np.ndarray = np.append(avg_x[1:], x[-1])
+    next_y: np.ndarray = np.append(avg_y[1:], y[-1])
+
+    selected: np.ndarray = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    anchor: int = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        ax, ay = x[anchor], y[anchor]
+        areas = np.abs((ax - next_x[bucket]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[bucket] - ay))
+        anchor = lo + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+
+    return selected
@@ -0,0 +1,162 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Rule-based exchange trading calendars.
+
+A calendar knows the weekend days and the yearly holiday rules of an
+exchange (fixed dates and Easter-relative dates), so the ingestion planner
+can tell locally whether a new trading session happened since the last
+stored quote. Calendars are selected by ticker suffix (e.g. ".MI" for
+Borsa Italiana); unknown suffixes fall back to a weekdays-only calendar,
+which never skips a real session.
+"""
+import datetime as dt
+from functools import lru_cache
+
+
+def easter_sunday(year: int) -> dt.date:
+    """
+    Compute Western (Gregorian) Easter Sunday with the anonymous Gregorian algorithm
+
+    Args:
+        year: Calendar year
+
+    Returns:
+        Date of Easter Sunday
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+class ExchangeCalendar:
+    """Trading calendar defined by weekend days, fixed-date holidays and Easter-relative holidays"""
+
+    def __init__(
+        self,
+        name: str,
+        fixed_holidays: tuple[tuple[int, int], ...] = (),
+        easter_offsets: tuple[int, ...] = (),
+        weekend: tuple[int, ...] = (5, 6),
+    ) -> None:
+        """
+        Initialize ExchangeCalendar
+
+        Args:
+            name: Exchange name (logs only)
+            fixed_holidays: (month, day) closures repeating every year
+            easter_offsets: Closures relative to Easter Sunday in days (-2 = Good Friday, 1 = Easter Monday)
+            weekend: Weekday numbers without sessions (Monday = 0)
+        """
+        self.name = name
+        self.fixed_holidays = fixed_holidays
+        self.easter_offsets = easter_offsets
+        self.weekend = weekend
+        self.holidays = lru_cache(maxsize=64)(self._holidays)
+
+    def _holidays(self, year: int) -> frozenset[dt.date]:
+        """Return the weekday closures of a year"""
+        easter: dt.date = easter_sunday(year)
+        days = {dt.date(year, month, day) for month, day in self.fixed_holidays}
+        days |= {easter + dt.timedelta(days=offset) for offset in self.easter_offsets}
+        return frozenset(days)
+
+    def is_session(self, day: dt.date) -> bool:
+        """
+        Tell whether the exchange trades on a day
+
+        Args:
+            day: Calendar date
+
+        Returns:
+            True for a trading session
+        """
+        return day.weekday() not in self.weekend and day not in self.holidays(day.year)
+
+    def next_session(self, day: dt.date) -> dt.date:
+        """
+        Return the first trading session on or after a day
+
+        Args:
+            day: Calendar date
+
+        Returns:
+            Date of the session
+        """
+        while not self.is_session(day):
+            day += dt.timedelta(days=1)
+        return day
+
+    def has_session(self, start: dt.date, end: dt.date) -> bool:
+        """
+        Tell whether at least one session falls in [start, end)
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (exclusive)
+
+        Returns:
+            True if a session is expected in the range
+        """
+        return start < end and self.next_session(start) < end
+
+
+# Weekdays only: used for exchanges without holiday rules (never skips a real session)
+WEEKDAYS = ExchangeCalendar("Weekdays")
+
+# Borsa Italiana (ETFplus): New Year, Good Friday, Easter Monday, Labour Day,
+# Ferragosto, Christmas Eve, Christmas, St. Stephen's Day, New Year's Eve
+BORSA_ITALIANA = ExchangeCalendar(
+    "Borsa Italiana",
+    fixed_holidays=((1, 1), (5, 1), (8, 15), (12, 24), (12, 25), (12, 26), (12, 31)),
+    easter_offsets=(-2, 1),
+)
+
+# Calendar of each Yahoo Finance ticker suffix
+CALENDARS_BY_SUFFIX: dict[str, ExchangeCalendar] = {
+    ".MI": BORSA_ITALIANA,
+}
+
+
+def get_calendar(ticker: str) -> ExchangeCalendar:
+    """
+    Return the trading calendar of a ticker from its exchange suffix
+
+    Args:
+        ticker: Yahoo Finance ticker (e.g. SWDA.MI)
+
+    Returns:
+        Exchange calendar (weekdays only for unknown suffixes)
+    """
+    _, dot, suffix = ticker.rpartition(".")
+    return CALENDARS_BY_SUFFIX.get(f".{suffix.upper()}", WEEKDAYS) if dot else WEEKDAYS
+
+
+def next_download_start(ticker: str, last_date: dt.datetime, end_date: dt.datetime) -> dt.datetime | None:
+    """
+    Return the download start date of a ticker, or None when no new session can be downloaded
+
+    A ticker is up to date when its next trading session after last_date is not
+    before end_date (the exclusive download end date).
+
+    Args:
+        ticker: Yahoo Finance ticker (e.g. SWDA.MI)
+        last_date: Date of the last stored quote
+        end_date: Exclusive download end date
+
+    Returns:
+        Day after last_date, or None if the ticker is up to date
+    """
+    start_date: dt.datetime = last_date + dt.timedelta(days=1)
+    next_session: dt.date = get_calendar(ticker).next_session(start_date.date())
+    return None if dt.datetime.combine(next_session, dt.time()) >= end_date else start_date
@@ -0,0 +1,294 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Process-wide rate limiting for calls to external quote providers.
+
+A token bucket bounds the sustained request rate (with bursts up to the
+bucket capacity); throttling and transient failures are retried with
+jittered exponential backoff ("full jitter"). A throttle response also
+pauses the shared bucket, so every concurrent caller backs off together
+instead of hammering the provider.
+
+Limiters are shared by name through get_rate_limiter(), so every download
+call site in the process draws from the same bucket.
+"""
+from __future__ import annotations
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+from core.log import LoggerManager
+
+if TYPE_CHECKING:
+    from core.config import RateLimitConfig
+
+T = TypeVar("T")
+
+
+class ThrottledError(Exception):
+    """The provider rejected the request because of rate limiting (e.g. HTTP 429)"""
+
+
+class TransientError(Exception):
+    """The request failed for a reason worth retrying (timeout, connection reset, 5xx)"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: refills at rate tokens/second up to capacity"""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """
+        Initialize TokenBucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = float(capacity)
+        self._updated: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block until the tokens are available and take them
+
+        Requests larger than the capacity wait for a full bucket and leave it in
+        debt, so large batches are paced instead of rejected.
+
+        Args:
+            tokens: Tokens to take (one per upstream request)
+
+        Returns:
+            Seconds spent waiting
+        """
+        needed: float = min(tokens, self.capacity)
+        waited: float = 0.0
+        while True:
+            with self._lock:
+                now: float = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if now >= self._paused_until and self._tokens >= needed:
+                    self._tokens -= tokens
+                    return waited
+
+                delay: float = max(self._paused_until - now, (needed - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def configure(self, rate: float, capacity: int) -> None:
+        """
+        Change the refill rate and capacity (tokens already in the bucket are kept, up to the new capacity)
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.rate = rate
+            self.capacity = capacity
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for the given time (shared cool-down after throttling)
+
+        Args:
+            seconds: Cool-down duration
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """Token bucket plus retry with jittered exponential backoff, with metrics"""
+
+    def __init__(
+        self,
+        requests_per_second: float = 2.0,
+        burst: int = 10,
+        max_retries: int = 4,
+        backoff_base_s: float = 1.0,
+        backoff_max_s: float = 60.0,
+        name: str = "default",
+    ) -> None:
+        """
+        Initialize RateLimiter
+
+        Args:
+            requests_per_second: Sustained request rate
+            burst: Bucket capacity (requests allowed back to back)
+            max_retries: Retries after a throttled or transient failure
+            backoff_base_s: Backoff ceiling of the first retry (doubles at every attempt)
+            backoff_max_s: Upper bound of the backoff ceiling
+            name: Name used in logs
+        """
+        self.bucket = TokenBucket(rate=requests_per_second, capacity=burst)
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.name = name
+        self._metrics: dict[str, float] = {
+            "calls": 0,
+            "tokens": 0,
+            "wait_seconds": 0.0,
+            "throttle_events": 0,
+            "transient_errors": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+        self._lock = threading.Lock()
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def call(self, func: Callable[..., T], *args: Any, cost: int | Callable[[], int] = 1, **kwargs: Any) -> T:
+        """
+        Call func under the rate limit, retrying throttled and transient failures
+
+        Args:
+            func: Function performing the upstream request(s)
+            *args: Positional arguments of func
+            cost: Tokens consumed per attempt (number of upstream requests), or a function
+                returning them before each attempt (e.g. only the requests a retry repeats)
+            **kwargs: Keyword arguments of func
+
+        Returns:
+            Result of func
+
+        Raises:
+            ThrottledError: Still throttled after max_retries retries
+            TransientError: Still failing after max_retries retries
+            Exception: Any other exception of func (not retried)
+        """
+        attempt: int = 0
+        while True:
+            tokens: int = cost() if callable(cost) else cost
+            waited: float = self.bucket.acquire(tokens)
+            self._record(calls=1, tokens=tokens, wait_seconds=waited)
+            try:
+                return func(*args, **kwargs)
+            except (ThrottledError, TransientError) as e:
+                throttled: bool = isinstance(e, ThrottledError)
+                self._record(throttle_events=int(throttled), transient_errors=int(not throttled))
+                if attempt >= self.max_retries:
+                    self._record(failures=1)
+                    self.logger.error(f"[{self.name}] giving up after {attempt} retries: {e}")
+                    raise
+
+                delay: float = self._backoff(attempt)
+                if throttled:
+                    # Everyone sharing the bucket backs off, not only this caller
+                    self.bucket.pause(delay)
+                attempt += 1
+                self._record(retries=1)
+                self.logger.warning(
+                    f"[{self.name}] {'throttled' if throttled else 'transient error'} ({e}), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    def configure(self, config: RateLimitConfig) -> bool:
+        """
+        Apply new settings to the limiter (callers already sharing it are affected too)
+
+        Args:
+            config: Rate limit settings
+
+        Returns:
+            True if any setting changed
+        """
+        settings: tuple[float, int, int, float, float] = (
+            config.requests_per_second,
+            config.burst,
+            config.max_retries,
+            config.backoff_base_s,
+            config.backoff_max_s,
+        )
+        current: tuple[float, int, int, float, float] = (
+            self.bucket.rate,
+            self.bucket.capacity,
+            self.max_retries,
+            self.backoff_base_s,
+            self.backoff_max_s,
+        )
+        if settings == current:
+            return False
+
+        self.bucket.configure(rate=config.requests_per_second, capacity=config.burst)
+        self.max_retries = config.max_retries
+        self.backoff_base_s = config.backoff_base_s
+        self.backoff_max_s = config.backoff_max_s
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the limiter settings and counters
+
+        Returns:
+            Dictionary with rate, burst, calls, tokens, wait_seconds, throttle_events,
+            transient_errors, retries and failures
+        """
+        with self._lock:
+            metrics: dict[str, Any] = dict(self._metrics)
+        metrics["wait_seconds"] = round(metrics["wait_seconds"], 3)
+        return {"name": self.name, "rate": self.bucket.rate, "burst": self.bucket.capacity, **metrics}
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform in [0, min(max, base * 2^attempt)]"""
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2**attempt)))
+
+    def _record(self, **increments: float) -> None:
+        """Add increments to the metric counters"""
+        with self._lock:
+            for key, value in increments.items():
+                self._metrics[key] += value
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str = "yfinance", config: RateLimitConfig | None = None) -> RateLimiter:
+    """
+    Get the process-wide rate limiter with the given name (created on first use)
+
+    A config passed for a limiter that already exists with different settings is
+    applied to it (with a warning): the latest explicit configuration wins.
+
+    Args:
+        name: Limiter name (one per upstream service)
+        config: Limiter settings (defaults when None and the limiter does not exist yet)
+
+    Returns:
+        Shared RateLimiter instance
+    """
+    with _limiters_lock:
+        limiter: RateLimiter | None = _limiters.get(name)
+        if limiter is not None:
+            if config is not None and limiter.configure(config):
+                limiter.logger.warning(
+                    f"[{name}] rate limiter reconfigured: {config.requests_per_second}/s, burst {config.burst}, "
+                    f"{config.max_retries} retries"
+                )
+        else:
+            if config is None:
+                from core.config import RateLimitConfig
+
+                config = RateLimitConfig()
+            limiter = RateLimiter(
+                requests_per_second=config.requests_per_second,
+                burst=config.burst,
+                max_retries=config.max_retries,
+                backoff_base_s=config.backoff_base_s,
+                backoff_max_s=config.backoff_max_s,
+                name=name,
+            )
+            _limiters[name] = limiter
+        return limiter
@@ -0,0 +1,179 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Single-flight coalescing of concurrent work on the same key.
+
+The first caller for a key becomes the leader and does the work; callers
+arriving while it is in flight wait for the leader and get its result (or
+its exception) instead of repeating the work. Keys are released as soon as
+the leader resolves them, so later callers start fresh work.
+
+Bulk callers claim many keys at once: they lead the free keys and follow
+the busy ones. To avoid deadlocks between two bulk callers, a caller must
+resolve every key it leads before waiting on the keys it follows.
+
+Registries are shared by name through get_single_flight(), so every call
+site in the process coalesces on the same keys.
+"""
+from __future__ import annotations
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+from core.log import LoggerManager
+
+T = TypeVar("T")
+
+
+class Flight:
+    """One in-flight unit of work: followers wait on it until the leader resolves it"""
+
+    def __init__(self) -> None:
+        """Initialize Flight"""
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+    def wait(self, timeout: float | None = None) -> Any:
+        """
+        Wait for the leader and return its result
+
+        Args:
+            timeout: Maximum seconds to wait (None: no limit)
+
+        Returns:
+            Result passed by the leader
+
+        Raises:
+            TimeoutError: The leader did not resolve the flight in time
+            Exception: The exception the leader failed with
+        """
+        if not self.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for the in-flight call")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """Registry of in-flight keys with coalesced-call counters"""
+
+    def __init__(self, name: str = "default") -> None:
+        """
+        Initialize SingleFlight
+
+        Args:
+            name: Name used in logs and stats
+        """
+        self.name = name
+        self._flights: dict[Hashable, Flight] = {}
+        self._metrics: dict[str, int] = {"leaders": 0, "coalesced": 0}
+        self._lock = threading.Lock()
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def do(self, key: Hashable, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call func for key, or wait for the call already in flight for key
+
+        Args:
+            key: Work identifier (e.g. ticker)
+            func: Function doing the work
+            *args: Positional arguments of func
+            **kwargs: Keyword arguments of func
+
+        Returns:
+            Result of func (the leader's result for coalesced callers)
+
+        Raises:
+            Exception: Exception of func (the leader's exception for coalesced callers)
+        """
+        led, followed = self.claim([key])
+        if followed:
+            return followed[key].wait()
+
+        try:
+            result: T = func(*args, **kwargs)
+        except BaseException as e:
+            self.resolve(key, error=e)
+            raise
+        self.resolve(key, result=result)
+        return result
+
+    def claim(self, keys: list[Hashable]) -> tuple[list[Hashable], dict[Hashable, Flight]]:
+        """
+        Lead the free keys and follow the ones already in flight
+
+        Every led key must be passed to resolve() exactly once, before waiting on
+        the followed flights.
+
+        Args:
+            keys: Work identifiers
+
+        Returns:
+            Tuple of (keys led by the caller, key -> flight to wait on for keys in flight)
+        """
+        led: list[Hashable] = []
+        followed: dict[Hashable, Flight] = {}
+        with self._lock:
+            for key in keys:
+                flight: Flight | None = self._flights.get(key)
+                if flight is None:
+                    self._flights[key] = Flight()
+                    led.append(key)
+                elif key not in followed:
+                    followed[key] = flight
+            self._metrics["leaders"] += len(led)
+            self._metrics["coalesced"] += len(followed)
+
+        if followed:
+            self.logger.info(f"[{self.name}] coalesced with in-flight calls: {list(followed)}")
+        return led, followed
+
+    def resolve(self, key: Hashable, result: Any = None, error: BaseException | None = None) -> None:
+        """
+        Publish the outcome of a led key, wake its followers and release the key
+
+        Args:
+            key: Work identifier returned as led by claim()
+            result: Result handed to the followers
+            error: Exception raised in the followers instead of returning a result
+        """
+        with self._lock:
+            flight: Flight | None = self._flights.pop(key, None)
+        if flight is None:
+            return
+        flight.result = result
+        flight.error = error
+        flight.done.set()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the registry counters
+
+        Returns:
+            Dictionary with name, in_flight, leaders and coalesced
+        """
+        with self._lock:
+            return {"name": self.name, "in_flight": len(self._flights), **self._metrics}
+
+
+_registries: dict[str, SingleFlight] = {}
+_registries_lock = threading.Lock()
+
+
+def get_single_flight(name: str = "quotes") -> SingleFlight:
+    """
+    Get the process-wide single-flight registry with the given name (created on first use)
+
+    Args:
+        name: Registry name (one per kind of work)
+
+    Returns:
+        Shared SingleFlight instance
+    """
+    with _registries_lock:
+        registry: SingleFlight | None = _registries.get(name)
+        if registry is None:
+            registry = SingleFlight(name=name)
+            _registries[name] = registry
+        return registry
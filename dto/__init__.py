@@ -9,6 +9,7 @@ from .etf_replication_type import ETFReplicationType
 from .quote import Quote
 from .quote_period import QuotePeriod
 from .quote_response import QuoteResponse
+from .quote_matrix_response import QuoteMatrixResponse
 from .error_response import ErrorResponse
 from .index import Index
 from .etf_screener_filters import ETFScreenerFilters
@@ -21,6 +22,7 @@ __all__ = [
     "Quote",
     "QuotePeriod",
     "QuoteResponse",
+    "QuoteMatrixResponse",
     "ErrorResponse",
     "Index",
     "ETFScreenerFilters",
@@ -2,7 +2,9 @@
 # Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Any
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from core.day_number import from_day_number
 
 
 class Quote(BaseModel):
@@ -18,3 +20,9 @@ class Quote(BaseModel):
     volume: int | None = Field(None, ge=0, alias="Volume")
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def day_number_to_iso(cls, v: Any) -> Any:
+        """Convert stored day numbers (days since 1970-01-01) to YYYY-MM-DD"""
+        return from_day_number(v) if isinstance(v, int) else v
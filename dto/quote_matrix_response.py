@@ -0,0 +1,25 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class QuoteMatrixResponse(BaseModel):
+    """DTO for multi-ticker aligned quote API response (date x ticker matrix)"""
+
+    tickers: list[str] = Field(..., description="ETF ticker symbols (matrix columns)")
+    labels: list[str] = Field(..., description="Common list of dates (matrix rows)")
+    series: dict[str, list[float | None]] = Field(..., description="Closing prices per ticker, aligned with labels")
+    normalize: float | None = Field(None, description="Base value each series was rebased to, if any")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "tickers": ["SWDA.MI", "CSSPX.MI"],
+                "labels": ["2024-01-02", "2024-01-03"],
+                "series": {"SWDA.MI": [100.0, 100.4], "CSSPX.MI": [100.0, 99.8]},
+                "normalize": 100.0,
+            }
+        }
+    )
@@ -10,6 +10,7 @@ import argparse
 from dateutil.relativedelta import relativedelta
 import sys
 import pandas as pd
+from core.day_number import to_date, to_day_number
 
 
 def get_start_date(period):
@@ -55,7 +56,11 @@ start_date = get_start_date(etf_period)
 try:
     cnx = db.connect("database/etfs.db")
     cur = cnx.cursor()
-    cur.execute('SELECT Date, Close, Volume FROM quotes WHERE Ticker="' + args.ticker + '" and Date > ?', [start_date])
+    # Quote dates are stored as day numbers (days since 1970-01-01)
+    cur.execute(
+        "SELECT Date, Close, Volume FROM quotes WHERE Ticker = ? and Date > ?",
+        [args.ticker, to_day_number(start_date)],
+    )
     all_rows = cur.fetchall()
 except Exception as e:
     print("Failed to load quotes from database:")
@@ -70,7 +75,7 @@ if len(all_rows) == 0:
 try:
     cnx = db.connect("database/etfs.db")
     cur = cnx.cursor()
-    cur.execute('SELECT Name, Currency FROM etfs WHERE Ticker="' + args.ticker + '"')
+    cur.execute("SELECT Name, Currency FROM etfs WHERE Ticker = ?", [args.ticker])
     etf_data = cur.fetchone()
     etf_name = etf_data[0]
     etf_currency = etf_data[1]
@@ -80,7 +85,7 @@ finally:
     cnx.close()
 
 days = list(zip(*all_rows))[0]
-dates = [dt.datetime.strptime(d, "%Y-%m-%d").date() for d in days]
+dates = [to_date(d).date() for d in days]
 prices = list(zip(*all_rows))[1]
 volumes = list(zip(*all_rows))[2]
 labels = ["Close"]
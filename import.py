@@ -47,8 +47,10 @@ try:
     print("Import Quotes ...")
     cur.execute("DROP TABLE IF EXISTS quotes;")
 
-    sql = """CREATE TABLE quotes ('Ticker' TEXT, 'Date' REAL, 'Open' REAL, 'High' REAL, 'Low' REAL, 'Close' REAL, \
-        'Adj_Close' REAL, 'Volume' REAL, PRIMARY KEY('Ticker', 'Date'), FOREIGN KEY('Ticker') REFERENCES etfs('Ticker'))"""
+    # Date is stored as days since 1970-01-01 (see core/day_number.py)
+    sql = """CREATE TABLE quotes ('Ticker' TEXT, 'Date' INTEGER, 'Open' REAL, 'High' REAL, 'Low' REAL, 'Close' REAL, \
+        'Adj_Close' REAL, 'Volume' INTEGER, PRIMARY KEY('Ticker', 'Date'), \
+        FOREIGN KEY('Ticker') REFERENCES etfs('Ticker')) WITHOUT ROWID"""
 
     cur.execute(sql)
 
@@ -74,10 +76,24 @@ try:
             to_db[i] = (ticker,) + to_db[i]
         cur.executemany(
             "INSERT INTO quotes (Ticker, Date, Open, High, Low, Close, Adj_Close, Volume) \
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?);",
+            VALUES (?, CAST(julianday(?) - 2440587.5 AS INTEGER), ?, ?, ?, ?, ?, ?);",
             to_db,
         )
 
+    print("Build quote sync state ...")
+    cur.execute("DROP TABLE IF EXISTS quote_sync_state;")
+
+    # One row per ticker: latest quote day and row count, used to plan incremental downloads
+    sql = """CREATE TABLE quote_sync_state ('ticker' TEXT primary key, 'last_date' INTEGER, 'last_attempt' TEXT, \
+        'last_status' TEXT, 'row_count' INTEGER NOT NULL DEFAULT 0, \
+        FOREIGN KEY('ticker') REFERENCES etfs('Ticker') ON DELETE CASCADE)"""
+
+    cur.execute(sql)
+    cur.execute(
+        "INSERT INTO quote_sync_state (ticker, last_date, last_status, row_count) \
+        SELECT Ticker, MAX(Date), 'ok', COUNT(*) FROM quotes GROUP BY Ticker;"
+    )
+
     print("Import Dividends ...")
     cur.execute("DROP TABLE IF EXISTS dividends;")
 
@@ -0,0 +1,176 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Migrate quotes.Date from ISO strings (String(20) / REAL) to integer day numbers.
+
+The quotes table is rebuilt with the current QuoteDAO schema (Date INTEGER,
+WITHOUT ROWID clustered on (Ticker, Date)), every date is converted in SQL
+with julianday(), and the database is VACUUMed. Database size and range
+query time are measured before and after.
+
+Usage:
+    uv run python migrate_quote_dates.py                  # database/etfs.db
+    uv run python migrate_quote_dates.py --db other.db --no-backup
+"""
+from __future__ import annotations
+import argparse
+import shutil
+import sqlite3
+import statistics
+import time
+import datetime as dt
+from pathlib import Path
+from dateutil.relativedelta import relativedelta
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from sqlalchemy.schema import CreateTable
+from tabulate import tabulate
+from core.config import DatabaseConfig
+from core.day_number import to_day_number
+from models import QuoteDAO
+
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+DEFAULT_DATABASE_PATH = Path(DatabaseConfig().relative_path)
+REPEAT = 5
+
+# julianday('1970-01-01') == 2440587.5
+TO_DAY_NUMBER_SQL = "CAST(julianday(substr(Date, 1, 10)) - 2440587.5 AS INTEGER)"
+
+
+# -----------------------------------------------------------------------------
+# Measurements
+# -----------------------------------------------------------------------------
+
+
+def measure_range_queries(cnx: sqlite3.Connection, integer_dates: bool) -> dict[str, float]:
+    """
+    Time the chart range query (Date, Close for one ticker after a cutoff) for every ticker.
+
+    Returns:
+        Median total milliseconds over all tickers, per period
+    """
+    tickers = [row[0] for row in cnx.execute("SELECT DISTINCT Ticker FROM quotes")]
+    cutoffs = {
+        "5Y": dt.date.today() - relativedelta(years=5),
+        "Max": dt.date(1970, 1, 1),
+    }
+
+    results: dict[str, float] = {}
+    for period, cutoff in cutoffs.items():
+        bound: int | str = to_day_number(cutoff) if integer_dates else cutoff.strftime("%Y-%m-%d")
+        timings: list[float] = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            for ticker in tickers:
+                cnx.execute(
+                    "SELECT Date, Close FROM quotes WHERE Ticker = ? AND Date > ? ORDER BY Date", (ticker, bound)
+                ).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[period] = statistics.median(timings)
+    return results
+
+
+def database_size(db_path: Path) -> float:
+    """Return the database file size in MB"""
+    return db_path.stat().st_size / (1024 * 1024)
+
+
+# -----------------------------------------------------------------------------
+# Migration
+# -----------------------------------------------------------------------------
+
+
+def is_migrated(cnx: sqlite3.Connection) -> bool:
+    """Return True if quotes.Date is already declared INTEGER"""
+    for _, name, declared_type, *_ in cnx.execute("PRAGMA table_info(quotes)"):
+        if name == "Date":
+            return declared_type.upper() == "INTEGER"
+    raise ValueError("Table 'quotes' not found or has no Date column")
+
+
+def migrate(cnx: sqlite3.Connection) -> tuple[int, int]:
+    """
+    Rebuild the quotes table with integer day numbers in a single transaction.
+
+    Returns:
+        Tuple of (rows before, rows after); rows with unparsable dates or no Close are dropped
+    """
+    create_sql: str = str(CreateTable(QuoteDAO.__table__).compile(dialect=sqlite_dialect.dialect()))
+    create_sql = create_sql.replace("CREATE TABLE quotes", "CREATE TABLE quotes_migrated", 1)
+
+    rows_before: int = cnx.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+    with cnx:
+        cnx.execute("DROP TABLE IF EXISTS quotes_migrated")
+        cnx.execute(create_sql)
+        cnx.execute(
+            f"""INSERT OR IGNORE INTO quotes_migrated (Ticker, Date, Open, High, Low, Close, Adj_Close, Volume)
+            SELECT Ticker, {TO_DAY_NUMBER_SQL}, Open, High, Low, Close, Adj_Close, CAST(Volume AS INTEGER)
+            FROM quotes WHERE julianday(substr(Date, 1, 10)) IS NOT NULL
+            ORDER BY Ticker, Date"""
+        )
+        cnx.execute("DROP TABLE quotes")
+        cnx.execute("ALTER TABLE quotes_migrated RENAME TO quotes")
+    rows_after: int = cnx.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+
+    cnx.execute("VACUUM")
+    return rows_before, rows_after
+
+
+# -----------------------------------------------------------------------------
+# CLI arguments
+# -----------------------------------------------------------------------------
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Migrate quotes.Date to integer day numbers")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DATABASE_PATH, help="SQLite database path")
+    parser.add_argument("--no-backup", action="store_true", help="Do not copy the database to <db>.bak first")
+    return parser.parse_args()
+
+
+# -----------------------------------------------------------------------------
+# Entry point
+# -----------------------------------------------------------------------------
+def main() -> None:
+    args = parse_args()
+
+    cnx = sqlite3.connect(args.db)
+    try:
+        if is_migrated(cnx):
+            print(f"{args.db}: quotes.Date is already an integer day number, nothing to do")
+            return
+
+        if not args.no_backup:
+            backup_path = args.db.with_name(args.db.name + ".bak")
+            shutil.copy2(args.db, backup_path)
+            print(f"Backup written to {backup_path}")
+
+        # VACUUM first so the size comparison is not skewed by free pages
+        cnx.execute("VACUUM")
+        size_before = database_size(args.db)
+        queries_before = measure_range_queries(cnx, integer_dates=False)
+
+        print("Migrating quotes.Date ...")
+        rows_before, rows_after = migrate(cnx)
+
+        size_after = database_size(args.db)
+        queries_after = measure_range_queries(cnx, integer_dates=True)
+    finally:
+        cnx.close()
+
+    print(f"Migrated {rows_after} quotes ({rows_before - rows_after} dropped: invalid date or missing Close)")
+    report = [["Database size (MB)", f"{size_before:.2f}", f"{size_after:.2f}"]]
+    for period in queries_before:
+        report.append(
+            [f"Range query {period}, all tickers (ms)", f"{queries_before[period]:.2f}", f"{queries_after[period]:.2f}"]
+        )
+    print(tabulate(report, headers=["Metric", "Before", "After"], tablefmt="orgtbl"))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,20 @@
 # Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
+from .dividend import DividendDAO
 from .etf import EtfDAO
 from .quote import QuoteDAO
+from .quote_job import QuoteJobDAO
+from .quote_sync_state import QuoteSyncStateDAO
+from .quote_update_run import QuoteUpdateRunDAO
+from .quote_update_run_ticker import QuoteUpdateRunTickerDAO
 
-__all__ = ["EtfDAO", "QuoteDAO"]
+__all__ = [
+    "DividendDAO",
+    "EtfDAO",
+    "QuoteDAO",
+    "QuoteJobDAO",
+    "QuoteSyncStateDAO",
+    "QuoteUpdateRunDAO",
+    "QuoteUpdateRunTickerDAO",
+]
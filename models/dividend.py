@@ -0,0 +1,24 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from core.database import db
+
+
+class DividendDAO(db.Model):
+    """SQLAlchemy model for ETF dividends (the dividends table created by import.py)"""
+
+    __tablename__ = "dividends"
+
+    Ticker = db.Column(
+        db.String(10),
+        db.ForeignKey("etfs.ticker", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    Date = db.Column(db.String(10), primary_key=True, nullable=False)  # Ex-date, YYYY-MM-DD format
+    Dividend = db.Column(db.Float, nullable=False)
+    Pay_Date = db.Column(db.String(10))  # YYYY-MM-DD format (not provided by yfinance)
+
+    def __repr__(self):
+        return f"<DividendDAO {self.Ticker} {self.Date}: {self.Dividend}>"
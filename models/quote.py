@@ -3,12 +3,15 @@
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
 from core.database import db
+from core.day_number import from_day_number
 
 
 class QuoteDAO(db.Model):
     """SQLAlchemy model for ETF quotes"""
 
     __tablename__ = "quotes"
+    # Clustered on (Ticker, Date): a ticker's date range is one contiguous B-tree scan
+    __table_args__ = {"sqlite_with_rowid": False}
 
     Ticker = db.Column(
         db.String(10),
@@ -16,7 +19,7 @@ class QuoteDAO(db.Model):
         primary_key=True,
         nullable=False,
     )
-    Date = db.Column(db.String(20), primary_key=True, nullable=False)
+    Date = db.Column(db.Integer, primary_key=True, nullable=False)  # Days since 1970-01-01 (core.day_number)
     Open = db.Column(db.Float)
     High = db.Column(db.Float)
     Low = db.Column(db.Float)
@@ -25,4 +28,4 @@ class QuoteDAO(db.Model):
     Volume = db.Column(db.Integer)
 
     def __repr__(self):
-        return f"<QuoteDAO {self.Ticker} {self.Date}: {self.Close}>"
+        return f"<QuoteDAO {self.Ticker} {from_day_number(self.Date)}: {self.Close}>"
@@ -0,0 +1,26 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from core.database import db
+
+
+class QuoteJobDAO(db.Model):
+    """SQLAlchemy model for a queued quote update job (run by the in-process QuoteJobQueue)"""
+
+    __tablename__ = "quote_jobs"
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(10), nullable=False)  # ticker (one ETF), all (bulk update)
+    ticker = db.Column(db.String(10))  # NULL for bulk updates
+    resume = db.Column(db.Boolean, nullable=False, default=False)  # Bulk updates: resume an unfinished run
+    status = db.Column(db.String(10), nullable=False, default="queued")  # queued, running, succeeded, failed
+    result = db.Column(db.Text)  # JSON result of the update
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        target = self.ticker if self.kind == "ticker" else "all ETFs"
+        return f"<QuoteJobDAO {self.id} {target}: {self.status}>"
@@ -0,0 +1,31 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from core.database import db
+from core.day_number import from_day_number
+
+
+class QuoteSyncStateDAO(db.Model):
+    """SQLAlchemy model for the per-ticker quote sync state (kept in step with quotes by the insert path)"""
+
+    __tablename__ = "quote_sync_state"
+
+    ticker = db.Column(
+        db.String(10),
+        db.ForeignKey("etfs.ticker", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    last_date = db.Column(db.Integer)  # Latest stored quote, days since 1970-01-01 (NULL: no quotes)
+    last_attempt = db.Column(db.DateTime)  # Last download attempt
+    last_status = db.Column(db.String(20))  # ok, no_data, error
+    row_count = db.Column(db.Integer, nullable=False, default=0)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # Bumped on every quote change
+    updated_at = db.Column(db.DateTime)  # Last change of the stored quotes (UTC), HTTP Last-Modified
+
+    def __repr__(self):
+        last_date = from_day_number(self.last_date) if self.last_date is not None else None
+        return (
+            f"<QuoteSyncStateDAO {self.ticker} {last_date}: {self.row_count} quotes, "
+            f"v{self.version}, {self.last_status}>"
+        )
@@ -0,0 +1,22 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from core.database import db
+from core.day_number import from_day_number
+
+
+class QuoteUpdateRunDAO(db.Model):
+    """SQLAlchemy model for a bulk quote update run (checkpointed per ticker in quote_update_run_tickers)"""
+
+    __tablename__ = "quote_update_runs"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    source = db.Column(db.String(10), nullable=False)  # cron, api, sse, job
+    end_date = db.Column(db.Integer, nullable=False)  # Download end of the run, days since 1970-01-01
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)  # NULL while running or after an interruption
+
+    def __repr__(self):
+        state = "finished" if self.finished_at is not None else "unfinished"
+        return f"<QuoteUpdateRunDAO {self.id} ({self.source}) up to {from_day_number(self.end_date)}: {state}>"
@@ -0,0 +1,24 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from core.database import db
+
+
+class QuoteUpdateRunTickerDAO(db.Model):
+    """SQLAlchemy model for the status of one ticker in a bulk quote update run"""
+
+    __tablename__ = "quote_update_run_tickers"
+
+    run_id = db.Column(
+        db.Integer,
+        db.ForeignKey("quote_update_runs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    ticker = db.Column(db.String(10), primary_key=True)
+    status = db.Column(db.String(10), nullable=False, default="pending")  # pending, ok, error
+    error = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<QuoteUpdateRunTickerDAO {self.run_id}/{self.ticker}: {self.status}>"
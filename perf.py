@@ -83,13 +83,13 @@ for ticker in args.ticker:
         cnx = db.connect("database/etfs.db")
         cur = cnx.cursor()
         cur.execute(
-            'SELECT Date, Close FROM quotes WHERE Ticker="'
+            'SELECT date(2440587.5 + Date), Close FROM quotes WHERE Ticker="'
             + ticker
-            + '" and Date >= "'
+            + '" and Date >= julianday("'
             + args.startdate.strftime("%Y-%m-%d")
-            + '" and Date <= "'
+            + '") - 2440587.5 and Date <= julianday("'
             + args.enddate.strftime("%Y-%m-%d")
-            + '"'
+            + '") - 2440587.5'
         )
         all_quotes = cur.fetchall()
     except Exception as e:
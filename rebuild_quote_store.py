@@ -0,0 +1,68 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Rebuild the memory-mapped columnar quote store from the SQLite quotes table.
+
+Usage:
+    uv run python rebuild_quote_store.py               # all tickers
+    uv run python rebuild_quote_store.py -t SWDA.MI    # single ticker
+"""
+from __future__ import annotations
+import argparse
+import sqlite3
+from pathlib import Path
+import pandas as pd
+from core.config import DatabaseConfig
+from services.columnar_quote_store import ColumnarQuoteStore
+
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+DEFAULT_DATABASE_PATH = Path(DatabaseConfig().relative_path)
+DEFAULT_STORE_PATH = Path(DatabaseConfig().columnar_path)
+
+
+# -----------------------------------------------------------------------------
+# CLI arguments
+# -----------------------------------------------------------------------------
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the columnar quote store from the quotes table")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DATABASE_PATH, help="SQLite database path")
+    parser.add_argument("--out", type=Path, default=DEFAULT_STORE_PATH, help="Columnar store directory")
+    parser.add_argument("-t", "--ticker", type=str, help="Rebuild only the specified ticker (e.g. SWDA.MI)")
+    return parser.parse_args()
+
+
+# -----------------------------------------------------------------------------
+# Entry point
+# -----------------------------------------------------------------------------
+def main() -> None:
+    args = parse_args()
+
+    store = ColumnarQuoteStore(args.out)
+    with sqlite3.connect(args.db) as cnx:
+        if args.ticker:
+            tickers = [args.ticker.strip()]
+        else:
+            tickers = [row[0] for row in cnx.execute("SELECT DISTINCT Ticker FROM quotes ORDER BY Ticker")]
+
+        for ticker in tickers:
+            quotes_df = pd.read_sql_query(
+                "SELECT Date, Open, High, Low, Close, Adj_Close, Volume FROM quotes WHERE Ticker = ? ORDER BY Date",
+                cnx,
+                params=(ticker,),
+            )
+            rows = store.rebuild(ticker, quotes_df)
+            print(f"  {ticker}: {rows} rows")
+
+    print(f"Rebuilt {len(tickers)} tickers in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -64,6 +64,30 @@ def get_quotes(ticker) -> APIResponse:
     return app.quote_controller.get_quotes(ticker)
 
 
+# Route to get aligned quotes for several ETFs (JSON API)
+@etf_bp.route(rule="/quotes")
+def get_aligned_quotes() -> APIResponse:
+    return app.quote_controller.get_aligned_quotes()
+
+
+# Route to get quote cache statistics (JSON API)
+@etf_bp.route(rule="/etfs/quotes/cache")
+def get_quotes_cache_stats() -> APIResponse:
+    return app.quote_controller.get_cache_stats()
+
+
+# Route to get quote download rate limiter statistics (JSON API)
+@etf_bp.route(rule="/etfs/quotes/rate-limit")
+def get_quotes_rate_limit_stats() -> APIResponse:
+    return app.quote_controller.get_rate_limit_stats()
+
+
+# Route to get quote update single-flight statistics (coalesced concurrent updates, JSON API)
+@etf_bp.route(rule="/etfs/quotes/single-flight")
+def get_quotes_single_flight_stats() -> APIResponse:
+    return app.quote_controller.get_single_flight_stats()
+
+
 # Route to update quotes for a single ETF
 @etf_bp.route(rule="/etfs/<string:ticker>/quotes/update", methods=["POST"])
 def update_quotes_single(ticker) -> APIResponse:
@@ -74,3 +98,9 @@ def update_quotes_single(ticker) -> APIResponse:
 @etf_bp.route(rule="/etfs/quotes/update_all")
 def update_quotes_all() -> Response:
     return app.quote_controller.update_all()
+
+
+# Route to queue a quote update for all ETFs as a background job (202 + /jobs/<id>)
+@etf_bp.route(rule="/etfs/quotes/update_all", methods=["POST"])
+def update_quotes_all_async() -> APIResponse:
+    return app.quote_controller.update_all_async()
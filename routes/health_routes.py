@@ -0,0 +1,20 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from app_types import ApplicationContainer
+from controllers.types import APIResponse
+from typing import cast
+from flask import Blueprint, current_app
+
+# Create a Blueprint for health check routes
+health_bp: Blueprint = Blueprint(name="health", import_name=__name__)
+
+# Type hint per current_app
+app: ApplicationContainer = cast(ApplicationContainer, current_app)
+
+
+# Route to check database connectivity and SQLite pragmas
+@health_bp.route(rule="/health")
+def health() -> APIResponse:
+    return app.health_controller.health()
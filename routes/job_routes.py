@@ -0,0 +1,20 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+from app_types import ApplicationContainer
+from controllers.types import APIResponse
+from typing import cast
+from flask import Blueprint, current_app
+
+# Create a Blueprint for background job routes
+job_bp: Blueprint = Blueprint(name="job", import_name=__name__)
+
+# Type hint per current_app
+app: ApplicationContainer = cast(ApplicationContainer, current_app)
+
+
+# Route to get the status of a background quote update job (JSON API)
+@job_bp.route(rule="/jobs/<string:job_id>")
+def get_job(job_id) -> APIResponse:
+    return app.job_controller.get_job(job_id)
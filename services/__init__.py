@@ -4,7 +4,30 @@
 # -----------------------------------------------------------------------------
 from .etf_service import EtfService
 from .quote_service import QuoteService
+from .update_run_service import UpdateRunService
+from .quote_job_queue import QuoteJobQueue
 from .update_quotes_cronjob import UpdateQuotesCronJob
 from .index_service import IndexService
+from .quote_cache import QuoteCache
+from .columnar_quote_store import ColumnarQuoteStore
+from .quote_provider import QuoteProvider, YFinanceQuoteProvider, FileQuoteProvider, CsvReplayProvider
+from .ingestion_engine import QuoteIngestionEngine, QuoteSink, SqliteQuoteSink, CsvQuoteSink
 
-__all__ = ["EtfService", "QuoteService", "UpdateQuotesCronJob", "IndexService"]
+__all__ = [
+    "EtfService",
+    "QuoteService",
+    "UpdateRunService",
+    "QuoteJobQueue",
+    "UpdateQuotesCronJob",
+    "IndexService",
+    "QuoteCache",
+    "ColumnarQuoteStore",
+    "QuoteProvider",
+    "YFinanceQuoteProvider",
+    "FileQuoteProvider",
+    "CsvReplayProvider",
+    "QuoteIngestionEngine",
+    "QuoteSink",
+    "SqliteQuoteSink",
+    "CsvQuoteSink",
+]
@@ -0,0 +1,261 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Memory-mapped columnar quote store.
+
+One directory per ticker with one raw binary file per column:
+
+    <base_dir>/<ticker>/Date.i32        days since 1970-01-01 (sorted, unique)
+    <base_dir>/<ticker>/Open.f64        ... High, Low, Close, Adj_Close (NaN = missing)
+    <base_dir>/<ticker>/Volume.i64      (VOLUME_MISSING = missing)
+
+Range reads are a searchsorted on the date column plus zero-copy slices of
+the memory-mapped columns. The date file is written last and defines the
+number of valid rows, so a crash mid-append never exposes a partial row.
+Cached maps are reopened when the date file changes on disk (append or
+rebuild by another process, e.g. rebuild_quote_store.py).
+"""
+from __future__ import annotations
+import re
+import shutil
+import threading
+from pathlib import Path
+import numpy as np
+from pandas import DataFrame
+from pandas.api.types import is_integer_dtype
+from core.day_number import to_day_numbers
+from core.log import LoggerManager
+
+# Column name -> dtype (Date must stay first: it is the row index)
+COLUMNS: dict[str, np.dtype] = {
+    "Date": np.dtype(np.int32),
+    "Open": np.dtype(np.float64),
+    "High": np.dtype(np.float64),
+    "Low": np.dtype(np.float64),
+    "Close": np.dtype(np.float64),
+    "Adj_Close": np.dtype(np.float64),
+    "Volume": np.dtype(np.int64),
+}
+
+# Volume of rows without a volume (0 is a real, if rare, traded volume)
+VOLUME_MISSING: int = -1
+
+_FILE_SUFFIX: dict[str, str] = {"int32": "i32", "float64": "f64", "int64": "i64"}
+_TICKER_PATTERN = re.compile(r"^[A-Za-z0-9.\-_^=]+$")
+
+
+class ColumnarQuoteStore:
+    """Per-ticker memory-mapped NumPy column files (append-only)"""
+
+    def __init__(self, base_dir: str | Path) -> None:
+        """
+        Initialize ColumnarQuoteStore
+
+        Args:
+            base_dir: Root directory of the store (created if missing)
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._maps: dict[str, tuple[tuple[int, int, int], dict[str, np.ndarray]]] = {}
+        self._lock = threading.Lock()
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def read_range(
+        self, ticker: str, start_day: int | None = None, columns: tuple[str, ...] = ("Date", "Close")
+    ) -> dict[str, np.ndarray]:
+        """
+        Read the rows with Date > start_day as zero-copy column slices
+
+        Args:
+            ticker: ETF ticker symbol
+            start_day: Exclusive lower bound in days since epoch (None for the full history)
+            columns: Columns to return
+
+        Returns:
+            Dictionary column -> read-only array (empty arrays for unknown tickers)
+        """
+        maps = self._get_maps(ticker)
+        if maps is None:
+            return {column: np.empty(0, dtype=COLUMNS[column]) for column in columns}
+
+        dates: np.ndarray = maps["Date"]
+        first: int = 0 if start_day is None else int(np.searchsorted(dates, start_day, side="right"))
+        return {column: maps[column][first:] for column in columns}
+
+    def get_metadata(self, ticker: str) -> tuple[int | None, int]:
+        """
+        Return the last stored day and the row count for a ticker
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            Tuple of (last day since epoch or None, row count)
+        """
+        maps = self._get_maps(ticker)
+        if maps is None or len(maps["Date"]) == 0:
+            return None, 0
+        return int(maps["Date"][-1]), len(maps["Date"])
+
+    def append(self, ticker: str, quotes_df: DataFrame) -> int:
+        """
+        Append quotes newer than the last stored date
+
+        Args:
+            ticker: ETF ticker symbol
+            quotes_df: DataFrame with Date (day numbers) and price/volume columns
+
+        Returns:
+            Number of rows appended
+        """
+        if quotes_df.empty:
+            return 0
+
+        columns = self._to_columns(quotes_df)
+        with self._lock:
+            ticker_dir: Path = self._ticker_dir(ticker)
+            ticker_dir.mkdir(parents=True, exist_ok=True)
+            row_count: int = self._repair(ticker_dir)
+
+            # Append-only: keep rows strictly after the last stored date
+            if row_count:
+                date_path: Path = self._column_path(ticker_dir, "Date")
+                last_day = np.fromfile(date_path, dtype=np.int32, count=1, offset=(row_count - 1) * 4)[0]
+                keep = columns["Date"] > last_day
+                columns = {name: values[keep] for name, values in columns.items()}
+
+            appended: int = len(columns["Date"])
+            if appended:
+                # Date is written last: it commits the new rows
+                for name in [*list(COLUMNS)[1:], "Date"]:
+                    with open(self._column_path(ticker_dir, name), "ab") as column_file:
+                        column_file.write(columns[name].tobytes())
+
+            self._maps.pop(ticker, None)
+
+        self.logger.debug(f"Appended {appended} rows to columnar store for {ticker}")
+        return appended
+
+    def rebuild(self, ticker: str, quotes_df: DataFrame) -> int:
+        """
+        Replace all stored quotes for a ticker
+
+        Args:
+            ticker: ETF ticker symbol
+            quotes_df: DataFrame with Date (day numbers) and price/volume columns
+
+        Returns:
+            Number of rows written
+        """
+        columns = self._to_columns(quotes_df)
+        with self._lock:
+            ticker_dir: Path = self._ticker_dir(ticker)
+
+            # Write a complete new directory, then swap it in
+            staging_dir: Path = ticker_dir.with_name(f"{ticker_dir.name}.tmp")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            staging_dir.mkdir(parents=True)
+            for name in COLUMNS:
+                columns[name].tofile(self._column_path(staging_dir, name))
+
+            old_dir: Path = ticker_dir.with_name(f"{ticker_dir.name}.old")
+            if ticker_dir.exists():
+                ticker_dir.replace(old_dir)
+            staging_dir.replace(ticker_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+            self._maps.pop(ticker, None)
+
+        return len(columns["Date"])
+
+    def drop(self, ticker: str) -> None:
+        """
+        Delete all stored quotes for a ticker (a later rebuild starts from scratch)
+
+        Args:
+            ticker: ETF ticker symbol
+        """
+        with self._lock:
+            shutil.rmtree(self._ticker_dir(ticker), ignore_errors=True)
+            self._maps.pop(ticker, None)
+
+    def _get_maps(self, ticker: str) -> dict[str, np.ndarray] | None:
+        """
+        Return (cached) read-only memory maps for a ticker, or None if it is not stored
+
+        The cache is keyed on the inode, size and mtime of the date file, which every
+        append (size, mtime) and rebuild (new file) changes.
+        """
+        with self._lock:
+            ticker_dir: Path = self._ticker_dir(ticker)
+            date_path: Path = self._column_path(ticker_dir, "Date")
+            try:
+                stat = date_path.stat()
+            except FileNotFoundError:
+                self._maps.pop(ticker, None)
+                return None
+
+            version: tuple[int, int, int] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            cached = self._maps.get(ticker)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            row_count: int = stat.st_size // COLUMNS["Date"].itemsize
+            maps: dict[str, np.ndarray] = {}
+            for name, dtype in COLUMNS.items():
+                if row_count == 0:
+                    maps[name] = np.empty(0, dtype=dtype)
+                else:
+                    path: Path = self._column_path(ticker_dir, name)
+                    maps[name] = np.memmap(path, dtype=dtype, mode="r", shape=(row_count,))
+            self._maps[ticker] = (version, maps)
+            return maps
+
+    def _repair(self, ticker_dir: Path) -> int:
+        """
+        Truncate value columns to the committed row count (after an interrupted append)
+
+        Returns:
+            Committed row count
+        """
+        date_path: Path = self._column_path(ticker_dir, "Date")
+        row_count: int = date_path.stat().st_size // COLUMNS["Date"].itemsize if date_path.exists() else 0
+
+        for name, dtype in COLUMNS.items():
+            path: Path = self._column_path(ticker_dir, name)
+            expected: int = row_count * dtype.itemsize
+            if path.exists() and path.stat().st_size != expected:
+                with open(path, "r+b") as column_file:
+                    column_file.truncate(expected)
+            elif not path.exists():
+                path.touch()
+        return row_count
+
+    def _to_columns(self, quotes_df: DataFrame) -> dict[str, np.ndarray]:
+        """Convert a quotes DataFrame into sorted, de-duplicated typed column arrays"""
+        if is_integer_dtype(quotes_df["Date"]):
+            days: np.ndarray = quotes_df["Date"].to_numpy(dtype=np.int32)
+        else:
+            days = to_day_numbers(quotes_df["Date"].astype(str).str[:10].to_numpy())
+        order: np.ndarray = np.argsort(days, kind="stable")
+        days = days[order]
+        unique: np.ndarray = np.concatenate(([True], days[1:] != days[:-1])) if len(days) else np.empty(0, bool)
+
+        columns: dict[str, np.ndarray] = {"Date": days[unique]}
+        for name, dtype in list(COLUMNS.items())[1:]:
+            values = quotes_df[name].to_numpy(dtype=np.float64, na_value=np.nan)[order][unique]
+            if dtype.kind == "i":
+                values = np.nan_to_num(values, nan=VOLUME_MISSING, posinf=VOLUME_MISSING, neginf=VOLUME_MISSING)
+            columns[name] = values.astype(dtype)
+        return columns
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        """Return the directory of a ticker (rejecting path-like tickers)"""
+        if not _TICKER_PATTERN.match(ticker):
+            raise ValueError(f"Invalid ticker for columnar store: {ticker!r}")
+        return self.base_dir / ticker
+
+    def _column_path(self, ticker_dir: Path, column: str) -> Path:
+        """Return the file path of a column"""
+        return ticker_dir / f"{column}.{_FILE_SUFFIX[COLUMNS[column].name]}"
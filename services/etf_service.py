@@ -4,6 +4,7 @@
 # -----------------------------------------------------------------------------
 from __future__ import annotations
 from datetime import datetime
+from sqlalchemy import select
 from models import EtfDAO
 from typing import TYPE_CHECKING, Any
 from core.database import DatabaseManager
@@ -14,21 +15,29 @@ from mappers.etf_mapper import EtfMapper
 
 if TYPE_CHECKING:
     from services.quote_service import QuoteService
+    from services.update_run_service import UpdateRunService
 
 
 class EtfService:
     """Application Service for ETF management and orchestration"""
 
-    def __init__(self, db_manager: DatabaseManager, quote_service: "QuoteService") -> None:
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        quote_service: "QuoteService",
+        run_service: "UpdateRunService | None" = None,
+    ) -> None:
         """
         Initialize EtfService with dependencies
 
         Args:
             db_manager: DatabaseManager instance for session handling
             quote_service: QuoteService instance for quote operations
+            run_service: Optional UpdateRunService checkpointing bulk updates (needed to resume them)
         """
         self.db_manager = db_manager
         self.quote_service = quote_service
+        self.run_service = run_service
         self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
         self.logger.info("EtfService initialized")
 
@@ -40,9 +49,10 @@ class EtfService:
             List of ETF DTOs
         """
         self.logger.debug("Fetching all ETFs from database")
-        etf_daos: list[EtfDAO] = EtfDAO.query.all()
-        self.logger.info(f"Retrieved {len(etf_daos)} ETFs from database")
-        return [EtfMapper.to_dto(dao) for dao in etf_daos]
+        with self.db_manager.read_session() as session:
+            etf_daos: list[EtfDAO] = list(session.scalars(select(EtfDAO)))
+            self.logger.info(f"Retrieved {len(etf_daos)} ETFs from database")
+            return [EtfMapper.to_dto(dao) for dao in etf_daos]
 
     def get_by_ticker(self, ticker: str) -> ETF | None:
         """
@@ -55,13 +65,13 @@ class EtfService:
             ETF DTO if found, None otherwise
         """
         self.logger.debug(f"Fetching ETF with ticker: {ticker}")
-        etf_dao: EtfDAO | None = EtfDAO.query.get(ident=ticker)
-        if etf_dao:
-            self.logger.debug(f"ETF {ticker} found in database")
-            return EtfMapper.to_dto(dao=etf_dao)
-        else:
-            self.logger.debug(f"ETF {ticker} not found in database")
-            return None
+        with self.db_manager.read_session() as session:
+            etf_dao: EtfDAO | None = session.get(EtfDAO, ticker)
+            if etf_dao:
+                self.logger.debug(f"ETF {ticker} found in database")
+                return EtfMapper.to_dto(dao=etf_dao)
+        self.logger.debug(f"ETF {ticker} not found in database")
+        return None
 
     def create(self, etf_dto: ETF) -> None:
         """
@@ -74,7 +84,7 @@ class EtfService:
             SQLAlchemyError: On database errors
         """
         self.logger.info(f"Creating new ETF: {etf_dto.ticker}")
-        with self.db_manager.get_session() as session:
+        with self.db_manager.write_session() as session:
             etf_dao: EtfDAO = EtfMapper.to_dao(etf_dto)
             session.add(instance=etf_dao)
             self.logger.info(f"ETF {etf_dto.ticker} created successfully in database")
@@ -91,8 +101,8 @@ class EtfService:
             SQLAlchemyError: On database errors
         """
         self.logger.info(f"Updating ETF: {etf_dto.ticker}")
-        with self.db_manager.get_session():
-            etf_dao: EtfDAO | None = EtfDAO.query.get(ident=etf_dto.ticker)
+        with self.db_manager.write_session() as session:
+            etf_dao: EtfDAO | None = session.get(EtfDAO, etf_dto.ticker)
             if not etf_dao:
                 self.logger.error(f"ETF {etf_dto.ticker} not found for update")
                 raise ValueError(f"ETF {etf_dto.ticker} not found")
@@ -113,8 +123,8 @@ class EtfService:
             SQLAlchemyError: On database errors
         """
         self.logger.info(f"Deleting ETF: {ticker}")
-        with self.db_manager.get_session() as session:
-            etf_dao: EtfDAO | None = EtfDAO.query.get(ticker)
+        with self.db_manager.write_session() as session:
+            etf_dao: EtfDAO | None = session.get(EtfDAO, ticker)
             if not etf_dao:
                 self.logger.error(f"ETF {ticker} not found for deletion")
                 raise ValueError(f"ETF {ticker} not found")
@@ -132,23 +142,27 @@ class EtfService:
         Returns:
             True if exists, False otherwise
         """
-        exists: bool = EtfDAO.query.get(ident=ticker) is not None
+        with self.db_manager.read_session() as session:
+            exists: bool = session.get(EtfDAO, ticker) is not None
         self.logger.debug(f"ETF {ticker} exists: {exists}")
         return exists
 
-    def update_etf_quotes(self, ticker: str) -> dict[str, Any]:
+    def update_etf_quotes(self, ticker: str, run_id: int | None = None) -> dict[str, Any]:
         """
         Update quotes for a specific ETF (Application Service - Orchestration)
 
         Args:
             ticker: ETF ticker symbol
+            run_id: Bulk update run to checkpoint the result into (see start_update_run)
 
         Returns:
             Dictionary with status information:
             {
                 'success': bool,
                 'ticker': str,
-                'message': str
+                'message': str,
+                'inserted': int,   # only on success
+                'skipped': int     # only on success
             }
         """
         self.logger.info(f"Orchestrating quote update for ETF: {ticker}")
@@ -161,22 +175,77 @@ class EtfService:
                 return {"success": False, "ticker": ticker, "message": f"ETF {ticker} non trovato"}
 
             # Delegate to QuoteService (Domain Service)
-            self.quote_service.update_quotes(ticker)
+            counts: dict[str, int] = self.quote_service.update_quotes(ticker)
 
-            message = "Quotazioni aggiornate con successo"
+            message = f"Quotazioni aggiornate con successo ({counts['inserted']} nuove)"
             self.logger.info(f"Successfully updated quotes for {ticker}")
-
-            return {"success": True, "ticker": ticker, "message": message}
+            self._checkpoint(run_id, {ticker: None})
+
+            return {
+                "success": True,
+                "ticker": ticker,
+                "message": message,
+                "inserted": counts["inserted"],
+                "skipped": counts["skipped"],
+            }
 
         except Exception as e:
             error_message: str = f"Errore durante l'aggiornamento: {str(e)}"
             self.logger.error(f"Failed to update quotes for {ticker}: {error_message}")
+            self._checkpoint(run_id, {ticker: error_message})
             return {"success": False, "ticker": ticker, "message": error_message}
 
-    def update_all_etf_quotes(self) -> dict:
+    def start_update_run(self, source: str, resume: bool = False) -> tuple[int | None, list[ETF], bool]:
+        """
+        Start (or resume) a checkpointed bulk update run over all ETFs
+
+        Args:
+            source: Caller recorded with the run (cron, api, sse)
+            resume: Continue the latest unfinished run, processing only its pending or failed ETFs
+
+        Returns:
+            Tuple of (run id, ETFs to update, whether an unfinished run was resumed);
+            the run id is None without a run service
+        """
+        etfs: list[ETF] = self.get_all()
+        if self.run_service is None:
+            if resume:
+                self.logger.warning("Resume requested but update runs are not tracked: updating all ETFs")
+            return None, etfs, False
+
+        run_id, tickers, resumed = self.run_service.start(
+            [etf.ticker for etf in etfs], self.quote_service.end_date, source=source, resume=resume
+        )
+        pending: set[str] = set(tickers)
+        return run_id, [etf for etf in etfs if etf.ticker in pending], resumed
+
+    def finish_update_run(self, run_id: int | None) -> None:
+        """
+        Mark a bulk update run as finished
+
+        Args:
+            run_id: Run id returned by start_update_run (None: not tracked)
+        """
+        if run_id is not None and self.run_service is not None:
+            self.run_service.finish(run_id)
+
+    def _checkpoint(self, run_id: int | None, results: dict[str, str | None]) -> None:
+        """Record processed tickers in the bulk update run (no-op when not tracked)"""
+        if run_id is not None and self.run_service is not None:
+            self.run_service.checkpoint(run_id, results)
+
+    def update_all_etf_quotes(self, resume: bool = False, source: str = "api") -> dict:
         """
         Update quotes for all ETFs (Application Service - Orchestration)
 
+        The run is checkpointed per ticker; with resume, an interrupted or partially
+        failed run for the same download end date only processes its pending or
+        failed ETFs.
+
+        Args:
+            resume: Continue the latest unfinished run instead of starting over
+            source: Caller recorded with the run (cron, api)
+
         Returns:
             Dictionary with overall status and individual results:
             {
@@ -185,54 +254,60 @@ class EtfService:
                 'success_count': int,
                 'failed_count': int,
                 'failed_etfs': list,
-                'results': list,
-                'message': str
+                'results': list,   # per ETF, with inserted/skipped counts and download_ms/insert_ms
+                'message': str,
+                'run_id': int | None,
+                'resumed': bool    # only pending/failed ETFs of an unfinished run were processed
             }
         """
         self.logger.info("Orchestrating bulk quote update for all ETFs")
 
-        # Get all ETFs
-        etfs: list[ETF] = self.get_all()
+        # Get the ETFs of the run (all of them, or what is left of a resumed run)
+        run_id, etfs, resumed = self.start_update_run(source, resume=resume)
         total: int = len(etfs)
 
         if total == 0:
+            self.finish_update_run(run_id)
+            if resumed:
+                return self.create_resumed_summary(run_id)
             self.logger.warning("No ETFs found in database")
             return self._create_empty_summary()
 
         self.logger.info(f"Found {total} ETFs to update")
 
-        # Process all ETFs and collect results
+        # Batched multi-ticker downloads, one insert per ticker, checkpointed as tickers are stored
+        counts, errors, timings = self.quote_service.update_quotes_bulk(
+            [etf.ticker for etf in etfs],
+            on_progress=lambda done, failed: self._checkpoint(run_id, {**dict.fromkeys(done), **failed}),
+        )
+        self.finish_update_run(run_id)
+
+        # Collect results in ETF order
         results = []
         failed_etfs = []
 
-        for index, etf in enumerate(etfs, 1):
-            self.logger.info(f"Processing ETF {index}/{total}: {etf.ticker}")
-            result = self._update_single_etf_quotes(etf)
+        for etf in etfs:
+            if etf.ticker in errors:
+                result: dict[str, Any] = {"success": False, "ticker": etf.ticker, "message": errors[etf.ticker]}
+                failed_etfs.append({"ticker": etf.ticker, "name": etf.name, "error": errors[etf.ticker]})
+            else:
+                ticker_counts: dict[str, int] = counts[etf.ticker]
+                result = {
+                    "success": True,
+                    "ticker": etf.ticker,
+                    "message": "Aggiornato",
+                    "inserted": ticker_counts["inserted"],
+                    "skipped": ticker_counts["skipped"],
+                }
+            # Up-to-date tickers are not downloaded and have no timings
+            result.update(timings.get(etf.ticker, {"download_ms": 0.0, "insert_ms": 0.0}))
             results.append(result)
 
-            if not result["success"]:
-                failed_etfs.append({"ticker": etf.ticker, "name": etf.name, "error": result["message"]})
-
         # Prepare and return summary
-        return self._create_update_summary(total, results, failed_etfs)
-
-    def _update_single_etf_quotes(self, etf: ETF) -> dict[str, Any]:
-        """
-        Update quotes for a single ETF
-
-        Args:
-            etf: ETF to update
-
-        Returns:
-            Dictionary with update result
-        """
-        try:
-            self.quote_service.update_quotes(ticker=etf.ticker)
-            return {"success": True, "ticker": etf.ticker, "message": "Aggiornato"}
-        except Exception as e:
-            error_message = str(e)
-            self.logger.error(f"Failed to update {etf.ticker}: {error_message}")
-            return {"success": False, "ticker": etf.ticker, "message": error_message}
+        summary: dict[str, Any] = self._create_update_summary(total, results, failed_etfs)
+        summary["run_id"] = run_id
+        summary["resumed"] = resumed
+        return summary
 
     def _create_empty_summary(self) -> dict[str, Any]:
         """Create summary for empty ETF list"""
@@ -246,6 +321,35 @@ class EtfService:
             "results": [],
         }
 
+    def create_resumed_summary(self, run_id: int) -> dict[str, Any]:
+        """
+        Create summary for a resumed run with no pending or failed ETFs left
+
+        Args:
+            run_id: Resumed run id
+
+        Returns:
+            Summary dictionary with the counts recorded by the run
+        """
+        counts: dict[str, int] = self.run_service.get_counts(run_id)
+        errors: dict[str, str] = self.run_service.get_errors(run_id)
+        names: dict[str, str] = {etf.ticker: etf.name for etf in self.get_all()}
+        total: int = sum(counts.values())
+        self.logger.info(f"Nothing left to resume in update run {run_id}: {counts['ok']}/{total} updated")
+        return {
+            "success": counts["error"] == 0,
+            "message": f"Nessun ETF da riprendere: {counts['ok']} successi, {counts['error']} errori",
+            "total": total,
+            "success_count": counts["ok"],
+            "failed_count": counts["error"],
+            "failed_etfs": [
+                {"ticker": ticker, "name": names.get(ticker), "error": error} for ticker, error in errors.items()
+            ],
+            "results": [],
+            "run_id": run_id,
+            "resumed": True,
+        }
+
     def _create_update_summary(self, total: int, results: list[dict], failed_etfs: list[dict]) -> dict[str, Any]:
         """
         Create summary for bulk update operation
@@ -292,8 +396,7 @@ class EtfService:
         self.logger.debug(f"Screening ETFs with filters: {filters}")
 
         # Get all ETFs and convert to DTOs using mapper
-        etf_daos: list[EtfDAO] = EtfDAO.query.all()
-        all_etfs: list[ETF] = [EtfMapper.to_dto(dao) for dao in etf_daos]
+        all_etfs: list[ETF] = self.get_all()
 
         # Apply filters using list comprehension
         filtered_etfs: list[ETF] = [etf for etf in all_etfs if self._matches_filters(etf, filters)]
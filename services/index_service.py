@@ -2,6 +2,7 @@
 # Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
+from sqlalchemy import select
 from models.index import IndexDAO
 from core.database import DatabaseManager
 from core.log import LoggerManager
@@ -31,9 +32,10 @@ class IndexService:
             List of Index DTOs
         """
         self.logger.debug("Fetching all indices from database")
-        index_daos: list[IndexDAO] = IndexDAO.query.all()
-        self.logger.info(f"Retrieved {len(index_daos)} indices from database")
-        return [IndexMapper.to_dto(dao) for dao in index_daos]
+        with self.db_manager.read_session() as session:
+            index_daos: list[IndexDAO] = list(session.scalars(select(IndexDAO)))
+            self.logger.info(f"Retrieved {len(index_daos)} indices from database")
+            return [IndexMapper.to_dto(dao) for dao in index_daos]
 
     def get_by_ticker(self, ticker: str) -> Index | None:
         """
@@ -46,13 +48,13 @@ class IndexService:
             Index DTO if found, None otherwise
         """
         self.logger.debug(f"Fetching index with ticker: {ticker}")
-        index_dao: IndexDAO | None = IndexDAO.query.get(ident=ticker)
-        if index_dao:
-            self.logger.debug(f"Index {ticker} found in database")
-            return IndexMapper.to_dto(dao=index_dao)
-        else:
-            self.logger.debug(f"Index {ticker} not found in database")
-            return None
+        with self.db_manager.read_session() as session:
+            index_dao: IndexDAO | None = session.get(IndexDAO, ticker)
+            if index_dao:
+                self.logger.debug(f"Index {ticker} found in database")
+                return IndexMapper.to_dto(dao=index_dao)
+        self.logger.debug(f"Index {ticker} not found in database")
+        return None
 
     def create(self, index_dto: Index) -> None:
         """
@@ -65,7 +67,7 @@ class IndexService:
             SQLAlchemyError: On database errors
         """
         self.logger.info(f"Creating new index: {index_dto.ticker}")
-        with self.db_manager.get_session() as session:
+        with self.db_manager.write_session() as session:
             index_dao: IndexDAO = IndexMapper.to_dao(index_dto)
             session.add(instance=index_dao)
             self.logger.info(f"Index {index_dto.ticker} created successfully in database")
@@ -82,8 +84,8 @@ class IndexService:
             SQLAlchemyError: On database errors
         """
         self.logger.info(f"Updating index: {index_dto.ticker}")
-        with self.db_manager.get_session():
-            index_dao: IndexDAO | None = IndexDAO.query.get(ident=index_dto.ticker)
+        with self.db_manager.write_session() as session:
+            index_dao: IndexDAO | None = session.get(IndexDAO, index_dto.ticker)
             if not index_dao:
                 self.logger.error(f"Index {index_dto.ticker} not found for update")
                 raise ValueError(f"Index {index_dto.ticker} not found")
@@ -104,8 +106,8 @@ class IndexService:
             SQLAlchemyError: On database errors
         """
         self.logger.info(f"Deleting index: {ticker}")
-        with self.db_manager.get_session() as session:
-            index_dao: IndexDAO | None = IndexDAO.query.get(ticker)
+        with self.db_manager.write_session() as session:
+            index_dao: IndexDAO | None = session.get(IndexDAO, ticker)
             if not index_dao:
                 self.logger.error(f"Index {ticker} not found for deletion")
                 raise ValueError(f"Index {ticker} not found")
@@ -123,7 +125,8 @@ class IndexService:
         Returns:
             True if exists, False otherwise
         """
-        exists: bool = IndexDAO.query.get(ident=ticker) is not None
+        with self.db_manager.read_session() as session:
+            exists: bool = session.get(IndexDAO, ticker) is not None
         self.logger.debug(f"Index {ticker} exists: {exists}")
         return exists
 
@@ -0,0 +1,452 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Quote ingestion engine.
+
+Stale tickers are planned from the sink, grouped by download start date and
+fetched concurrently from a QuoteProvider (on an event loop or a thread
+pool, bounded by max_concurrency); each downloaded batch is handed to a
+QuoteSink as soon as it arrives. Sinks are only called from the thread
+running the engine, so writes are always serialized.
+
+Sinks:
+    SqliteQuoteSink   quotes table (through QuoteService)
+    CsvQuoteSink      database/quotes/<ticker>.csv files
+"""
+from __future__ import annotations
+import asyncio
+import csv
+import datetime as dt
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Literal, Protocol
+import pandas as pd
+from pandas import DataFrame
+from core.exchange_calendar import next_download_start
+from core.log import LoggerManager
+from services.quote_provider import QUOTE_FRAME_COLUMNS, QuoteProvider
+
+if TYPE_CHECKING:
+    from services.quote_service import QuoteService
+
+# Progress callback of bulk ingestion: (ticker -> counts, ticker -> error message) of the tickers just processed
+ProgressCallback = Callable[[dict[str, dict[str, int]], dict[str, str]], None]
+
+
+class QuoteSink(Protocol):
+    """Destination of ingested quotes"""
+
+    # Downloads stop the day before this date (exclusive end)
+    end_date: datetime
+
+    def get_start_dates(self, tickers: list[str]) -> dict[str, datetime | None]:
+        """Return the download start date of every ticker (None when already up to date)"""
+        ...
+
+    def store(self, ticker: str, raw_df: DataFrame | None) -> dict[str, int] | None:
+        """Store a downloaded frame and return the inserted/updated/skipped counts (None if staged for flush)"""
+        ...
+
+    def fail(self, tickers: list[str], error: str) -> None:
+        """Record tickers whose download or store failed"""
+        ...
+
+    def flush(self) -> tuple[dict[str, dict[str, int]], dict[str, str]]:
+        """Write staged frames and return their counts and errors (empty when nothing is staged)"""
+        ...
+
+
+class SqliteQuoteSink:
+    """QuoteSink writing to the quotes table through QuoteService (upsert, cache and store upkeep)"""
+
+    def __init__(self, quote_service: QuoteService, staged: bool = False) -> None:
+        """
+        Initialize SqliteQuoteSink
+
+        Args:
+            quote_service: QuoteService owning the quotes table
+            staged: Collect frames and write them all in one transaction on flush()
+        """
+        self.quote_service = quote_service
+        self.staged = staged
+        self.end_date: datetime = quote_service.end_date
+        self._staged_frames: dict[str, DataFrame | None] = {}
+        self._failures: dict[str, str] = {}
+
+    def get_start_dates(self, tickers: list[str]) -> dict[str, datetime | None]:
+        """
+        Return the download start date of every ticker
+
+        Args:
+            tickers: ETF ticker symbols
+
+        Returns:
+            Dictionary ticker -> start date (None when already up to date)
+        """
+        return self.quote_service.get_download_start_dates(tickers)
+
+    def store(self, ticker: str, raw_df: DataFrame | None) -> dict[str, int] | None:
+        """
+        Upsert a downloaded frame (or stage it for flush() in staged mode)
+
+        Args:
+            ticker: ETF ticker symbol
+            raw_df: Downloaded quotes (None when the provider returned nothing)
+
+        Returns:
+            Dictionary with the number of rows inserted, updated and skipped (None when staged)
+        """
+        if self.staged:
+            self._staged_frames[ticker] = raw_df
+            return None
+        return self.quote_service.store_downloaded_quotes(ticker, raw_df)
+
+    def fail(self, tickers: list[str], error: str) -> None:
+        """
+        Record failed tickers in the quote sync state (with the staged write in staged mode)
+
+        Args:
+            tickers: ETF ticker symbols
+            error: Error message
+        """
+        if self.staged:
+            self._failures.update(dict.fromkeys(tickers, error))
+            return
+        self.quote_service.record_sync_failure(tickers, error)
+
+    def flush(self) -> tuple[dict[str, dict[str, int]], dict[str, str]]:
+        """
+        Write the staged frames in a single transaction
+
+        Returns:
+            Tuple of (ticker -> inserted/updated/skipped counts, ticker -> error message)
+        """
+        if not (self._staged_frames or self._failures):
+            return {}, {}
+        frames, failures = self._staged_frames, self._failures
+        self._staged_frames, self._failures = {}, {}
+        return self.quote_service.store_staged_quotes(frames, failures=failures)
+
+
+def normalize_quotes_dataframe(df: DataFrame | pd.Series | None) -> DataFrame:
+    """
+    Normalize a yfinance DataFrame to the following flat structure:
+
+    Date,Open,High,Low,Close,Adj Close,Volume
+    """
+    if df is None or (hasattr(df, "empty") and df.empty):
+        return pd.DataFrame()
+
+    # Convert Series to DataFrame if needed
+    if isinstance(df, pd.Series):
+        result_df: DataFrame = df.to_frame().T
+    else:
+        result_df = df
+
+    if isinstance(result_df.columns, pd.MultiIndex):
+        result_df.columns = result_df.columns.get_level_values(0)
+
+    result_df = result_df.reset_index()
+
+    result_df = result_df[["Date", *QUOTE_FRAME_COLUMNS]]
+
+    price_columns = ["Open", "High", "Low", "Close", "Adj Close"]
+    result_df[price_columns] = result_df[price_columns].round(2)
+
+    return result_df
+
+
+class CsvQuoteSink:
+    """QuoteSink appending to one Date,Open,High,Low,Close,Adj Close,Volume CSV file per ticker"""
+
+    def __init__(self, quotes_dir: str | Path, start_date: datetime | None = None, end_date: datetime | None = None):
+        """
+        Initialize CsvQuoteSink
+
+        Args:
+            quotes_dir: Directory of the CSV files (created if missing)
+            start_date: Start of a full-history download (default 1970-01-01)
+            end_date: Exclusive download end (default yesterday)
+        """
+        self.quotes_dir = Path(quotes_dir)
+        self.quotes_dir.mkdir(parents=True, exist_ok=True)
+        self.start_date: datetime = start_date or dt.datetime(1970, 1, 1)
+        self.end_date: datetime = end_date or dt.datetime.now() - dt.timedelta(days=1)
+        self._last_dates: dict[str, datetime] = {}
+
+    def get_start_dates(self, tickers: list[str]) -> dict[str, datetime | None]:
+        """
+        Return the download start date of every ticker from the last line of its CSV file
+
+        Tickers without a trading session since their last line are up to date.
+
+        Args:
+            tickers: ETF ticker symbols
+
+        Returns:
+            Dictionary ticker -> start date (None when already up to date)
+        """
+        start_dates: dict[str, datetime | None] = {}
+        for ticker in tickers:
+            last_date: datetime | None = self._read_last_date(ticker)
+            if last_date is None:
+                start_dates[ticker] = self.start_date
+                continue
+
+            self._last_dates[ticker] = last_date
+            start_dates[ticker] = next_download_start(ticker, last_date, self.end_date)
+        return start_dates
+
+    def store(self, ticker: str, raw_df: DataFrame | None) -> dict[str, int]:
+        """
+        Append a downloaded frame to the ticker's CSV file (creating it with a header if missing)
+
+        Args:
+            ticker: ETF ticker symbol
+            raw_df: Downloaded quotes (None when the provider returned nothing)
+
+        Returns:
+            Dictionary with the number of rows inserted (appended) and skipped
+
+        Raises:
+            ValueError: If nothing was downloaded for a ticker without a CSV file
+        """
+        csv_file_path: Path = self.quotes_dir / f"{ticker}.csv"
+        df: DataFrame = normalize_quotes_dataframe(raw_df)
+        if df.empty:
+            if csv_file_path.exists():
+                return {"inserted": 0, "updated": 0, "skipped": 0}
+            raise ValueError(f"No historical data available for ticker {ticker}")
+
+        # Never append dates the file already has
+        total: int = len(df)
+        last_date: datetime | None = self._last_dates.get(ticker)
+        if last_date is not None:
+            df = df[pd.to_datetime(df["Date"]) > last_date]
+
+        if csv_file_path.exists():
+            df.to_csv(csv_file_path, mode="a", index=False, header=False, date_format="%Y-%m-%d")
+        else:
+            df.to_csv(csv_file_path, index=False, header=True, date_format="%Y-%m-%d")
+
+        return {"inserted": len(df), "updated": 0, "skipped": total - len(df)}
+
+    def fail(self, tickers: list[str], error: str) -> None:
+        """CSV files keep no sync state: failures are only reported by the engine"""
+
+    def flush(self) -> tuple[dict[str, dict[str, int]], dict[str, str]]:
+        """CSV rows are appended by store(): nothing is staged"""
+        return {}, {}
+
+    def _read_last_date(self, ticker: str) -> datetime | None:
+        """Return the date of the last row of a ticker's CSV file (None if missing or empty)"""
+        csv_file_path: Path = self.quotes_dir / f"{ticker}.csv"
+        if not csv_file_path.exists():
+            return None
+
+        with open(csv_file_path, "r") as csv_file:
+            rows: list[list[str]] = [row for row in csv.reader(csv_file) if row]
+        if len(rows) < 2:
+            return None
+        return dt.datetime.strptime(rows[-1][0][:10], "%Y-%m-%d")
+
+
+class QuoteIngestionEngine:
+    """Fetch quotes for many tickers concurrently and store them through a sink from one writer thread"""
+
+    def __init__(
+        self,
+        provider: QuoteProvider,
+        sink: QuoteSink,
+        batch_size: int = 1,
+        concurrency: Literal["asyncio", "threads"] = "asyncio",
+        max_concurrency: int | None = None,
+    ) -> None:
+        """
+        Initialize QuoteIngestionEngine
+
+        Args:
+            provider: Quote provider
+            sink: Destination of the downloaded quotes
+            batch_size: Maximum tickers per provider call (tickers sharing a start date are batched)
+            concurrency: Download concurrency primitive: one event loop (provider calls on worker
+                threads) or a thread pool; planning, storing and reporting are the same
+            max_concurrency: Maximum concurrent downloads (default: the provider's max_concurrency)
+        """
+        self.provider = provider
+        self.sink = sink
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_concurrency: int = max(1, max_concurrency or provider.max_concurrency)
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def run(
+        self, tickers: list[str], on_progress: ProgressCallback | None = None
+    ) -> tuple[dict[str, dict[str, int]], dict[str, str], dict[str, dict[str, float]]]:
+        """
+        Ingest quotes for the given tickers (blocking; runs its own event loop or thread pool)
+
+        Args:
+            tickers: Ticker symbols
+            on_progress: Optional callback receiving the counts and errors of tickers
+                once they are stored (staged tickers after the flush)
+
+        Returns:
+            Tuple of (ticker -> inserted/updated/skipped counts, ticker -> error message,
+            ticker -> {"download_ms", "insert_ms"})
+        """
+        if self.concurrency == "threads":
+            return self._run_threads(tickers, on_progress)
+        return asyncio.run(self.run_async(tickers, on_progress))
+
+    async def run_async(
+        self, tickers: list[str], on_progress: ProgressCallback | None = None
+    ) -> tuple[dict[str, dict[str, int]], dict[str, str], dict[str, dict[str, float]]]:
+        """
+        Ingest quotes for the given tickers on the running event loop
+
+        Args:
+            tickers: Ticker symbols
+            on_progress: Same as run()
+
+        Returns:
+            Same as run()
+        """
+        ingestion = _Ingestion(self.sink, tickers, on_progress)
+        batches: list[tuple[datetime, list[str]]] = self._plan(ingestion)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(start_date: datetime, batch: list[str]):
+            async with semaphore:
+                download_start: float = time.perf_counter()
+                try:
+                    frames = await asyncio.to_thread(self.provider.download, batch, start_date, self.sink.end_date)
+                except Exception as e:
+                    return batch, None, e, (time.perf_counter() - download_start) * 1000
+                return batch, frames, None, (time.perf_counter() - download_start) * 1000
+
+        # Store each batch as soon as its download completes (sink calls stay on this thread)
+        for next_done in asyncio.as_completed([fetch(start_date, batch) for start_date, batch in batches]):
+            ingestion.store_batch(*(await next_done))
+
+        return ingestion.flush()
+
+    def _run_threads(
+        self, tickers: list[str], on_progress: ProgressCallback | None = None
+    ) -> tuple[dict[str, dict[str, int]], dict[str, str], dict[str, dict[str, float]]]:
+        """Ingest quotes with downloads on a thread pool; the calling thread stays the only writer"""
+        ingestion = _Ingestion(self.sink, tickers, on_progress)
+        batches: list[tuple[datetime, list[str]]] = self._plan(ingestion)
+
+        def fetch(start_date: datetime, batch: list[str]):
+            download_start: float = time.perf_counter()
+            try:
+                frames = self.provider.download(batch, start_date, self.sink.end_date)
+            except Exception as e:
+                return batch, None, e, (time.perf_counter() - download_start) * 1000
+            return batch, frames, None, (time.perf_counter() - download_start) * 1000
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="quote-download") as executor:
+            futures: list[Future] = [executor.submit(fetch, start_date, batch) for start_date, batch in batches]
+            for future in as_completed(futures):
+                ingestion.store_batch(*future.result())
+
+        return ingestion.flush()
+
+    def _plan(self, ingestion: _Ingestion) -> list[tuple[datetime, list[str]]]:
+        """Group stale tickers by start date and split the groups into provider batches"""
+        groups: dict[datetime, list[str]] = ingestion.plan()
+        batches: list[tuple[datetime, list[str]]] = [
+            (start_date, group[offset : offset + self.batch_size])
+            for start_date, group in groups.items()
+            for offset in range(0, len(group), self.batch_size)
+        ]
+        self.logger.info(
+            f"Ingesting {sum(len(batch) for _, batch in batches)} stale tickers in {len(groups)} start-date groups, "
+            f"{len(batches)} downloads (max {self.max_concurrency} concurrent, {self.concurrency})"
+        )
+        return batches
+
+
+class _Ingestion:
+    """Results of one ingestion run: planning, per-batch stores, flush and progress reports (writer thread only)"""
+
+    def __init__(self, sink: QuoteSink, tickers: list[str], on_progress: ProgressCallback | None) -> None:
+        """
+        Initialize _Ingestion
+
+        Args:
+            sink: Destination of the downloaded quotes
+            tickers: Ticker symbols of the run
+            on_progress: Optional progress callback (see QuoteIngestionEngine.run)
+        """
+        self.sink = sink
+        self.tickers = tickers
+        self.on_progress = on_progress
+        self.counts: dict[str, dict[str, int]] = {}
+        self.errors: dict[str, str] = {}
+        self.timings: dict[str, dict[str, float]] = {}
+        self.logger = LoggerManager.get_logger(name=QuoteIngestionEngine.__name__)
+
+    def plan(self) -> dict[datetime, list[str]]:
+        """Ask the sink for start dates; up-to-date tickers are reported done, the others grouped by start date"""
+        groups: dict[datetime, list[str]] = {}
+        for ticker, start_date in self.sink.get_start_dates(self.tickers).items():
+            if start_date is None:
+                self.counts[ticker] = {"inserted": 0, "updated": 0, "skipped": 0}
+            else:
+                groups.setdefault(start_date, []).append(ticker)
+        self.report(list(self.counts))
+        return groups
+
+    def store_batch(
+        self, batch: list[str], frames: dict[str, DataFrame] | None, error: Exception | None, download_ms: float
+    ) -> None:
+        """Store (or fail) every ticker of a downloaded batch and report the ones that are done"""
+        if error is not None:
+            self.sink.fail(batch, str(error))
+        for ticker in batch:
+            insert_start: float = time.perf_counter()
+            if error is not None:
+                self.errors[ticker] = str(error)
+            else:
+                try:
+                    stored: dict[str, int] | None = self.sink.store(ticker, frames.get(ticker))
+                    if stored is not None:
+                        self.counts[ticker] = stored
+                except Exception as e:
+                    self.errors[ticker] = str(e)
+                    self.sink.fail([ticker], str(e))
+            if ticker in self.errors:
+                self.logger.error(f"Failed to ingest {ticker}: {self.errors[ticker]}")
+            insert_ms: float = (time.perf_counter() - insert_start) * 1000
+            self.timings[ticker] = {"download_ms": round(download_ms, 1), "insert_ms": round(insert_ms, 1)}
+        # Staged tickers are reported after the flush
+        self.report([ticker for ticker in batch if ticker in self.counts or ticker in self.errors])
+
+    def flush(self) -> tuple[dict[str, dict[str, int]], dict[str, str], dict[str, dict[str, float]]]:
+        """Let staging sinks write everything in one transaction and return the run results"""
+        flush_start: float = time.perf_counter()
+        flushed_counts, flushed_errors = self.sink.flush()
+        flushed: set[str] = set(flushed_counts) | set(flushed_errors)
+        if flushed:
+            # insert_ms of staged tickers: their share of the single write
+            share_ms: float = (time.perf_counter() - flush_start) * 1000 / len(flushed)
+            self.counts.update(flushed_counts)
+            self.errors.update(flushed_errors)
+            for ticker in flushed & set(self.timings):
+                self.timings[ticker]["insert_ms"] = round(self.timings[ticker]["insert_ms"] + share_ms, 1)
+            self.report([ticker for ticker in self.tickers if ticker in flushed])
+        return self.counts, self.errors, self.timings
+
+    def report(self, done: list[str]) -> None:
+        """Pass the counts and errors of processed tickers to the progress callback"""
+        if self.on_progress is not None and done:
+            self.on_progress(
+                {ticker: self.counts[ticker] for ticker in done if ticker in self.counts and ticker not in self.errors},
+                {ticker: self.errors[ticker] for ticker in done if ticker in self.errors},
+            )
@@ -0,0 +1,175 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+In-process LRU cache for quote series.
+
+Quotes only change when the nightly ingestion runs, so chart reads are cached
+per (ticker, period, trading day, ...) and invalidated per ticker on write.
+Every invalidation bumps the ticker's generation: readers take it before
+querying and pass it to put(), so a series read before a concurrent write
+is never cached after that write invalidated the ticker.
+"""
+from __future__ import annotations
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+from core.log import LoggerManager
+
+
+class QuoteCache:
+    """Thread-safe LRU cache bounded by an approximate memory budget"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Initialize QuoteCache
+
+        Args:
+            max_bytes: Approximate memory budget for cached values
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[Hashable, ...], tuple[Any, int]] = OrderedDict()
+        self._generations: dict[Hashable, int] = {}
+        self._clears = 0
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def get(self, key: tuple[Hashable, ...]) -> Any | None:
+        """
+        Return the cached value for key (marking it as recently used), or None on a miss
+
+        Args:
+            key: Cache key; the first element must be the ticker
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def generation(self, ticker: str) -> int:
+        """
+        Return the ticker's generation, which grows with every invalidation of the ticker
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            Generation to pass to put() for a value read after this call
+        """
+        with self._lock:
+            return self._clears + self._generations.get(ticker, 0)
+
+    def put(self, key: tuple[Hashable, ...], value: Any, generation: int | None = None) -> None:
+        """
+        Store a value, evicting least recently used entries to stay within budget
+
+        Args:
+            key: Cache key; the first element must be the ticker
+            value: Value to cache (treated as read-only by callers)
+            generation: Ticker generation taken before the value was read; the value
+                is dropped if the ticker was invalidated since
+        """
+        size: int = self._estimate_size(value)
+        if size > self.max_bytes:
+            self.logger.debug(f"Not caching {key}: {size} bytes exceeds budget")
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._clears + self._generations.get(key[0], 0):
+                self.logger.debug(f"Not caching {key}: invalidated while it was read")
+                return
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+
+            self._entries[key] = (value, size)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def invalidate(self, ticker: str) -> int:
+        """
+        Drop every cached entry for a ticker
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._generations[ticker] = self._generations.get(ticker, 0) + 1
+            keys = [key for key in self._entries if key[0] == ticker]
+            for key in keys:
+                _, size = self._entries.pop(key)
+                self._size -= size
+            self._invalidations += len(keys)
+
+        if keys:
+            self.logger.debug(f"Invalidated {len(keys)} cached entries for {ticker}")
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached entries (counters are preserved)"""
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._clears += 1
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return cache effectiveness counters
+
+        Returns:
+            Dictionary with hits, misses, hit ratio, evictions, invalidations and memory usage
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _estimate_size(self, value: Any) -> int:
+        """
+        Approximate the memory footprint of a cached value
+
+        Containers (tuple, list, dict) are walked one level deep so that the
+        str/float elements of a (dates, closes) series are counted.
+
+        Args:
+            value: Value to measure
+
+        Returns:
+            Approximate size in bytes
+        """
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(self._estimate_size(item) for item in value)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(self._estimate_size(item) for item in value.values())
+        return sys.getsizeof(value)
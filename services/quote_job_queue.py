@@ -0,0 +1,198 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+In-process background queue for quote updates.
+
+HTTP handlers submit a job and return immediately (202 Accepted); a small
+worker pool runs the update through EtfService in its own app context. Jobs
+are persisted in the quote_jobs table, so their status survives the request
+and the process: jobs left queued or running by a previous process are run
+again by start() (interrupted bulk updates resume their checkpointed run).
+Submitting an update that is already queued or running returns that job.
+"""
+from __future__ import annotations
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+from sqlalchemy import select, update
+from core.database import DatabaseManager
+from core.log import LoggerManager
+from models import QuoteJobDAO
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from services.etf_service import EtfService
+
+
+class QuoteJobQueue:
+    """Persisted job queue running quote updates on a background worker pool"""
+
+    def __init__(self, db_manager: DatabaseManager, app: Flask, etf_service: EtfService, max_workers: int = 2) -> None:
+        """
+        Initialize QuoteJobQueue
+
+        Args:
+            db_manager: DatabaseManager instance for session handling
+            app: Flask application (workers run in its app context)
+            etf_service: EtfService running the updates
+            max_workers: Jobs running at the same time
+        """
+        self.db_manager = db_manager
+        self.app = app
+        self.etf_service = etf_service
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quote-job")
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def ensure_tables(self) -> None:
+        """Create the quote_jobs table if missing"""
+        with self.db_manager.write_session() as session:
+            QuoteJobDAO.__table__.create(bind=session.connection(), checkfirst=True)
+
+    def start(self) -> None:
+        """Run again the jobs left queued or running by a previous process"""
+        with self.db_manager.write_session() as session:
+            pending: list[QuoteJobDAO] = list(
+                session.scalars(
+                    select(QuoteJobDAO)
+                    .where(QuoteJobDAO.status.in_(("queued", "running")))
+                    .order_by(QuoteJobDAO.created_at)
+                )
+            )
+            for job in pending:
+                # Interrupted bulk updates continue their checkpointed run
+                if job.kind == "all" and job.status == "running":
+                    job.resume = True
+                job.status = "queued"
+            job_ids: list[str] = [job.id for job in pending]
+
+        for job_id in job_ids:
+            self._executor.submit(self._run, job_id)
+        if job_ids:
+            self.logger.info(f"Requeued {len(job_ids)} quote jobs left unfinished by a previous run")
+
+    def stop(self) -> None:
+        """Stop accepting work; queued jobs stay persisted and run on the next start()"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit_ticker(self, ticker: str) -> dict[str, Any]:
+        """
+        Queue a quote update for one ETF
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            Job dictionary (the already queued or running job for the ticker, if any)
+        """
+        return self._submit(kind="ticker", ticker=ticker, resume=False)
+
+    def submit_all(self, resume: bool = False) -> dict[str, Any]:
+        """
+        Queue a bulk quote update for all ETFs
+
+        Args:
+            resume: Continue the latest unfinished update run (pending/failed ETFs only)
+
+        Returns:
+            Job dictionary (the already queued or running bulk job, if any)
+        """
+        return self._submit(kind="all", ticker=None, resume=resume)
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """
+        Return a job
+
+        Args:
+            job_id: Job id returned on submission
+
+        Returns:
+            Job dictionary, or None if the job does not exist
+        """
+        with self.db_manager.read_session() as session:
+            job: QuoteJobDAO | None = session.get(QuoteJobDAO, job_id)
+            return self._to_dict(job) if job is not None else None
+
+    def _submit(self, kind: str, ticker: str | None, resume: bool) -> dict[str, Any]:
+        """Persist a queued job (or find the identical active one) and hand it to the worker pool"""
+        with self.db_manager.write_session() as session:
+            active: QuoteJobDAO | None = session.scalars(
+                select(QuoteJobDAO)
+                .where(
+                    QuoteJobDAO.kind == kind,
+                    QuoteJobDAO.ticker.is_(None) if ticker is None else QuoteJobDAO.ticker == ticker,
+                    QuoteJobDAO.status.in_(("queued", "running")),
+                )
+                .limit(1)
+            ).first()
+            if active is not None:
+                self.logger.info(f"Quote job {active.id} already {active.status} for {ticker or 'all ETFs'}")
+                return self._to_dict(active)
+
+            job: QuoteJobDAO = QuoteJobDAO(
+                id=uuid.uuid4().hex, kind=kind, ticker=ticker, resume=resume, status="queued", created_at=datetime.now()
+            )
+            session.add(job)
+            session.flush()
+            job_dict: dict[str, Any] = self._to_dict(job)
+
+        self._executor.submit(self._run, job_dict["id"])
+        self.logger.info(f"Queued quote job {job_dict['id']} for {ticker or 'all ETFs'}")
+        return job_dict
+
+    def _run(self, job_id: str) -> None:
+        """Run one job on a worker thread and persist its outcome"""
+        with self.app.app_context():
+            with self.db_manager.write_session() as session:
+                job: QuoteJobDAO | None = session.get(QuoteJobDAO, job_id)
+                if job is None or job.status != "queued":
+                    return
+                job.status = "running"
+                job.started_at = datetime.now()
+                kind, ticker, resume = job.kind, job.ticker, job.resume
+
+            result: dict[str, Any] | None = None
+            error: str | None = None
+            try:
+                if kind == "ticker":
+                    result = self.etf_service.update_etf_quotes(ticker)
+                else:
+                    result = self.etf_service.update_all_etf_quotes(resume=resume, source="job")
+                if not result["success"]:
+                    error = result["message"]
+            except Exception as e:
+                self.logger.exception(f"Quote job {job_id} failed: {e}")
+                error = str(e)
+
+            with self.db_manager.write_session() as session:
+                session.execute(
+                    update(QuoteJobDAO)
+                    .where(QuoteJobDAO.id == job_id)
+                    .values(
+                        status="failed" if error is not None else "succeeded",
+                        result=json.dumps(result) if result is not None else None,
+                        error=error,
+                        finished_at=datetime.now(),
+                    )
+                )
+            self.logger.info(f"Quote job {job_id} {'failed' if error is not None else 'succeeded'}")
+
+    @staticmethod
+    def _to_dict(job: QuoteJobDAO) -> dict[str, Any]:
+        """Convert a job to its JSON-ready dictionary"""
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "ticker": job.ticker,
+            "resume": job.resume,
+            "status": job.status,
+            "result": json.loads(job.result) if job.result else None,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
@@ -0,0 +1,314 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Quote download providers.
+
+A provider downloads daily quotes for one or more tickers over a date range
+and returns one frame per ticker, shaped like a single-ticker yfinance
+download: DatetimeIndex named Date and flat columns
+Open, High, Low, Close, Adj Close, Volume. Providers that know corporate
+actions add a Dividends column (amount per share on the ex-date, 0 otherwise).
+"""
+from __future__ import annotations
+import ast
+import logging
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Protocol
+import time
+import pandas as pd
+from pandas import DataFrame
+from core.log import LoggerManager
+from core.rate_limiter import RateLimiter, ThrottledError, TransientError, get_rate_limiter
+import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+
+
+# Columns of a single-ticker yfinance frame (after the Date index)
+QUOTE_FRAME_COLUMNS: list[str] = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+class QuoteProvider(Protocol):
+    """Downloads daily quotes for a batch of tickers"""
+
+    # Maximum concurrent download calls the ingestion engine may issue to this provider
+    max_concurrency: int
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, DataFrame]:
+        """
+        Download quotes for several tickers in one call
+
+        Args:
+            tickers: Ticker symbols
+            start: First date (inclusive)
+            end: Last date (exclusive)
+
+        Returns:
+            Dictionary ticker -> quote frame; tickers without data are omitted
+        """
+        ...
+
+
+def split_download_frame(raw_df: DataFrame | None, tickers: list[str]) -> dict[str, DataFrame]:
+    """
+    Split a multi-ticker yfinance frame (MultiIndex columns Price x Ticker) into per-ticker frames
+
+    Rows a ticker did not trade on (the union of all calendars) are dropped,
+    as are tickers with no quotes at all.
+
+    Args:
+        raw_df: Frame returned by yf.download(tickers=[...], group_by="column")
+        tickers: Requested tickers
+
+    Returns:
+        Dictionary ticker -> frame with flat columns
+    """
+    if raw_df is None or raw_df.empty:
+        return {}
+
+    if not isinstance(raw_df.columns, pd.MultiIndex):
+        # Older yfinance releases return flat columns for a single ticker
+        frames = {tickers[0]: raw_df} if len(tickers) == 1 else {}
+    else:
+        available = set(raw_df.columns.get_level_values(1))
+        frames = {
+            ticker: raw_df.xs(ticker, axis=1, level=1, drop_level=True) for ticker in tickers if ticker in available
+        }
+
+    result: dict[str, DataFrame] = {}
+    for ticker, frame in frames.items():
+        # Close is NOT NULL in the quotes table: rows without it carry nothing to store
+        frame = frame.dropna(subset=["Close"])
+        if not frame.empty:
+            result[ticker] = frame
+    return result
+
+
+# yfinance error messages worth a retry: throttling, and network or server hiccups
+THROTTLED_PATTERN = re.compile(r"YFRateLimitError|Too Many Requests|Rate limit", re.IGNORECASE)
+TRANSIENT_PATTERN = re.compile(
+    r"timed? ?out|Timeout|Connection|Temporary failure|Remote end closed|HTTP Error 5\d\d|\b50[234]\b", re.IGNORECASE
+)
+
+
+class _DownloadErrorCapture(logging.Handler):
+    """
+    Collect the per-ticker errors yf.download logs from the calling thread
+
+    yf.download never raises for a failed ticker: it logs
+    "['T1', 'T2']: <error>" on the "yfinance" logger and leaves the ticker
+    out of the frame. Records from other threads (concurrent downloads) are
+    ignored.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.ERROR)
+        self.thread_id: int = threading.get_ident()
+        self.errors: dict[str, str] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread != self.thread_id:
+            return
+        symbols, separator, error = record.getMessage().partition("]: ")
+        if not separator:
+            return
+        try:
+            tickers = ast.literal_eval(symbols + "]")
+        except (ValueError, SyntaxError):
+            return
+        for ticker in tickers:
+            self.errors[str(ticker)] = error
+
+
+class YFinanceQuoteProvider:
+    """QuoteProvider backed by a single multi-ticker yf.download call, behind the shared rate limiter"""
+
+    def __init__(self, max_concurrency: int = 4, rate_limiter: RateLimiter | None = None) -> None:
+        """
+        Initialize YFinanceQuoteProvider
+
+        Args:
+            max_concurrency: Maximum concurrent yf.download calls
+            rate_limiter: Rate limiter of the calls (defaults to the process-wide "yfinance" limiter)
+        """
+        self.max_concurrency = max_concurrency
+        self.rate_limiter: RateLimiter = rate_limiter or get_rate_limiter("yfinance")
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, DataFrame]:
+        """
+        Download quotes for several tickers with one yf.download call
+
+        Every attempt takes one rate limiter token per ticker it downloads (yfinance
+        issues one request per ticker). Tickers that fail because of throttling or a
+        transient error are downloaded again after a jittered backoff; tickers that
+        already succeeded are kept and not charged again.
+
+        Args:
+            tickers: Ticker symbols
+            start: First date (inclusive)
+            end: Last date (exclusive)
+
+        Returns:
+            Dictionary ticker -> quote frame; tickers without data are omitted
+
+        Raises:
+            ThrottledError: Still throttled after the limiter's retries
+            TransientError: Still failing after the limiter's retries
+        """
+        frames: dict[str, DataFrame] = {}
+        pending: list[str] = list(tickers)
+
+        def attempt() -> None:
+            downloaded, errors = self._download_once(pending, start, end)
+            frames.update(downloaded)
+            throttled = [ticker for ticker, error in errors.items() if THROTTLED_PATTERN.search(error)]
+            transient = [ticker for ticker, error in errors.items() if TRANSIENT_PATTERN.search(error)]
+            pending[:] = [ticker for ticker in pending if ticker in throttled or ticker in transient]
+            if throttled:
+                raise ThrottledError(f"{len(throttled)} of {len(errors)} failed tickers rate limited")
+            if transient:
+                raise TransientError(f"{transient}: {errors[transient[0]]}")
+
+        self.rate_limiter.call(attempt, cost=lambda: len(pending))
+        return frames
+
+    def _download_once(
+        self, tickers: list[str], start: datetime, end: datetime
+    ) -> tuple[dict[str, DataFrame], dict[str, str]]:
+        """
+        Run one yf.download call (with actions, so dividends come in the same request) and collect
+        the errors it logged
+
+        Returns:
+            Tuple of (ticker -> quote frame, ticker -> error message)
+        """
+        self.logger.debug(f"Downloading {len(tickers)} tickers from {start.date()} to {end.date()}")
+        capture = _DownloadErrorCapture()
+        yf_logger: logging.Logger = logging.getLogger("yfinance")
+        yf_logger.addHandler(capture)
+        try:
+            raw_df: DataFrame | None = yf.download(
+                tickers=tickers,
+                start=start,
+                end=end,
+                progress=False,
+                auto_adjust=False,
+                actions=True,
+                group_by="column",
+            )
+        except YFRateLimitError as e:
+            raise ThrottledError(str(e)) from e
+        finally:
+            yf_logger.removeHandler(capture)
+        return split_download_frame(raw_df, tickers), capture.errors
+
+
+class FileQuoteProvider:
+    """QuoteProvider reading local <ticker>.csv files (offline runs and fixtures)"""
+
+    def __init__(self, quotes_dir: str | Path, max_concurrency: int = 8) -> None:
+        """
+        Initialize FileQuoteProvider
+
+        Args:
+            quotes_dir: Directory with one Date,Open,High,Low,Close,Adj Close,Volume CSV per ticker
+            max_concurrency: Maximum concurrent file reads
+        """
+        self.quotes_dir = Path(quotes_dir)
+        self.max_concurrency = max_concurrency
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, DataFrame]:
+        """
+        Read quotes for several tickers from their CSV files
+
+        Args:
+            tickers: Ticker symbols
+            start: First date (inclusive)
+            end: Last date (exclusive)
+
+        Returns:
+            Dictionary ticker -> quote frame; tickers without a file or without rows in range are omitted
+        """
+        frames: dict[str, DataFrame] = {}
+        for ticker in tickers:
+            history: DataFrame | None = self._read(ticker)
+            if history is None:
+                continue
+            frame: DataFrame = history.loc[(history.index >= start) & (history.index < end)]
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def _read(self, ticker: str) -> DataFrame | None:
+        """Return the full history of a ticker from its CSV file, or None if it has no file"""
+        csv_path: Path = self.quotes_dir / f"{ticker}.csv"
+        if not csv_path.exists():
+            self.logger.debug(f"No quote file for {ticker} in {self.quotes_dir}")
+            return None
+
+        frame: DataFrame = pd.read_csv(csv_path, index_col="Date", parse_dates=["Date"])
+        frame = frame.loc[~frame.index.duplicated(keep="last"), QUOTE_FRAME_COLUMNS]
+        return frame.dropna(subset=["Close"])
+
+
+class CsvReplayProvider(FileQuoteProvider):
+    """
+    FileQuoteProvider replaying downloads for offline benchmarks
+
+    Adds a parsed-history cache (optionally preloaded, so calls measure replay
+    rather than CSV parsing), a simulated network latency per call and a hard
+    cap on concurrent calls.
+    """
+
+    def __init__(
+        self,
+        quotes_dir: str | Path,
+        max_concurrency: int = 8,
+        latency_ms: float = 0.0,
+        preload: bool = False,
+    ) -> None:
+        """
+        Initialize CsvReplayProvider
+
+        Args:
+            quotes_dir: Directory with one Date,Open,High,Low,Close,Adj Close,Volume CSV per ticker
+            max_concurrency: Maximum concurrent replayed downloads (extra calls wait)
+            latency_ms: Simulated network latency added to every call
+            preload: Parse every CSV file up front
+        """
+        super().__init__(quotes_dir, max_concurrency)
+        self.latency_ms = latency_ms
+        self._frames: dict[str, DataFrame | None] = {}
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        if preload:
+            for csv_path in sorted(self.quotes_dir.glob("*.csv")):
+                self._read(csv_path.stem)
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, DataFrame]:
+        """
+        Replay quotes for several tickers after the simulated latency
+
+        Args:
+            tickers: Ticker symbols
+            start: First date (inclusive)
+            end: Last date (exclusive)
+
+        Returns:
+            Dictionary ticker -> quote frame; tickers without data are omitted
+        """
+        with self._slots:
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000)
+            return super().download(tickers, start, end)
+
+    def _read(self, ticker: str) -> DataFrame | None:
+        """Return the cached full history of a ticker, or None if it has no CSV file"""
+        if ticker not in self._frames:
+            self._frames[ticker] = super()._read(ticker)
+        return self._frames[ticker]
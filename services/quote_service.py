@@ -2,34 +2,125 @@
 # Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
 # Licensed under the MIT License. See LICENSE.md for details.
 # -----------------------------------------------------------------------------
-from typing import Any
+from typing import Any, Literal
 from datetime import datetime
 from pandas.core.frame import DataFrame
-from models import QuoteDAO
+from sqlalchemy import Connection, func, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import DividendDAO, QuoteDAO, QuoteSyncStateDAO
 from core.database import DatabaseManager
+from core.day_number import from_day_number, to_date, to_date_strings, to_day_number
+from core.exchange_calendar import next_download_start
+from core.single_flight import SingleFlight, get_single_flight
+from core.downsampling import lttb_indices
 from core.log import LoggerManager
 from dto import Quote, QuotePeriod
+from services.quote_cache import QuoteCache
+from services.columnar_quote_store import ColumnarQuoteStore
+from services.quote_provider import QuoteProvider, YFinanceQuoteProvider
+from services.ingestion_engine import ProgressCallback, QuoteIngestionEngine, SqliteQuoteSink
 import datetime as dt
-import yfinance as yf
+import numpy as np
 import math
 
 
+# Columns written by the quote upsert, in statement order
+QUOTE_COLUMNS: list[str] = ["Ticker", "Date", "Open", "High", "Low", "Close", "Adj_Close", "Volume"]
+
+
+def build_quote_upsert_sql(on_conflict: Literal["ignore", "update"]) -> str:
+    """
+    Build the prepared quote upsert executed with DBAPI executemany (one row of QUOTE_COLUMNS per execution)
+
+    Args:
+        on_conflict: "ignore" to keep stored quotes, "update" to overwrite them
+
+    Returns:
+        INSERT ... ON CONFLICT(Ticker, Date) statement with ? placeholders
+    """
+    columns: str = ", ".join(QUOTE_COLUMNS)
+    placeholders: str = ", ".join("?" for _ in QUOTE_COLUMNS)
+    if on_conflict == "update":
+        assignments: str = ", ".join(f"{column} = excluded.{column}" for column in QUOTE_COLUMNS[2:])
+        conflict: str = f"DO UPDATE SET {assignments}"
+    else:
+        conflict = "DO NOTHING"
+    return (
+        f"INSERT INTO {QuoteDAO.__tablename__} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT (Ticker, Date) {conflict}"
+    )
+
+
+QUOTE_UPSERT_SQL: dict[str, str] = {mode: build_quote_upsert_sql(mode) for mode in ("ignore", "update")}
+
+# Dividend upsert with the same conflict handling as quotes (Pay_Date is not provided by yfinance)
+DIVIDEND_UPSERT_SQL: dict[str, str] = {
+    "ignore": f"INSERT INTO {DividendDAO.__tablename__} (Ticker, Date, Dividend) VALUES (?, ?, ?) "
+    "ON CONFLICT (Ticker, Date) DO NOTHING",
+    "update": f"INSERT INTO {DividendDAO.__tablename__} (Ticker, Date, Dividend) VALUES (?, ?, ?) "
+    "ON CONFLICT (Ticker, Date) DO UPDATE SET Dividend = excluded.Dividend",
+}
+
+
 class QuoteService:
     """Service layer for Quote management and download"""
 
-    def __init__(self, db_manager: DatabaseManager) -> None:
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        cache: QuoteCache | None = None,
+        quote_store: ColumnarQuoteStore | None = None,
+        provider: QuoteProvider | None = None,
+        download_batch_size: int = 20,
+        max_workers: int = 1,
+        engine: Literal["threads", "asyncio"] = "threads",
+        commit_mode: Literal["per_ticker", "staged"] = "per_ticker",
+        restatement_overlap_days: int = 10,
+        restatement_tolerance: float = 0.01,
+        single_flight: SingleFlight | None = None,
+    ) -> None:
         """
         Initialize QuoteService with a DatabaseManager instance
 
         Args:
             db_manager: DatabaseManager instance for session handling
+            cache: Optional QuoteCache for quote series reads (disabled when None)
+            quote_store: Optional columnar store; when set, series reads use it and ingestion
+                appends to it (SQLite stays the source of truth: a ticker whose store row count
+                differs from its sync state is rebuilt before it is read)
+            provider: Quote download provider (defaults to yfinance)
+            download_batch_size: Maximum tickers per provider call in bulk updates
+            max_workers: Concurrent downloads in bulk updates (1 = serial)
+            engine: Download concurrency of the bulk QuoteIngestionEngine: thread pool or event loop
+                (both bounded by max_workers and the provider's max_concurrency)
+            commit_mode: Bulk update writes: one transaction per ticker, or all tickers
+                staged and committed in a single transaction
+            restatement_overlap_days: Days of stored quotes downloaded again to detect restated
+                adjusted closes (0 disables the check)
+            restatement_tolerance: Adj Close difference (in price units) treated as a restatement
+            single_flight: Registry coalescing concurrent updates of the same ticker
+                (defaults to the process-wide "quotes" registry)
         """
         self.db_manager = db_manager
+        self.cache = cache
+        self.quote_store = quote_store
+        self.provider: QuoteProvider = provider or YFinanceQuoteProvider()
+        self.download_batch_size = download_batch_size
+        self.max_workers = max_workers
+        self.engine = engine
+        self.commit_mode = commit_mode
+        self.restatement_overlap_days = restatement_overlap_days
+        self.restatement_tolerance = restatement_tolerance
+        self.single_flight: SingleFlight = single_flight or get_single_flight("quotes")
         self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
         self.start_date = dt.datetime(year=1970, month=1, day=1)
-        self.end_date = dt.datetime.now() - dt.timedelta(days=1)
         self.logger.info("QuoteService initialized")
 
+    @property
+    def end_date(self) -> datetime:
+        """Exclusive download end (yesterday), recomputed on access so the cron job moves forward daily"""
+        return dt.datetime.now() - dt.timedelta(days=1)
+
     def get_quotes(self, ticker: str, period: QuotePeriod = QuotePeriod.ONE_YEAR) -> list[Quote]:
         """
         Retrieve quotes for an ETF within a specific period
@@ -48,62 +139,370 @@ class QuoteService:
 
         self.logger.debug(f"Calculated start date for period {period.value}: {start_date.strftime('%Y-%m-%d')}")
 
-        # Query quotes from database
-        quote_daos: list[QuoteDAO] = (
-            QuoteDAO.query.filter(QuoteDAO.Ticker == ticker, QuoteDAO.Date > start_date.strftime("%Y-%m-%d"))
+        # Query quotes from database (read-only engine)
+        stmt = (
+            select(QuoteDAO)
+            .where(QuoteDAO.Ticker == ticker, QuoteDAO.Date > to_day_number(start_date))
+            .order_by(QuoteDAO.Date)
+        )
+        with self.db_manager.read_session() as session:
+            quote_daos: list[QuoteDAO] = list(session.scalars(stmt))
+
+            self.logger.info(f"Retrieved {len(quote_daos)} quotes for ETF {ticker}")
+
+            # Convert DAOs to DTOs using Pydantic's model_validate
+            return [Quote.model_validate(obj=dao) for dao in quote_daos]
+
+    def get_quote_series(
+        self, ticker: str, period: QuotePeriod = QuotePeriod.ONE_YEAR, points: int | None = None
+    ) -> tuple[list[str], list[float]]:
+        """
+        Retrieve the closing price series for an ETF within a specific period
+
+        Columnar read path for chart data: selects only (Date, Close) with Core SQL,
+        without building QuoteDAO objects or validating Quote DTOs row by row.
+        When points is given, the series is downsampled with LTTB; raw and
+        downsampled series are cached side by side.
+
+        Args:
+            ticker: ETF ticker symbol
+            period: Time period (QuotePeriod enum)
+            points: Optional maximum number of points (LTTB downsampling)
+
+        Returns:
+            Tuple of (dates, closes) ordered by date
+        """
+        self.logger.info(f"Fetching quote series for ETF {ticker}, period: {period.value}, points: {points}")
+
+        # Period start dates move daily, so the trading day is part of the key
+        cache_key = (ticker, period, dt.date.today(), points)
+        generation: int | None = None
+        if self.cache is not None:
+            cached: tuple[list[str], list[float]] | None = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"Quote series cache hit for {ticker}, period: {period.value}, points: {points}")
+                return cached
+            # Taken before the read: a write invalidating the ticker meanwhile keeps this series out
+            generation = self.cache.generation(ticker)
+
+        series: tuple[list[str], list[float]]
+        if points is not None:
+            dates, closes = self.get_quote_series(ticker, period)
+            series = self._downsample_series(dates, closes, points)
+        else:
+            series = self._query_quote_series(ticker, period)
+
+        if self.cache is not None:
+            self.cache.put(cache_key, series, generation=generation)
+        return series
+
+    def _query_quote_series(self, ticker: str, period: QuotePeriod) -> tuple[list[str], list[float]]:
+        """
+        Select the (Date, Close) columns for an ETF within a specific period
+
+        Args:
+            ticker: ETF ticker symbol
+            period: Time period (QuotePeriod enum)
+
+        Returns:
+            Tuple of (dates, closes) ordered by date
+        """
+        start_day: int = to_day_number(period.get_start_date())
+
+        if self.quote_store is not None and self._sync_quote_store(ticker):
+            # searchsorted on the day column + zero-copy slices of the memory maps
+            columns = self.quote_store.read_range(ticker, start_day, columns=("Date", "Close"))
+            dates: list[str] = to_date_strings(columns["Date"])
+            closes: list[float] = columns["Close"].tolist()
+            self.logger.info(f"Retrieved {len(dates)} closes for ETF {ticker} from columnar store")
+            return dates, closes
+
+        stmt = (
+            select(QuoteDAO.Date, QuoteDAO.Close)
+            .where(QuoteDAO.Ticker == ticker, QuoteDAO.Date > start_day)
             .order_by(QuoteDAO.Date)
-            .all()
         )
+        with self.db_manager.read_session() as session:
+            rows = session.execute(stmt).all()
+
+        dates = to_date_strings([day for day, _ in rows])
+        closes = [close for _, close in rows]
 
-        self.logger.info(f"Retrieved {len(quote_daos)} quotes for ETF {ticker}")
+        self.logger.info(f"Retrieved {len(dates)} closes for ETF {ticker}")
+        return dates, closes
+
+    def _downsample_series(
+        self, dates: list[str], closes: list[float], points: int
+    ) -> tuple[list[str], list[float]]:
+        """
+        Downsample a (dates, closes) series to at most points values with LTTB
 
-        # Convert DAOs to DTOs using Pydantic's model_validate
-        return [Quote.model_validate(obj=dao) for dao in quote_daos]
+        Args:
+            dates: Dates in YYYY-MM-DD format, ordered
+            closes: Closing prices aligned with dates
+            points: Maximum number of points to keep
 
-    def update_quotes(self, ticker: str) -> None:
+        Returns:
+            Downsampled (dates, closes)
+        """
+        if len(dates) <= points:
+            return dates, closes
+
+        day_numbers: np.ndarray = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+        indices: np.ndarray = lttb_indices(day_numbers, np.asarray(closes, dtype=np.float64), points)
+
+        self.logger.debug(f"Downsampled {len(dates)} closes to {len(indices)} points")
+        return [dates[i] for i in indices], [closes[i] for i in indices]
+
+    def get_quote_metadata(self, ticker: str) -> tuple[str | None, int, int, datetime | None]:
+        """
+        Retrieve the latest quote date, the number of stored quotes and their version for an ETF
+
+        Cheap lookup (primary key index only) used to validate HTTP caches
+        without running the full range query. The version and the update time
+        change with every write to the ticker's quotes, including history
+        rewritten in place by a restatement.
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            Tuple of (latest quote date or None, row count, version, last quote change in UTC or None)
+        """
+        # Sync state primary key lookup; quotes aggregate only for tickers without a state row
+        state_stmt = select(
+            QuoteSyncStateDAO.last_date,
+            QuoteSyncStateDAO.row_count,
+            QuoteSyncStateDAO.version,
+            QuoteSyncStateDAO.updated_at,
+        ).where(QuoteSyncStateDAO.ticker == ticker)
+        quotes_stmt = select(func.max(QuoteDAO.Date), func.count(), literal(0), literal(None)).where(
+            QuoteDAO.Ticker == ticker
+        )
+        with self.db_manager.read_session() as session:
+            state = session.execute(state_stmt).one_or_none()
+            last_day, row_count, version, updated_at = state if state is not None else session.execute(
+                quotes_stmt
+            ).one()
+
+        if last_day is None:
+            return None, 0, 0, None
+        return from_day_number(last_day), row_count, version, updated_at
+
+    def get_aligned_quotes(
+        self, tickers: list[str], period: QuotePeriod = QuotePeriod.ONE_YEAR, normalize: float | None = None
+    ) -> tuple[list[str], dict[str, list[float | None]]]:
+        """
+        Retrieve closing prices for several ETFs aligned on a common date axis
+
+        All tickers are fetched with a single IN (...) range query and pivoted
+        into a date x ticker matrix. Gaps (holidays of one listing, later
+        launch dates) are forward-filled; values before a ticker's first quote
+        stay None.
+
+        Args:
+            tickers: ETF ticker symbols (column order of the result)
+            period: Time period (QuotePeriod enum)
+            normalize: Optional base value; every series is rebased to it on the first date all
+                tickers with quotes have a value (their own first quote if they never overlap)
+
+        Returns:
+            Tuple of (dates, {ticker: closes aligned with dates})
+        """
+        import pandas as pd
+
+        self.logger.info(f"Fetching aligned quotes for {len(tickers)} ETFs, period: {period.value}")
+
+        start_day: int = to_day_number(period.get_start_date())
+        stmt = (
+            select(QuoteDAO.Date, QuoteDAO.Ticker, QuoteDAO.Close)
+            .where(QuoteDAO.Ticker.in_(tickers), QuoteDAO.Date > start_day)
+            .order_by(QuoteDAO.Date)
+        )
+        with self.db_manager.read_session() as session:
+            rows = session.execute(stmt).all()
+
+        if not rows:
+            return [], {ticker: [] for ticker in tickers}
+
+        frame = pd.DataFrame(rows, columns=["Date", "Ticker", "Close"])
+        matrix = frame.pivot(index="Date", columns="Ticker", values="Close").reindex(columns=tickers).ffill()
+
+        if normalize is not None:
+            # Rebase on the first common date so every series starts level; without one,
+            # on each column's first valid value (bfill pulls it up to the first row)
+            common = matrix.loc[:, matrix.notna().any()].dropna().index
+            base = matrix.loc[common[0]] if len(common) else matrix.bfill().iloc[0]
+            matrix = (matrix / base * normalize).round(4)
+
+        series: dict[str, list[float | None]] = matrix.astype(object).where(matrix.notna(), None).to_dict(orient="list")
+
+        self.logger.info(f"Aligned {len(rows)} quotes on {len(matrix.index)} dates for {len(tickers)} ETFs")
+        return to_date_strings(matrix.index.to_numpy()), series
+
+    def update_quotes(self, ticker: str, restate: bool = False) -> dict[str, int]:
         """
         Download and update quotes for a specific ETF ticker directly in the database
 
+        A call for a ticker already being updated (single update, bulk update or cron job)
+        waits for that update and returns its result instead of downloading again;
+        restating calls only coalesce with each other.
+
         Args:
             ticker: ETF ticker symbol
+            restate: Overwrite stored quotes on conflicting dates instead of skipping them
+
+        Returns:
+            Dictionary with the number of rows inserted, updated and skipped
 
         Raises:
             ValueError: If no historical data is available for the ticker
             Exception: For any other errors during download or database operations
         """
+        key: str | tuple[str, str] = (ticker, "restate") if restate else ticker
+        return self.single_flight.do(key, self._update_quotes, ticker, restate)
+
+    def _update_quotes(self, ticker: str, restate: bool) -> dict[str, int]:
+        """Download and update quotes for one ticker (leader of its single-flight key)"""
         self.logger.info(f"Updating quotes for ETF: {ticker}")
 
         # Determine date range for download
-        start_date: datetime | None = self._get_download_start_date(ticker)
+        start_date: datetime | None = self.get_download_start_date(ticker)
         if start_date is None:
-            return  # Already up to date
+            return {"inserted": 0, "updated": 0, "skipped": 0}  # Already up to date
 
-        # Download quotes from yfinance
+        # Download quotes from the provider
         self.logger.info(f"Downloading quotes from {start_date.date()} to {self.end_date.date()}")
-        raw_df: DataFrame | None = yf.download(
-            tickers=ticker,
-            start=start_date,
-            end=self.end_date,
-            progress=False,
-            auto_adjust=False,
+        frames: dict[str, DataFrame] = self.provider.download([ticker], start_date, self.end_date)
+
+        return self.store_downloaded_quotes(ticker, frames.get(ticker), restate)
+
+    def update_quotes_bulk(
+        self, tickers: list[str], on_progress: ProgressCallback | None = None
+    ) -> tuple[dict[str, dict[str, int]], dict[str, str], dict[str, dict[str, float]]]:
+        """
+        Download and update quotes for several tickers, coalescing with updates already in flight
+
+        Tickers being updated by another caller (single update, SSE, cron) are not
+        downloaded again: their result is taken from that update once this call has
+        processed its own tickers. The others are updated by _update_quotes_bulk and
+        released to waiting callers as soon as they are stored.
+
+        Args:
+            tickers: ETF ticker symbols
+            on_progress: Optional callback receiving the counts and errors of the tickers just processed
+
+        Returns:
+            Tuple of (ticker -> inserted/updated/skipped counts, ticker -> error message,
+            ticker -> {"download_ms", "insert_ms"})
+        """
+        led, followed = self.single_flight.claim(list(dict.fromkeys(tickers)))
+        unresolved: set[str] = set(led)
+
+        def settle(done: dict[str, dict[str, int]], failed: dict[str, str]) -> None:
+            for ticker, ticker_counts in done.items():
+                if ticker in unresolved:
+                    unresolved.discard(ticker)
+                    self.single_flight.resolve(ticker, result=ticker_counts)
+            for ticker, error in failed.items():
+                if ticker in unresolved:
+                    unresolved.discard(ticker)
+                    self.single_flight.resolve(ticker, error=ValueError(error))
+            if on_progress is not None:
+                on_progress(done, failed)
+
+        try:
+            counts, errors, timings = self._update_quotes_bulk(led, on_progress=settle)
+        finally:
+            # Never leave followers waiting on a ticker this call gave up on
+            for ticker in unresolved:
+                self.single_flight.resolve(ticker, error=RuntimeError(f"Update of {ticker} was interrupted"))
+
+        # Leaders are all resolved: waiting on other callers cannot deadlock
+        coalesced: dict[str, dict[str, int]] = {}
+        coalesced_errors: dict[str, str] = {}
+        for ticker, flight in followed.items():
+            try:
+                coalesced[ticker] = flight.wait()
+            except Exception as e:
+                coalesced_errors[ticker] = str(e)
+            timings[ticker] = {"download_ms": 0.0, "insert_ms": 0.0}
+        counts.update(coalesced)
+        errors.update(coalesced_errors)
+        if on_progress is not None and followed:
+            on_progress(coalesced, coalesced_errors)
+
+        return counts, errors, timings
+
+    def _update_quotes_bulk(
+        self, tickers: list[str], on_progress: ProgressCallback | None = None
+    ) -> tuple[dict[str, dict[str, int]], dict[str, str], dict[str, dict[str, float]]]:
+        """
+        Download and update quotes for several tickers with batched multi-ticker downloads
+
+        The QuoteIngestionEngine groups tickers by their download start date and fetches
+        each group with one provider call per download_batch_size tickers, up to
+        max_workers at a time on a thread pool or an event loop (engine), while the
+        calling thread stays the only writer, inserting each batch as soon as its
+        download completes. In staged commit mode the frames are collected instead and
+        written at the end in a single transaction (store_staged_quotes); insert_ms is
+        then each ticker's share of that write.
+
+        on_progress is called on the calling thread once tickers are durably processed
+        (after each batch is stored, after the staged write), so callers can checkpoint.
+
+        Args:
+            tickers: ETF ticker symbols
+            on_progress: Optional callback receiving the counts and errors of the tickers just processed
+
+        Returns:
+            Tuple of (ticker -> inserted/updated/skipped counts, ticker -> error message,
+            ticker -> {"download_ms", "insert_ms"})
+        """
+        sink = SqliteQuoteSink(self, staged=self.commit_mode == "staged")
+        ingestion_engine = QuoteIngestionEngine(
+            self.provider,
+            sink,
+            self.download_batch_size,
+            concurrency=self.engine,
+            max_concurrency=min(self.max_workers, self.provider.max_concurrency),
         )
+        return ingestion_engine.run(tickers, on_progress=on_progress)
+
+    def store_downloaded_quotes(self, ticker: str, raw_df: DataFrame | None, restate: bool = False) -> dict[str, int]:
+        """
+        Insert a downloaded quote frame, or validate an empty download
 
-        # No data available
+        Args:
+            ticker: ETF ticker symbol
+            raw_df: Downloaded quotes (None or empty when the provider returned nothing)
+            restate: Overwrite stored quotes on conflicting dates instead of skipping them
+
+        Returns:
+            Dictionary with the number of rows inserted, updated and skipped
+
+        Raises:
+            ValueError: If nothing was downloaded and no quotes are stored for the ticker
+        """
+        # No data available: record the attempt, fail only if nothing was ever stored
         if raw_df is None or (hasattr(raw_df, "empty") and raw_df.empty):
-            last_quote: QuoteDAO | None = (
-                QuoteDAO.query.filter(QuoteDAO.Ticker == ticker).order_by(QuoteDAO.Date.desc()).first()
-            )
-            if last_quote:
-                self.logger.info("  No new quotes available")
-                return
+            with self.db_manager.write_session() as session:
+                row_count: int = self._record_sync_attempt(session.connection(), ticker, "no_data")
+            if row_count:
+                self.logger.info(f"  No new quotes available for {ticker}")
+                return {"inserted": 0, "updated": 0, "skipped": 0}
             else:
                 raise ValueError(f"No historical data available for ticker {ticker}")
 
-        # Process and save quotes to database using bulk insert
-        self._bulk_insert_quotes(ticker, raw_df)
-        self.logger.info(f"  Added {len(raw_df)} new quotes")
+        # Process and save quotes to database using bulk upsert
+        counts: dict[str, int] = self._bulk_insert_quotes(ticker, raw_df, on_conflict="update" if restate else "ignore")
+        self.logger.info(
+            f"  Added {counts['inserted']} new quotes for {ticker} "
+            f"({counts['updated']} updated, {counts['skipped']} skipped)"
+        )
+        return counts
 
-    def _get_download_start_date(self, ticker: str) -> datetime | None:
+    def get_download_start_date(self, ticker: str) -> datetime | None:
         """
         Determine the start date for downloading quotes
 
@@ -113,33 +512,366 @@ class QuoteService:
         Returns:
             Start date for download, or None if already up to date
         """
-        last_quote: QuoteDAO | None = (
-            QuoteDAO.query.filter(QuoteDAO.Ticker == ticker).order_by(QuoteDAO.Date.desc()).first()
+        return self.get_download_start_dates([ticker])[ticker]
+
+    def get_download_start_dates(self, tickers: list[str]) -> dict[str, datetime | None]:
+        """
+        Determine the download start date of several tickers from the quote sync state
+
+        One query over quote_sync_state covers all tickers; tickers without a sync
+        state row (databases filled outside the insert path) fall back to one
+        grouped MAX(Date) query over quotes. Tickers whose exchange calendar has no
+        trading session between the last stored quote and the end date (weekends,
+        holidays) are up to date and need no download. Stale tickers start
+        restatement_overlap_days before their first missing date, so the download
+        overlaps stored quotes and restated adjusted closes can be detected.
+
+        Args:
+            tickers: ETF ticker symbols
+
+        Returns:
+            Dictionary ticker -> start date (None when already up to date)
+        """
+        with self.db_manager.read_session() as session:
+            state_stmt = select(QuoteSyncStateDAO.ticker, QuoteSyncStateDAO.last_date).where(
+                QuoteSyncStateDAO.ticker.in_(tickers)
+            )
+            last_days: dict[str, int | None] = {
+                ticker: last_day for ticker, last_day in session.execute(state_stmt).all()
+            }
+
+            missing: list[str] = [ticker for ticker in tickers if ticker not in last_days]
+            if missing:
+                quotes_stmt = (
+                    select(QuoteDAO.Ticker, func.max(QuoteDAO.Date))
+                    .where(QuoteDAO.Ticker.in_(missing))
+                    .group_by(QuoteDAO.Ticker)
+                )
+                last_days.update((ticker, last_day) for ticker, last_day in session.execute(quotes_stmt).all())
+
+        end_date: datetime = self.end_date
+        start_dates: dict[str, datetime | None] = {}
+        for ticker in tickers:
+            last_day: int | None = last_days.get(ticker)
+            if last_day is None:
+                # No quotes in database, download all historical data
+                start_dates[ticker] = self.start_date
+                continue
+
+            # Already up to date: no session of the ticker's exchange since the last quote
+            start_date: datetime | None = next_download_start(ticker, to_date(last_day), end_date)
+            if start_date is None:
+                start_dates[ticker] = None
+            else:
+                start_dates[ticker] = start_date - dt.timedelta(days=self.restatement_overlap_days)
+
+        up_to_date: int = sum(1 for start_date in start_dates.values() if start_date is None)
+        self.logger.debug(f"Planned {len(tickers)} tickers from the sync state ({up_to_date} already up to date)")
+        return start_dates
+
+    def record_sync_failure(self, tickers: list[str], error: str) -> None:
+        """
+        Record a failed download or store attempt in the quote sync state
+
+        Args:
+            tickers: ETF ticker symbols
+            error: Error message (logged only; the state keeps the status)
+        """
+        try:
+            with self.db_manager.write_session() as session:
+                connection: Connection = session.connection()
+                for ticker in tickers:
+                    self._record_sync_attempt(connection, ticker, "error")
+        except Exception as e:
+            self.logger.warning(f"Cannot record sync failure for {tickers} ({error}): {e}")
+
+    def _record_sync_attempt(
+        self, connection: Connection, ticker: str, status: str, last_day: int | None = None, inserted: int = 0
+    ) -> int:
+        """
+        Record an attempt in a ticker's sync state incrementally, in the caller's transaction
+
+        The latest day and row count move with the outcome of the upsert (days written,
+        rows inserted) without aggregating the ticker's quotes; a ticker without a state
+        row is initialized once from its stored quotes.
+
+        Args:
+            connection: Connection of the open write transaction
+            ticker: ETF ticker symbol
+            status: Outcome of the attempt (ok, no_data, error)
+            last_day: Latest day written by the attempt (None: no quotes written)
+            inserted: Number of new quotes inserted by the attempt
+
+        Returns:
+            Number of quotes stored for the ticker
+        """
+        values: dict[str, Any] = {"last_attempt": dt.datetime.now(), "last_status": status}
+        if inserted:
+            values["row_count"] = QuoteSyncStateDAO.row_count + inserted
+        if last_day is not None:
+            # Scalar max(): backfilled older days never move last_date back
+            values["last_date"] = func.max(func.coalesce(QuoteSyncStateDAO.last_date, last_day), last_day)
+        stmt = (
+            update(QuoteSyncStateDAO)
+            .where(QuoteSyncStateDAO.ticker == ticker)
+            .values(**values)
+            .returning(QuoteSyncStateDAO.row_count)
         )
+        row_count: int | None = connection.execute(stmt).scalar_one_or_none()
+        if row_count is None:
+            return self._refresh_sync_state(connection, ticker, status)
+        return row_count
 
-        if last_quote:
-            last_quote_date: datetime = dt.datetime.strptime(last_quote.Date, "%Y-%m-%d")
-            start_date: datetime = last_quote_date + dt.timedelta(days=1)
+    def _refresh_sync_state(self, connection: Connection, ticker: str, status: str) -> int:
+        """
+        Upsert a ticker's sync state from its stored quotes, in the caller's transaction
 
-            # Already up to date
-            if start_date >= self.end_date:
-                self.logger.info(f"  Already up to date (last quote: {last_quote_date.date()})")
-                return None
+        Full aggregate over the ticker's quotes: only used to initialize a missing state row
+        (the write path maintains existing rows incrementally with _record_sync_attempt).
 
-            return start_date
-        else:
-            # No quotes in database, download all historical data
-            return self.start_date
+        Args:
+            connection: Connection of the open write transaction
+            ticker: ETF ticker symbol
+            status: Outcome of the attempt (ok, no_data, error)
+
+        Returns:
+            Number of quotes stored for the ticker
+        """
+        aggregate = select(
+            literal(ticker),
+            func.max(QuoteDAO.Date),
+            func.count(),
+            literal(dt.datetime.now(), QuoteSyncStateDAO.last_attempt.type),
+            literal(status),
+        ).where(QuoteDAO.Ticker == ticker)
+        stmt = sqlite_insert(QuoteSyncStateDAO).from_select(
+            ["ticker", "last_date", "row_count", "last_attempt", "last_status"], aggregate
+        )
+        refreshed: tuple[str, ...] = ("last_date", "row_count", "last_attempt", "last_status")
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[QuoteSyncStateDAO.ticker],
+            set_={column: stmt.excluded[column] for column in refreshed},
+        )
+        connection.execute(stmt)
+        return connection.execute(
+            select(QuoteSyncStateDAO.row_count).where(QuoteSyncStateDAO.ticker == ticker)
+        ).scalar_one()
 
-    def _bulk_insert_quotes(self, ticker: str, raw_df: DataFrame) -> None:
+    def _touch_sync_state(self, connection: Connection, ticker: str) -> None:
         """
-        Bulk insert quotes into database using pandas to_sql
+        Bump a ticker's quote version and update time after its stored quotes changed
+
+        Args:
+            connection: Connection of the open write transaction
+            ticker: ETF ticker symbol
+        """
+        connection.execute(
+            update(QuoteSyncStateDAO)
+            .where(QuoteSyncStateDAO.ticker == ticker)
+            .values(
+                version=QuoteSyncStateDAO.version + 1,
+                updated_at=dt.datetime.now(dt.timezone.utc).replace(tzinfo=None),
+            )
+        )
+
+    def check_quote_schema(self) -> None:
+        """
+        Fail fast on a quotes table still storing dates as strings
+
+        Every quote read and write binds integer day numbers: on a database created
+        before the day-number migration, range filters would silently compare them
+        with ISO strings and return nothing. A missing quotes table is left to create_all.
+
+        Raises:
+            RuntimeError: If quotes.Date is not an INTEGER column
+        """
+        with self.db_manager.read_session() as session:
+            columns: dict[str, str] = {
+                row[1]: row[2]
+                for row in session.connection().exec_driver_sql(f"PRAGMA table_info({QuoteDAO.__tablename__})")
+            }
+        date_type: str | None = columns.get("Date")
+        if date_type is not None and date_type.upper() != "INTEGER":
+            raise RuntimeError(
+                f"{QuoteDAO.__tablename__}.Date is {date_type}, expected INTEGER day numbers: "
+                "run 'uv run python migrate_quote_dates.py' to migrate the database"
+            )
+
+    def ensure_ingestion_tables(self) -> None:
+        """
+        Create the quote_sync_state and dividends tables if missing; fill the sync state from quotes when empty
+
+        Databases created before the sync state existed get one row per ticker
+        with stored quotes (status ok, no attempt recorded); sync state tables
+        created before quote versions existed get the version columns.
+        """
+        with self.db_manager.write_session() as session:
+            connection: Connection = session.connection()
+            DividendDAO.__table__.create(bind=connection, checkfirst=True)
+            QuoteSyncStateDAO.__table__.create(bind=connection, checkfirst=True)
+            columns: set[str] = {
+                row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({QuoteSyncStateDAO.__tablename__})")
+            }
+            if "version" not in columns:
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {QuoteSyncStateDAO.__tablename__} ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+            if "updated_at" not in columns:
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {QuoteSyncStateDAO.__tablename__} ADD COLUMN updated_at DATETIME"
+                )
+            if connection.execute(select(func.count()).select_from(QuoteSyncStateDAO)).scalar_one():
+                return
+
+            backfill = select(QuoteDAO.Ticker, func.max(QuoteDAO.Date), func.count(), literal("ok")).group_by(
+                QuoteDAO.Ticker
+            )
+            result = connection.execute(
+                sqlite_insert(QuoteSyncStateDAO).from_select(
+                    ["ticker", "last_date", "row_count", "last_status"], backfill
+                )
+            )
+        self.logger.info(f"Quote sync state initialized for {max(result.rowcount, 0)} tickers")
+
+    def _bulk_insert_quotes(
+        self, ticker: str, raw_df: DataFrame, on_conflict: Literal["ignore", "update"] = "ignore"
+    ) -> dict[str, int]:
+        """
+        Bulk upsert quotes into the database with INSERT ... ON CONFLICT(Ticker, Date)
+
+        Existing dates are resolved by SQLite on the primary key: DO NOTHING skips them,
+        DO UPDATE (restatement mode) overwrites them with the downloaded values.
 
         Args:
             ticker: ETF ticker symbol
             raw_df: DataFrame with quote data from yfinance
+            on_conflict: "ignore" to keep stored quotes, "update" to overwrite them
+
+        Returns:
+            Dictionary with the number of rows inserted, updated and skipped
+        """
+        normalized: DataFrame = self._normalize_download_frame(ticker, raw_df)
+        dividend_rows: list[tuple[str, str, float]] = self._to_dividend_rows(normalized)
+        quotes_df: DataFrame = self._prepare_quotes_dataframe(normalized)
+        rows: list[tuple[Any, ...]] = self._to_rows(quotes_df)
+
+        # One transaction, one prepared statement executed once per row (serialized writer);
+        # dividends and the sync state are written in the same transaction
+        with self.db_manager.write_session() as session:
+            counts: dict[str, int] = self._write_ticker_quotes(
+                session.connection(), ticker, quotes_df, rows, on_conflict, dividend_rows
+            )
+
+        self._after_quotes_written(ticker, quotes_df, counts)
+        return counts
+
+    def store_staged_quotes(
+        self,
+        frames: dict[str, DataFrame | None],
+        restate: bool = False,
+        failures: dict[str, str] | None = None,
+    ) -> tuple[dict[str, dict[str, int]], dict[str, str]]:
+        """
+        Write the downloaded frames of many tickers in a single transaction (staged commit mode)
+
+        The frames are concatenated into one columnar batch and transformed in one
+        pass; the upserts then run in one write transaction with one savepoint per
+        ticker, so a failing ticker is rolled back alone while the rest commit
+        together (one fsync). Nothing is committed if the process dies midway.
+
+        Args:
+            frames: Dictionary ticker -> downloaded quotes (None or empty when the provider returned nothing)
+            restate: Overwrite stored quotes on conflicting dates instead of skipping them
+            failures: Tickers whose download failed (ticker -> error); their sync state is
+                marked in the same transaction
+
+        Returns:
+            Tuple of (ticker -> inserted/updated/skipped counts, ticker -> error message)
+        """
+        import pandas as pd
+
+        counts: dict[str, dict[str, int]] = {}
+        errors: dict[str, str] = {}
+        on_conflict: Literal["ignore", "update"] = "update" if restate else "ignore"
+
+        # Stage: normalize per ticker (bad frames are isolated here), then one columnar batch
+        empty: list[str] = []
+        normalized: dict[str, DataFrame] = {}
+        dividend_rows: dict[str, list[tuple[str, str, float]]] = {}
+        for ticker, raw_df in frames.items():
+            if raw_df is None or (hasattr(raw_df, "empty") and raw_df.empty):
+                empty.append(ticker)
+                continue
+            try:
+                normalized[ticker] = self._normalize_download_frame(ticker, raw_df)
+                dividend_rows[ticker] = self._to_dividend_rows(normalized[ticker])
+            except Exception as e:
+                normalized.pop(ticker, None)
+                errors[ticker] = f"Invalid quote frame: {e}"
+
+        quotes_df: DataFrame = (
+            self._prepare_quotes_dataframe(pd.concat(normalized.values(), ignore_index=True))
+            if normalized
+            else pd.DataFrame(columns=QUOTE_COLUMNS)
+        )
+        rows: list[tuple[Any, ...]] = self._to_rows(quotes_df)
+        slices: dict[str, slice] = {}
+        offset: int = 0
+        for ticker, frame in normalized.items():
+            slices[ticker] = slice(offset, offset + len(frame))
+            offset += len(frame)
+
+        # Commit: one transaction, one savepoint per ticker
+        with self.db_manager.write_transaction() as connection:
+            for ticker, rows_slice in slices.items():
+                savepoint = connection.begin_nested()
+                try:
+                    counts[ticker] = self._write_ticker_quotes(
+                        connection,
+                        ticker,
+                        quotes_df.iloc[rows_slice],
+                        rows[rows_slice],
+                        on_conflict,
+                        dividend_rows[ticker],
+                    )
+                    savepoint.commit()
+                except Exception as e:
+                    savepoint.rollback()
+                    errors[ticker] = str(e)
+
+            for ticker in empty:
+                if self._record_sync_attempt(connection, ticker, "no_data"):
+                    counts[ticker] = {"inserted": 0, "updated": 0, "skipped": 0}
+                else:
+                    errors[ticker] = f"No historical data available for ticker {ticker}"
+
+            for ticker in [*errors, *(failures or {})]:
+                self._record_sync_attempt(connection, ticker, "error")
+
+        for ticker, rows_slice in slices.items():
+            if ticker in counts:
+                self._after_quotes_written(ticker, quotes_df.iloc[rows_slice], counts[ticker])
+
+        inserted: int = sum(ticker_counts["inserted"] for ticker_counts in counts.values())
+        self.logger.info(
+            f"Staged commit: {inserted} new quotes for {len(counts)} tickers in one transaction "
+            f"({len(errors)} failed)"
+        )
+        for ticker, error in errors.items():
+            self.logger.error(f"Failed to store quotes for {ticker}: {error}")
+        return counts, errors
+
+    def _normalize_download_frame(self, ticker: str, raw_df: DataFrame) -> DataFrame:
+        """
+        Turn a downloaded frame into flat columns with Ticker and integer day-number Date
+
+        Args:
+            ticker: ETF ticker symbol
+            raw_df: DataFrame with quote data from yfinance
+
+        Returns:
+            DataFrame with Date, Ticker and the downloaded price/volume columns
         """
-        from core.database import db
         import pandas as pd
         from pandas import DataFrame as PandasDataFrame
 
@@ -150,49 +882,302 @@ class QuoteService:
         if isinstance(df.columns, pd.MultiIndex):
             df.columns = df.columns.get_level_values(0)
 
-        # Prepare DataFrame for database insertion
         df["Ticker"] = ticker
-        df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d")
+        df["Date"] = pd.to_datetime(df["Date"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+        return df
+
+    @staticmethod
+    def _to_dividend_rows(normalized_df: DataFrame) -> list[tuple[str, str, float]]:
+        """
+        Extract (Ticker, Date, Dividend) rows from the Dividends column of a normalized download
+
+        Args:
+            normalized_df: Frame returned by _normalize_download_frame
+
+        Returns:
+            One tuple per ex-date with a positive dividend (empty if the provider sends no actions)
+        """
+        if "Dividends" not in normalized_df.columns:
+            return []
 
-        # Filter out dates that already exist in the database
-        df = self._filter_existing_quotes(ticker, df)
+        amounts: np.ndarray = normalized_df["Dividends"].to_numpy(dtype=np.float64, na_value=0.0)
+        paid: np.ndarray = amounts > 0
+        if not paid.any():
+            return []
+        tickers: list[str] = normalized_df["Ticker"].to_numpy(dtype=object)[paid].tolist()
+        dates: list[str] = to_date_strings(normalized_df["Date"].to_numpy(dtype=np.int64)[paid])
+        return list(zip(tickers, dates, np.round(amounts[paid], 4).tolist()))
 
-        # If no new quotes to insert, return early
-        if df.empty:
-            self.logger.info("  No new quotes to insert (all dates already exist)")
+    @staticmethod
+    def _to_rows(quotes_df: DataFrame) -> list[tuple[Any, ...]]:
+        """
+        Convert prepared quotes to executemany parameter tuples in QUOTE_COLUMNS order
+
+        Every column is converted once with NumPy to an object array of Python scalars
+        (sqlite3 does not bind NumPy integers); NaN / <NA> become None so they are stored
+        as NULL. No per-row pandas access or dictionaries are involved.
+
+        Args:
+            quotes_df: DataFrame returned by _prepare_quotes_dataframe
+
+        Returns:
+            One tuple per row
+        """
+        columns: list[np.ndarray] = []
+        for name in QUOTE_COLUMNS:
+            series = quotes_df[name]
+            missing: np.ndarray = series.isna().to_numpy()
+            if name == "Ticker":
+                values: np.ndarray = series.to_numpy(dtype=object)
+            elif name in ("Date", "Volume"):
+                values = series.to_numpy(dtype=np.int64, na_value=0).astype(object)
+            else:
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan).astype(object)
+            if missing.any():
+                values[missing] = None
+            columns.append(values)
+        return list(zip(*columns))
+
+    def _write_ticker_quotes(
+        self,
+        connection: Connection,
+        ticker: str,
+        quotes_df: DataFrame,
+        rows: list[tuple[Any, ...]],
+        on_conflict: Literal["ignore", "update"],
+        dividend_rows: list[tuple[str, str, float]] | None = None,
+    ) -> dict[str, int]:
+        """
+        Write one ticker's downloaded quotes and dividends, rewriting restated adjusted closes first
+
+        Args:
+            connection: Connection of the open write transaction
+            ticker: ETF ticker symbol
+            quotes_df: Prepared quotes (_prepare_quotes_dataframe)
+            rows: The same quotes as parameter tuples (_to_rows)
+            on_conflict: "ignore" to keep stored quotes, "update" to overwrite them
+            dividend_rows: (Ticker, Date, Dividend) rows downloaded with the quotes (_to_dividend_rows)
+
+        Returns:
+            Dictionary with the number of rows inserted, updated (including rescaled history) and skipped
+        """
+        rescaled: int | None = self._rewrite_restated_history(connection, ticker, quotes_df)
+        if rescaled is not None:
+            on_conflict = "update"
+        counts: dict[str, int] = self._upsert_quotes(connection, ticker, rows, on_conflict)
+
+        if dividend_rows:
+            cursor = connection.connection.dbapi_connection.cursor()
+            try:
+                cursor.executemany(DIVIDEND_UPSERT_SQL[on_conflict], dividend_rows)
+                written: int = max(cursor.rowcount, 0)
+            finally:
+                cursor.close()
+            self.logger.info(f"  Upserted {written} of {len(dividend_rows)} downloaded dividends for {ticker}")
+
+        # New version for HTTP validators (history rewritten in place keeps last_date and row_count)
+        if rescaled is not None or counts["inserted"] or counts["updated"]:
+            self._touch_sync_state(connection, ticker)
+
+        if rescaled is not None:
+            counts["updated"] += rescaled
+            self.logger.info(
+                f"  Adj Close restated for {ticker}: {counts['updated']} rows rewritten "
+                f"({rescaled} rescaled before the overlap window, {counts['updated'] - rescaled} in it)"
+            )
+        return counts
+
+    def _rewrite_restated_history(self, connection: Connection, ticker: str, quotes_df: DataFrame) -> int | None:
+        """
+        Detect a restated adjusted close on the overlap window and rescale the older history
+
+        The download overlaps the stored quotes by restatement_overlap_days. The
+        stored Adj_Close of those dates is compared vectorized with the downloaded
+        one; after a distribution Yahoo rescales the whole history before the
+        ex-date by the same factor, so the factor observed on the oldest overlap
+        date is applied to every stored row before the window with one UPDATE.
+        The window itself is then overwritten by the upsert.
+
+        Args:
+            connection: Connection of the open write transaction
+            ticker: ETF ticker symbol
+            quotes_df: Prepared quotes (_prepare_quotes_dataframe)
+
+        Returns:
+            Number of rescaled rows before the window, or None if no restatement was detected
+        """
+        if quotes_df.empty:
+            return None
+
+        days: np.ndarray = quotes_df["Date"].to_numpy(dtype=np.int64)
+        adjusted: np.ndarray = quotes_df["Adj_Close"].to_numpy(dtype=np.float64, na_value=np.nan)
+        stmt = (
+            select(QuoteDAO.Date, QuoteDAO.Adj_Close)
+            .where(QuoteDAO.Ticker == ticker, QuoteDAO.Date >= int(days.min()), QuoteDAO.Date <= int(days.max()))
+            .order_by(QuoteDAO.Date)
+        )
+        stored = connection.execute(stmt).all()
+        if not stored:
+            return None
+
+        # Align stored rows with the downloaded ones (both sorted by day)
+        stored_days: np.ndarray = np.fromiter((day for day, _ in stored), dtype=np.int64, count=len(stored))
+        stored_adjusted: np.ndarray = np.array([adjusted for _, adjusted in stored], dtype=np.float64)
+        order: np.ndarray = np.argsort(days, kind="stable")
+        positions: np.ndarray = np.minimum(np.searchsorted(days[order], stored_days), len(days) - 1)
+        matched: np.ndarray = days[order][positions] == stored_days
+        downloaded: np.ndarray = adjusted[order][positions][matched]
+        previous: np.ndarray = stored_adjusted[matched]
+
+        comparable: np.ndarray = ~(np.isnan(downloaded) | np.isnan(previous))
+        diverged: np.ndarray = comparable & (np.abs(downloaded - previous) > self.restatement_tolerance)
+        if not diverged.any():
+            return None
+
+        # Factor of the oldest comparable overlap date: history before the window moves with it
+        first: int = int(np.argmax(comparable))
+        factor: float = float(downloaded[first] / previous[first]) if previous[first] else 1.0
+        self.logger.debug(f"{ticker}: {int(diverged.sum())} overlap rows diverge, factor {factor:.6f}")
+        if abs(factor - 1.0) * previous[first] <= self.restatement_tolerance:
+            return 0
+
+        window_start: int = int(stored_days[matched][first])
+        result = connection.execute(
+            update(QuoteDAO)
+            .where(QuoteDAO.Ticker == ticker, QuoteDAO.Date < window_start)
+            .values(Adj_Close=func.round(QuoteDAO.Adj_Close * factor, 2))
+        )
+        return max(result.rowcount, 0)
+
+    def _upsert_quotes(
+        self,
+        connection: Connection,
+        ticker: str,
+        rows: list[tuple[Any, ...]],
+        on_conflict: Literal["ignore", "update"],
+    ) -> dict[str, int]:
+        """
+        Upsert one ticker's quotes and update its sync state in the caller's transaction
+
+        The rows go straight to the DBAPI cursor: one prepared INSERT ... ON CONFLICT
+        run by executemany, without SQLAlchemy parameter processing per row. DO NOTHING
+        conflicts are not counted by the cursor, so its row count is the number of new
+        rows; in update mode the stored days of the download window are looked up first
+        (primary key range scan) to tell new rows from overwritten ones.
+
+        Args:
+            connection: Connection of the open write transaction
+            ticker: ETF ticker symbol
+            rows: Parameter tuples in QUOTE_COLUMNS order (_to_rows)
+            on_conflict: "ignore" to keep stored quotes, "update" to overwrite them
+
+        Returns:
+            Dictionary with the number of rows inserted, updated and skipped
+        """
+        days: set[int] = {row[1] for row in rows}
+        stored: int = 0
+        if on_conflict == "update" and days:
+            stored_stmt = select(QuoteDAO.Date).where(
+                QuoteDAO.Ticker == ticker, QuoteDAO.Date >= min(days), QuoteDAO.Date <= max(days)
+            )
+            stored = len(days.intersection(connection.execute(stored_stmt).scalars()))
+
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.executemany(QUOTE_UPSERT_SQL[on_conflict], rows)
+            # Summed over the executions; DO NOTHING conflicts are not counted
+            written: int = max(cursor.rowcount, 0)
+        finally:
+            cursor.close()
+
+        inserted: int = written if on_conflict == "ignore" else len(days) - stored
+        self._record_sync_attempt(connection, ticker, "ok", last_day=max(days) if days else None, inserted=inserted)
+
+        updated: int = written - inserted if on_conflict == "update" else 0
+        skipped: int = len(rows) - inserted - updated
+        counts: dict[str, int] = {"inserted": inserted, "updated": updated, "skipped": skipped}
+        self.logger.debug(f"Upserted quotes for {ticker}: {counts}")
+        return counts
+
+    def _after_quotes_written(self, ticker: str, quotes_df: DataFrame, counts: dict[str, int]) -> None:
+        """
+        Bring the columnar store and the series cache in step with committed quotes
+
+        Args:
+            ticker: ETF ticker symbol
+            quotes_df: Prepared quotes of the ticker that were upserted
+            counts: Inserted/updated/skipped counts of the upsert
+        """
+        if not (counts["inserted"] or counts["updated"]):
             return
 
-        # Prepare data for insertion
-        quotes_df = self._prepare_quotes_dataframe(df)
+        # Keep the columnar read store in step with SQLite (a store missing rows is rebuilt, not appended to)
+        if self.quote_store is not None:
+            try:
+                if counts["updated"] or not self._sync_quote_store(ticker, pending_rows=counts["inserted"]):
+                    self._rebuild_quote_store(ticker)
+                else:
+                    self.quote_store.append(ticker, quotes_df)
+            except Exception as e:
+                # SQLite is committed: drop the store so the next read rebuilds it instead of serving stale rows
+                self.logger.error(f"Columnar store update failed for {ticker}, dropping it: {e}")
+                try:
+                    self.quote_store.drop(ticker)
+                except Exception as drop_error:
+                    self.logger.error(f"Cannot drop the columnar store of {ticker}: {drop_error}")
 
-        # Bulk insert using pandas to_sql
-        with self.db_manager.get_session():
-            quotes_df.to_sql(name="quotes", con=db.engine, if_exists="append", index=False)
+        # Cached series for this ticker are now stale
+        if self.cache is not None:
+            self.cache.invalidate(ticker)
 
-    def _filter_existing_quotes(self, ticker: str, df: DataFrame) -> DataFrame:
+    def _sync_quote_store(self, ticker: str, pending_rows: int = 0) -> bool:
         """
-        Filter out quotes that already exist in the database
+        Check a ticker's columnar store against the row count of its sync state
+
+        A store that missed rows (failed append, store created after the ticker was
+        ingested) is rebuilt from SQLite on reads, so a partial history is never served.
 
         Args:
             ticker: ETF ticker symbol
-            df: DataFrame with quote data
+            pending_rows: Rows committed to SQLite but not yet appended to the store
 
         Returns:
-            Filtered DataFrame without existing quotes
+            True if the store matches SQLite (rebuilt on reads when it did not), False when it
+            cannot be checked (no sync state) or, with pending rows, needs a rebuild instead of an append
         """
-        from pandas import DataFrame as PandasDataFrame
+        stmt = select(QuoteSyncStateDAO.row_count).where(QuoteSyncStateDAO.ticker == ticker)
+        with self.db_manager.read_session() as session:
+            row_count: int | None = session.scalar(stmt)
+        if row_count is None:
+            return False
 
-        existing_dates = [
-            row.Date
-            for row in QuoteDAO.query.filter(QuoteDAO.Ticker == ticker, QuoteDAO.Date.in_(df["Date"].tolist())).all()
-        ]
+        _, stored_rows = self.quote_store.get_metadata(ticker)
+        if stored_rows + pending_rows == row_count:
+            return True
+        if pending_rows:
+            return False
 
-        if existing_dates:
-            self.logger.debug(f"Filtering out {len(existing_dates)} existing quotes")
-            filtered_df = df[~df["Date"].isin(existing_dates)]
-            return PandasDataFrame(data=filtered_df)
+        self.logger.warning(f"Columnar store of {ticker} has {stored_rows} of {row_count} quotes: rebuilding")
+        self._rebuild_quote_store(ticker)
+        return True
 
-        return df
+    def _rebuild_quote_store(self, ticker: str) -> None:
+        """
+        Rewrite the columnar store for a ticker from SQLite (after restated history)
+
+        Args:
+            ticker: ETF ticker symbol
+        """
+        import pandas as pd
+
+        if self.quote_store is None:
+            return
+
+        columns = [getattr(QuoteDAO, column) for column in QUOTE_COLUMNS[1:]]
+        stmt = select(*columns).where(QuoteDAO.Ticker == ticker).order_by(QuoteDAO.Date)
+        with self.db_manager.read_session() as session:
+            rows = session.execute(stmt).all()
+        self.quote_store.rebuild(ticker, pd.DataFrame(rows, columns=QUOTE_COLUMNS[1:]))
 
     def _prepare_quotes_dataframe(self, df: DataFrame) -> DataFrame:
         """
@@ -218,7 +1203,7 @@ class QuoteService:
         df["Volume"] = df["Volume"].replace([float("inf"), float("-inf")], None).astype("Int64")
 
         # Select only the columns we need
-        result = df[["Ticker", "Date", "Open", "High", "Low", "Close", "Adj_Close", "Volume"]].copy()
+        result = df[QUOTE_COLUMNS].copy()
         return PandasDataFrame(result)
 
     def _safe_float(self, value: Any) -> float | None:
@@ -24,21 +24,30 @@ class UpdateQuotesCronJob(CronJob):
     Scheduled to run at 11 PM Monday-Friday by default.
     """
 
-    def __init__(self, db_manager: DatabaseManager, app: Flask) -> None:
+    def __init__(
+        self, db_manager: DatabaseManager, app: Flask, etf_service: EtfService | None = None, resume: bool = False
+    ) -> None:
         """
         Initialize the UpdateQuotesCronJob.
 
         Args:
             db_manager: DatabaseManager instance for database operations
             app: Flask application instance for context
+            etf_service: Optional shared EtfService (so quote writes invalidate the shared quote cache);
+                a private one is created when omitted
+            resume: Continue the latest unfinished update run (pending/failed ETFs only) instead of starting over
         """
         super().__init__()
         self.db_manager = db_manager
         self.app = app
+        self.resume = resume
 
         # Initialize services
-        self.quote_service = QuoteService(db_manager=db_manager)
-        self.etf_service = EtfService(db_manager=db_manager, quote_service=self.quote_service)
+        if etf_service is None:
+            quote_service = QuoteService(db_manager=db_manager)
+            etf_service = EtfService(db_manager=db_manager, quote_service=quote_service)
+        self.etf_service = etf_service
+        self.quote_service = etf_service.quote_service
 
         self._logger.info("UpdateQuotesCronJob initialized")
 
@@ -53,7 +62,7 @@ class UpdateQuotesCronJob(CronJob):
             # Execute within Flask application context
             with self.app.app_context():
                 # Use the EtfService to update all ETF quotes
-                result = self.etf_service.update_all_etf_quotes()
+                result = self.etf_service.update_all_etf_quotes(resume=self.resume, source="cron")
 
             # Log the results
             if result["success"]:
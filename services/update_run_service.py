@@ -0,0 +1,183 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Checkpointed bulk quote update runs.
+
+Every bulk update (cron job, API, SSE stream) is recorded as a run with one
+row per ticker (pending, ok, error). Tickers are checkpointed as soon as
+they are stored, so after a restart (deploy, crash, Ctrl+C, closed SSE
+stream) a resumed run only processes the tickers still pending or failed.
+A run is resumable only for the download end date it was started with:
+once a new session is due every ticker needs an update again.
+"""
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from core.database import DatabaseManager
+from core.day_number import to_day_number
+from core.log import LoggerManager
+from models import QuoteUpdateRunDAO, QuoteUpdateRunTickerDAO
+
+
+class UpdateRunService:
+    """Domain Service persisting bulk quote update runs and their per-ticker checkpoints"""
+
+    def __init__(self, db_manager: DatabaseManager) -> None:
+        """
+        Initialize UpdateRunService
+
+        Args:
+            db_manager: DatabaseManager instance for session handling
+        """
+        self.db_manager = db_manager
+        self.logger = LoggerManager.get_logger(name=self.__class__.__name__)
+
+    def ensure_tables(self) -> None:
+        """Create the quote_update_runs and quote_update_run_tickers tables if missing"""
+        with self.db_manager.write_session() as session:
+            connection = session.connection()
+            QuoteUpdateRunDAO.__table__.create(bind=connection, checkfirst=True)
+            QuoteUpdateRunTickerDAO.__table__.create(bind=connection, checkfirst=True)
+
+    def start(
+        self, tickers: list[str], end_date: datetime, source: str, resume: bool = False
+    ) -> tuple[int, list[str], bool]:
+        """
+        Start a new run, or resume the latest unfinished one
+
+        With resume, the latest run for the same end date is continued: only its pending
+        or failed tickers (in the given order, dropping tickers no longer requested) are
+        returned, none when that run has nothing left. Without a run for the end date,
+        or without resume, a new run with every ticker pending is created.
+
+        Args:
+            tickers: Tickers of a full update
+            end_date: Download end date of the update
+            source: Caller (cron, api, sse)
+            resume: Continue the latest unfinished run when there is one
+
+        Returns:
+            Tuple of (run id, tickers to process, whether an unfinished run was resumed)
+        """
+        end_day: int = to_day_number(end_date)
+        now: datetime = datetime.now()
+
+        with self.db_manager.write_session() as session:
+            if resume:
+                run_id: int | None = session.scalar(
+                    select(QuoteUpdateRunDAO.id)
+                    .where(QuoteUpdateRunDAO.end_date == end_day)
+                    .order_by(QuoteUpdateRunDAO.id.desc())
+                    .limit(1)
+                )
+                if run_id is not None:
+                    unfinished: set[str] = set(
+                        session.scalars(
+                            select(QuoteUpdateRunTickerDAO.ticker).where(
+                                QuoteUpdateRunTickerDAO.run_id == run_id,
+                                QuoteUpdateRunTickerDAO.status != "ok",
+                            )
+                        )
+                    )
+                    pending: list[str] = [ticker for ticker in tickers if ticker in unfinished]
+                    if pending:
+                        session.execute(
+                            update(QuoteUpdateRunDAO)
+                            .where(QuoteUpdateRunDAO.id == run_id)
+                            .values(source=source, finished_at=None)
+                        )
+                    self.logger.info(
+                        f"Resuming update run {run_id}: {len(pending)} of {len(tickers)} tickers pending or failed"
+                    )
+                    return run_id, pending, True
+
+            run: QuoteUpdateRunDAO = QuoteUpdateRunDAO(source=source, end_date=end_day, started_at=now)
+            session.add(run)
+            session.flush()
+            run_id = run.id
+            if tickers:
+                session.execute(
+                    sqlite_insert(QuoteUpdateRunTickerDAO),
+                    [{"run_id": run_id, "ticker": ticker, "status": "pending"} for ticker in tickers],
+                )
+
+        self.logger.info(f"Started update run {run_id} ({source}) for {len(tickers)} tickers")
+        return run_id, list(tickers), False
+
+    def checkpoint(self, run_id: int, results: dict[str, str | None]) -> None:
+        """
+        Record the outcome of processed tickers
+
+        Args:
+            run_id: Run id returned by start()
+            results: Ticker -> error message (None on success)
+        """
+        if not results:
+            return
+        now: datetime = datetime.now()
+        with self.db_manager.write_session() as session:
+            session.execute(
+                update(QuoteUpdateRunTickerDAO),
+                [
+                    {
+                        "run_id": run_id,
+                        "ticker": ticker,
+                        "status": "ok" if error is None else "error",
+                        "error": error,
+                        "updated_at": now,
+                    }
+                    for ticker, error in results.items()
+                ],
+            )
+
+    def get_counts(self, run_id: int) -> dict[str, int]:
+        """
+        Return the number of tickers of a run in each status
+
+        Args:
+            run_id: Run id returned by start()
+
+        Returns:
+            Dictionary with the pending, ok and error ticker counts
+        """
+        with self.db_manager.read_session() as session:
+            rows = session.execute(
+                select(QuoteUpdateRunTickerDAO.status, func.count())
+                .where(QuoteUpdateRunTickerDAO.run_id == run_id)
+                .group_by(QuoteUpdateRunTickerDAO.status)
+            ).all()
+            return {"pending": 0, "ok": 0, "error": 0, **{status: count for status, count in rows}}
+
+    def get_errors(self, run_id: int) -> dict[str, str]:
+        """
+        Return the failed tickers of a run
+
+        Args:
+            run_id: Run id returned by start()
+
+        Returns:
+            Dictionary ticker -> error message
+        """
+        with self.db_manager.read_session() as session:
+            rows = session.execute(
+                select(QuoteUpdateRunTickerDAO.ticker, QuoteUpdateRunTickerDAO.error).where(
+                    QuoteUpdateRunTickerDAO.run_id == run_id, QuoteUpdateRunTickerDAO.status == "error"
+                )
+            ).all()
+            return {ticker: error or "" for ticker, error in rows}
+
+    def finish(self, run_id: int) -> None:
+        """
+        Mark a run as finished (failed tickers stay resumable)
+
+        Args:
+            run_id: Run id returned by start()
+        """
+        with self.db_manager.write_session() as session:
+            session.execute(
+                update(QuoteUpdateRunDAO).where(QuoteUpdateRunDAO.id == run_id).values(finished_at=datetime.now())
+            )
+        self.logger.info(f"Update run {run_id} finished")
@@ -0,0 +1,161 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""
+Shared fixtures: a Flask app on a temporary SQLite database, the quote
+services on top of it and an in-memory quote provider.
+"""
+from __future__ import annotations
+import time
+from datetime import datetime
+from typing import Callable, Iterator
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask
+from pandas import DataFrame
+from core.config import DatabaseConfig
+from core.database import DatabaseManager, db
+from models import EtfDAO
+from services import EtfService, QuoteService, UpdateRunService
+
+
+class StaticQuoteProvider:
+    """QuoteProvider serving in-memory frames and recording every call"""
+
+    def __init__(self, frames: dict[str, DataFrame] | None = None, max_concurrency: int = 1) -> None:
+        """
+        Initialize StaticQuoteProvider
+
+        Args:
+            frames: Ticker -> full quote history (Date index, provider columns)
+            max_concurrency: Maximum concurrent downloads advertised to the engine
+        """
+        self.frames: dict[str, DataFrame] = dict(frames or {})
+        self.max_concurrency = max_concurrency
+        self.failing: dict[str, Exception] = {}
+        self.delays: dict[str, float] = {}
+        self.calls: list[tuple[list[str], datetime, datetime]] = []
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, DataFrame]:
+        """Return the rows of every known ticker in [start, end) after their delay; raise for tickers in failing"""
+        self.calls.append((list(tickers), start, end))
+        time.sleep(max((self.delays.get(ticker, 0.0) for ticker in tickers), default=0.0))
+        for ticker in tickers:
+            if ticker in self.failing:
+                raise self.failing[ticker]
+        frames: dict[str, DataFrame] = {}
+        for ticker in tickers:
+            frame: DataFrame | None = self.frames.get(ticker)
+            if frame is not None:
+                frame = frame.loc[(frame.index >= start) & (frame.index < end)]
+                if not frame.empty:
+                    frames[ticker] = frame
+        return frames
+
+
+def make_quotes(start: str, periods: int, close: float = 100.0, step: float = 1.0, adjust: float = 1.0) -> DataFrame:
+    """
+    Build business-day quotes shaped like a single-ticker download
+
+    Args:
+        start: First date (YYYY-MM-DD)
+        periods: Number of business days
+        close: First close
+        step: Close increment per day
+        adjust: Adj Close / Close ratio
+
+    Returns:
+        Frame with a Date index and Open, High, Low, Close, Adj Close, Volume columns
+    """
+    index: pd.DatetimeIndex = pd.bdate_range(start, periods=periods, name="Date")
+    closes: np.ndarray = close + step * np.arange(periods)
+    return DataFrame(
+        {
+            "Open": closes,
+            "High": closes,
+            "Low": closes,
+            "Close": closes,
+            "Adj Close": np.round(closes * adjust, 2),
+            "Volume": 1000,
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def quotes() -> Callable[..., DataFrame]:
+    """Quote frame factory (see make_quotes)"""
+    return make_quotes
+
+
+@pytest.fixture
+def app(tmp_path) -> Iterator[Flask]:
+    """Flask app bound to a fresh SQLite file, inside an app context"""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'test.db'}"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def db_manager(app: Flask) -> DatabaseManager:
+    """DatabaseManager with the default SQLite pragmas"""
+    db_manager = DatabaseManager(db_instance=db)
+    db_manager.configure_sqlite(DatabaseConfig())
+    return db_manager
+
+
+@pytest.fixture
+def provider() -> StaticQuoteProvider:
+    """Empty in-memory quote provider"""
+    return StaticQuoteProvider()
+
+
+@pytest.fixture
+def quote_service(db_manager: DatabaseManager, provider: StaticQuoteProvider) -> QuoteService:
+    """QuoteService on the test database, downloading from the in-memory provider"""
+    quote_service = QuoteService(db_manager, provider=provider, restatement_overlap_days=0)
+    quote_service.ensure_ingestion_tables()
+    return quote_service
+
+
+@pytest.fixture
+def run_service(db_manager: DatabaseManager) -> UpdateRunService:
+    """UpdateRunService with its tables"""
+    run_service = UpdateRunService(db_manager)
+    run_service.ensure_tables()
+    return run_service
+
+
+@pytest.fixture
+def etf_service(db_manager: DatabaseManager, quote_service: QuoteService, run_service: UpdateRunService) -> EtfService:
+    """EtfService with checkpointed runs"""
+    return EtfService(db_manager, quote_service, run_service=run_service)
+
+
+@pytest.fixture
+def add_etfs(db_manager: DatabaseManager) -> Callable[[list[str]], None]:
+    """Insert minimal ETF rows for the given tickers"""
+
+    def add(tickers: list[str]) -> None:
+        with db_manager.write_session() as session:
+            for ticker in tickers:
+                session.add(
+                    EtfDAO(
+                        ticker=ticker,
+                        name=f"ETF {ticker}",
+                        isin=f"IE{ticker}"[:15],
+                        launchDate="2010-01-01",
+                        currency="EUR",
+                        dividendType="Accumulazione",
+                    )
+                )
+
+    return add
@@ -0,0 +1,149 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the memory-mapped columnar quote store"""
+import numpy as np
+import pandas as pd
+import pytest
+from pandas import DataFrame
+from dto import QuotePeriod
+from services import ColumnarQuoteStore
+from services.columnar_quote_store import VOLUME_MISSING
+
+
+def frame(days: list[int], volumes: list[int | None] | None = None) -> DataFrame:
+    """Quotes with Close = day number (day numbers as Date)"""
+    return DataFrame(
+        {
+            "Date": days,
+            "Open": 1.0,
+            "High": 1.0,
+            "Low": 1.0,
+            "Close": [float(day) for day in days],
+            "Adj_Close": 1.0,
+            "Volume": pd.array(volumes if volumes is not None else [100] * len(days), dtype="Int64"),
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path) -> ColumnarQuoteStore:
+    """Empty store in a temporary directory"""
+    return ColumnarQuoteStore(tmp_path / "columnar")
+
+
+class TestColumnarQuoteStore:
+    """Appends, range reads and cache invalidation"""
+
+    def test_range_read_is_exclusive_of_the_start_day(self, store):
+        store.append("SWDA.MI", frame([10, 11, 12, 13]))
+
+        columns = store.read_range("SWDA.MI", start_day=11)
+
+        assert columns["Date"].tolist() == [12, 13]
+        assert columns["Close"].tolist() == [12.0, 13.0]
+        assert store.get_metadata("SWDA.MI") == (13, 4)
+
+    def test_append_keeps_only_newer_sorted_unique_rows(self, store):
+        store.append("SWDA.MI", frame([12, 10, 11, 11]))
+
+        assert store.append("SWDA.MI", frame([9, 11, 13])) == 1
+        assert store.read_range("SWDA.MI")["Date"].tolist() == [10, 11, 12, 13]
+
+    def test_unknown_ticker_reads_empty(self, store):
+        assert len(store.read_range("NOPE.MI")["Date"]) == 0
+        assert store.get_metadata("NOPE.MI") == (None, 0)
+
+    def test_missing_volume_is_the_sentinel(self, store):
+        store.append("SWDA.MI", frame([10, 11, 12], volumes=[5, None, 0]))
+
+        assert store.read_range("SWDA.MI", columns=("Volume",))["Volume"].tolist() == [5, VOLUME_MISSING, 0]
+
+    def test_reader_sees_appends_of_another_instance(self, store, tmp_path):
+        writer = ColumnarQuoteStore(tmp_path / "columnar")
+        writer.append("SWDA.MI", frame([10, 11]))
+        assert store.get_metadata("SWDA.MI") == (11, 2)
+
+        writer.append("SWDA.MI", frame([12]))
+
+        assert store.get_metadata("SWDA.MI") == (12, 3)
+        assert store.read_range("SWDA.MI")["Close"].tolist() == [10.0, 11.0, 12.0]
+
+    def test_reader_sees_rebuilds_of_another_instance(self, store, tmp_path):
+        writer = ColumnarQuoteStore(tmp_path / "columnar")
+        writer.append("SWDA.MI", frame([10, 11]))
+        assert store.get_metadata("SWDA.MI") == (11, 2)
+
+        # Same row count and size: only the file identity changes
+        writer.rebuild("SWDA.MI", frame([20, 21]))
+
+        assert store.read_range("SWDA.MI")["Date"].tolist() == [20, 21]
+
+    def test_interrupted_append_is_repaired(self, store, tmp_path):
+        store.append("SWDA.MI", frame([10, 11]))
+        # Value columns written, date column (the commit) not
+        with open(tmp_path / "columnar" / "SWDA.MI" / "Close.f64", "ab") as column_file:
+            column_file.write(np.array([99.0]).tobytes())
+
+        store.append("SWDA.MI", frame([12]))
+
+        assert store.read_range("SWDA.MI")["Close"].tolist() == [10.0, 11.0, 12.0]
+
+    def test_path_like_tickers_are_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.append("../etc", frame([1]))
+
+    def test_drop_removes_the_ticker(self, store):
+        store.append("SWDA.MI", frame([10, 11]))
+
+        store.drop("SWDA.MI")
+
+        assert store.get_metadata("SWDA.MI") == (None, 0)
+
+
+class TestQuoteServiceColumnarReads:
+    """QuoteService never serves a store that is missing rows of SQLite"""
+
+    def test_store_created_after_ingestion_is_rebuilt_before_reading(self, quote_service, store, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+        quote_service.quote_store = store
+
+        dates, _ = quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)
+
+        assert len(dates) == 20 and store.get_metadata("SWDA.MI")[1] == 20
+
+    def test_partial_store_is_rebuilt_instead_of_appended_to(self, quote_service, store, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+        quote_service.quote_store = store
+
+        # Only the 5 new sessions are downloaded
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-29", 5, close=120.0))
+
+        assert store.get_metadata("SWDA.MI")[1] == 25
+        assert store.read_range("SWDA.MI")["Close"].tolist() == [100.0 + day for day in range(25)]
+
+    def test_failed_append_is_repaired_on_the_next_read(self, quote_service, store, quotes, monkeypatch):
+        quote_service.quote_store = store
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(store, "append", fail)
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 25))
+        monkeypatch.undo()
+
+        assert counts["inserted"] == 5
+        assert len(quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)[0]) == 25
+        assert store.get_metadata("SWDA.MI")[1] == 25
+
+    def test_store_in_sync_is_appended_to(self, quote_service, store, quotes, monkeypatch):
+        quote_service.quote_store = store
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+        rebuilds: list[str] = []
+        monkeypatch.setattr(store, "rebuild", lambda ticker, quotes_df: rebuilds.append(ticker))
+
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 25))
+
+        assert rebuilds == [] and store.get_metadata("SWDA.MI")[1] == 25
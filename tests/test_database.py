@@ -0,0 +1,119 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the SQLite pragmas, health check and read/write sessions of DatabaseManager"""
+import pytest
+from sqlalchemy import Engine, event, select, text
+from sqlalchemy.exc import OperationalError
+from core.config import DatabaseConfig
+from core.database import DatabaseManager, db
+from models import EtfDAO
+
+
+def pragma(engine: Engine, name: str):
+    """Value of a PRAGMA on a new connection of the engine"""
+    engine.dispose()
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSqlitePragmas:
+    """configure_sqlite applies the configured pragmas to every new connection"""
+
+    def test_pragmas_are_applied_on_new_writer_connections(self, app):
+        db_manager = DatabaseManager(db_instance=db)
+        db_manager.configure_sqlite(DatabaseConfig(synchronous="FULL", busy_timeout=1234))
+
+        assert pragma(db.engine, "journal_mode") == "wal"
+        assert pragma(db.engine, "synchronous") == 2
+        assert pragma(db.engine, "busy_timeout") == 1234
+
+    def test_pragmas_are_applied_on_new_reader_connections(self, app):
+        db_manager = DatabaseManager(db_instance=db)
+        db_manager.configure_sqlite(DatabaseConfig(synchronous="FULL", busy_timeout=1234))
+
+        assert db_manager.reader_engine is not db.engine
+        # journal_mode is a property of the file: readers see the writer's WAL
+        assert pragma(db_manager.reader_engine, "journal_mode") == "wal"
+        assert pragma(db_manager.reader_engine, "synchronous") == 2
+        assert pragma(db_manager.reader_engine, "busy_timeout") == 1234
+
+    def test_get_pragmas_reports_configured_names(self, db_manager):
+        assert db_manager.get_pragmas() == {
+            "busy_timeout": 5000,
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -65536,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+        }
+
+
+class TestHealthCheck:
+    """Pragmas in effect compared with the configuration"""
+
+    def test_healthy_database(self, db_manager):
+        health = db_manager.health_check()
+
+        assert health["status"] == "ok" and health["mismatches"] == {}
+        assert health["pragmas"]["journal_mode"] == "WAL"
+        assert health["pragmas"]["busy_timeout"] == 5000
+
+    def test_pragma_not_in_effect_is_degraded(self, db_manager):
+        def override(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA synchronous = FULL")
+
+        # Runs after the configured pragmas on every new connection
+        event.listen(db.engine, "connect", override)
+        try:
+            db.engine.dispose()
+            health = db_manager.health_check()
+        finally:
+            event.remove(db.engine, "connect", override)
+
+        assert health["status"] == "degraded"
+        assert health["mismatches"] == {"synchronous": {"configured": "NORMAL", "in_effect": "FULL"}}
+
+
+class TestSessions:
+    """Read-only reader engine and serialized writer session"""
+
+    def test_read_session_cannot_write(self, db_manager, add_etfs):
+        add_etfs(["SWDA.MI"])
+
+        with db_manager.read_session() as session:
+            with pytest.raises(OperationalError, match="readonly"):
+                session.execute(text("DELETE FROM etfs"))
+            with pytest.raises(OperationalError, match="readonly"):
+                session.get(EtfDAO, "SWDA.MI").name = "Renamed"
+                session.commit()
+
+        with db_manager.read_session() as session:
+            assert session.get(EtfDAO, "SWDA.MI").name == "ETF SWDA.MI"
+
+    def test_reader_engine_opens_the_file_read_only(self, db_manager):
+        url = db_manager.reader_engine.url
+
+        assert url.query.get("mode") == "ro" and url.query.get("uri") == "true"
+
+    def test_write_session_commits_and_readers_see_it(self, db_manager, add_etfs):
+        add_etfs(["SWDA.MI"])
+
+        with db_manager.write_session() as session:
+            session.get(EtfDAO, "SWDA.MI").name = "Renamed"
+
+        with db_manager.read_session() as session:
+            assert session.scalar(select(EtfDAO.name).where(EtfDAO.ticker == "SWDA.MI")) == "Renamed"
+
+    def test_write_session_rolls_back_on_error(self, db_manager, add_etfs):
+        add_etfs(["SWDA.MI"])
+
+        with pytest.raises(RuntimeError):
+            with db_manager.write_session() as session:
+                session.get(EtfDAO, "SWDA.MI").name = "Renamed"
+                session.flush()
+                raise RuntimeError("abort")
+
+        with db_manager.read_session() as session:
+            assert session.get(EtfDAO, "SWDA.MI").name == "ETF SWDA.MI"
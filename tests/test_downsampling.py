@@ -0,0 +1,49 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for Largest-Triangle-Three-Buckets downsampling"""
+import numpy as np
+import pytest
+from core.downsampling import lttb_indices
+
+
+@pytest.fixture
+def walk() -> tuple[np.ndarray, np.ndarray]:
+    """Random walk over 5000 day numbers"""
+    rng = np.random.default_rng(42)
+    return np.arange(5000, dtype=np.int64) + 19000, 100 + np.cumsum(rng.normal(size=5000))
+
+
+class TestLttbIndices:
+    """Selected indices of lttb_indices"""
+
+    @pytest.mark.parametrize("threshold", [3, 10, 600, 4999])
+    def test_output_length_equals_points(self, walk, threshold):
+        x, y = walk
+
+        assert len(lttb_indices(x, y, threshold)) == threshold
+
+    def test_endpoints_are_kept(self, walk):
+        x, y = walk
+        indices = lttb_indices(x, y, 100)
+
+        assert indices[0] == 0 and indices[-1] == len(y) - 1
+
+    def test_indices_are_strictly_increasing(self, walk):
+        x, y = walk
+
+        assert np.all(np.diff(lttb_indices(x, y, 250)) > 0)
+
+    def test_spike_is_kept(self):
+        x = np.arange(1000)
+        y = np.zeros(1000)
+        y[537] = 50.0
+
+        assert 537 in lttb_indices(x, y, 20)
+
+    @pytest.mark.parametrize("threshold", [2, 1000, 5000])
+    def test_short_series_or_small_threshold_is_not_downsampled(self, threshold):
+        x = np.arange(1000)
+
+        assert np.array_equal(lttb_indices(x, np.sin(x), threshold), np.arange(1000))
@@ -0,0 +1,64 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the rule-based exchange calendars"""
+from datetime import date
+import pytest
+from core.exchange_calendar import BORSA_ITALIANA, WEEKDAYS, easter_sunday, get_calendar
+
+
+@pytest.mark.parametrize(
+    "year, easter",
+    [(2000, date(2000, 4, 23)), (2019, date(2019, 4, 21)), (2024, date(2024, 3, 31)), (2025, date(2025, 4, 20))],
+)
+def test_easter_sunday(year, easter):
+    assert easter_sunday(year) == easter
+
+
+class TestBorsaItaliana:
+    """Sessions and closures of Borsa Italiana"""
+
+    @pytest.mark.parametrize(
+        "holiday",
+        [
+            date(2024, 3, 29),  # Good Friday
+            date(2024, 4, 1),  # Easter Monday
+            date(2024, 8, 15),  # Ferragosto
+            date(2024, 12, 24),
+            date(2024, 12, 25),
+            date(2024, 12, 26),
+            date(2025, 1, 1),
+        ],
+    )
+    def test_holidays_are_not_sessions(self, holiday):
+        assert not BORSA_ITALIANA.is_session(holiday)
+        assert WEEKDAYS.is_session(holiday)
+
+    def test_weekends_are_not_sessions(self):
+        assert not BORSA_ITALIANA.is_session(date(2024, 1, 6))
+        assert not BORSA_ITALIANA.is_session(date(2024, 1, 7))
+        assert BORSA_ITALIANA.is_session(date(2024, 1, 8))
+
+    def test_next_session_skips_weekends_and_holidays(self):
+        assert BORSA_ITALIANA.next_session(date(2024, 1, 8)) == date(2024, 1, 8)
+        assert BORSA_ITALIANA.next_session(date(2024, 3, 29)) == date(2024, 4, 2)
+        assert BORSA_ITALIANA.next_session(date(2024, 12, 24)) == date(2024, 12, 27)
+        assert WEEKDAYS.next_session(date(2024, 12, 24)) == date(2024, 12, 24)
+
+    def test_has_session_is_end_exclusive(self):
+        assert not BORSA_ITALIANA.has_session(date(2024, 12, 24), date(2024, 12, 27))
+        assert BORSA_ITALIANA.has_session(date(2024, 12, 24), date(2024, 12, 28))
+        assert not BORSA_ITALIANA.has_session(date(2024, 1, 10), date(2024, 1, 10))
+
+
+class TestGetCalendar:
+    """Calendar selection by ticker suffix"""
+
+    @pytest.mark.parametrize("ticker", ["SWDA.MI", "swda.mi"])
+    def test_milan_tickers_use_borsa_italiana(self, ticker):
+        assert get_calendar(ticker) is BORSA_ITALIANA
+
+    @pytest.mark.parametrize("ticker", ["VWCE.DE", "SPY", ""])
+    def test_other_tickers_fall_back_to_weekdays(self, ticker):
+        assert get_calendar(ticker) is WEEKDAYS
@@ -0,0 +1,118 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the quote ingestion engine and its sinks"""
+from datetime import datetime
+import pandas as pd
+import pytest
+from core.exchange_calendar import next_download_start
+from dto import QuotePeriod
+from services.ingestion_engine import CsvQuoteSink, QuoteIngestionEngine, SqliteQuoteSink
+
+END_DATE = datetime(2024, 1, 20)  # Saturday: the last session downloaded is Friday 2024-01-19
+
+
+@pytest.fixture
+def sink(tmp_path) -> CsvQuoteSink:
+    """CSV sink in a temporary directory ending on END_DATE"""
+    return CsvQuoteSink(tmp_path / "quotes", end_date=END_DATE)
+
+
+@pytest.fixture(params=["asyncio", "threads"])
+def concurrency(request) -> str:
+    """Every engine concurrency primitive"""
+    return request.param
+
+
+class TestNextDownloadStart:
+    """Up-to-date cutoff shared by every sink"""
+
+    def test_day_after_last_date_when_a_session_is_missing(self):
+        assert next_download_start("SWDA.MI", datetime(2024, 1, 17), END_DATE) == datetime(2024, 1, 18)
+
+    def test_up_to_date_when_the_next_session_is_the_end_date(self):
+        assert next_download_start("SWDA.MI", datetime(2024, 1, 18), datetime(2024, 1, 19)) is None
+
+    def test_up_to_date_over_a_weekend(self):
+        assert next_download_start("SWDA.MI", datetime(2024, 1, 19), datetime(2024, 1, 22)) is None
+        assert next_download_start("SWDA.MI", datetime(2024, 1, 19), datetime(2024, 1, 23)) == datetime(2024, 1, 20)
+
+
+class TestQuoteIngestionEngine:
+    """Planning, batching, storing and progress reports"""
+
+    def test_full_history_then_nothing_to_do(self, provider, sink, quotes, concurrency):
+        provider.frames = {"A.MI": quotes("2024-01-01", 30), "B.MI": quotes("2024-01-08", 30)}
+        engine = QuoteIngestionEngine(provider, sink, batch_size=2, concurrency=concurrency)
+
+        counts, errors, timings = engine.run(["A.MI", "B.MI"])
+
+        assert errors == {}
+        assert counts["A.MI"]["inserted"] == 15 and counts["B.MI"]["inserted"] == 10
+        assert len(provider.calls) == 1 and sorted(provider.calls[0][0]) == ["A.MI", "B.MI"]
+        assert set(timings) == {"A.MI", "B.MI"}
+        assert len(pd.read_csv(sink.quotes_dir / "A.MI.csv")) == 15
+
+        provider.calls.clear()
+        counts, errors, _ = engine.run(["A.MI", "B.MI"])
+
+        assert provider.calls == []
+        assert counts == {ticker: {"inserted": 0, "updated": 0, "skipped": 0} for ticker in ("A.MI", "B.MI")}
+
+    def test_tickers_are_grouped_by_start_date(self, provider, tmp_path, quotes, concurrency):
+        provider.frames = {ticker: quotes("2024-01-01", 30) for ticker in ("A.MI", "B.MI", "C.MI")}
+        QuoteIngestionEngine(provider, CsvQuoteSink(tmp_path, end_date=datetime(2024, 1, 10))).run(["A.MI"])
+        provider.calls.clear()
+
+        engine = QuoteIngestionEngine(provider, CsvQuoteSink(tmp_path, end_date=END_DATE), concurrency=concurrency)
+        counts, _, _ = engine.run(["A.MI", "B.MI", "C.MI"])
+
+        starts = {tuple(tickers): start for tickers, start, _ in provider.calls}
+        assert starts[("A.MI",)] == datetime(2024, 1, 10)
+        assert starts[("B.MI",)] == starts[("C.MI",)] == datetime(1970, 1, 1)
+        assert counts["A.MI"]["inserted"] == 8 and counts["B.MI"]["inserted"] == 15
+
+    def test_failed_batches_are_reported_per_ticker(self, provider, sink, quotes, concurrency):
+        provider.frames = {"A.MI": quotes("2024-01-01", 30)}
+        provider.failing = {"B.MI": ConnectionError("boom")}
+        engine = QuoteIngestionEngine(provider, sink, concurrency=concurrency, max_concurrency=2)
+
+        counts, errors, _ = engine.run(["A.MI", "B.MI", "C.MI"])
+
+        assert set(counts) == {"A.MI"}
+        assert errors["B.MI"] == "boom"
+        # Nothing downloaded for a ticker without a CSV file
+        assert "No historical data" in errors["C.MI"]
+
+    def test_progress_covers_every_ticker_once(self, provider, sink, quotes, concurrency):
+        provider.frames = {ticker: quotes("2024-01-01", 30) for ticker in ("A.MI", "B.MI", "C.MI")}
+        provider.failing = {"C.MI": ConnectionError("boom")}
+        reported_counts, reported_errors = [], []
+
+        def on_progress(counts, errors):
+            reported_counts.extend(counts)
+            reported_errors.extend(errors)
+
+        QuoteIngestionEngine(provider, sink, concurrency=concurrency).run(["A.MI", "B.MI", "C.MI"], on_progress)
+
+        assert sorted(reported_counts) == ["A.MI", "B.MI"]
+        assert reported_errors == ["C.MI"]
+
+
+class TestSqliteQuoteSink:
+    """Engine runs against the quotes table"""
+
+    @pytest.mark.parametrize("staged", [False, True])
+    def test_quotes_are_stored_and_progress_follows_the_writes(self, quote_service, provider, quotes, staged):
+        provider.frames = {"A.MI": quotes("2024-01-01", 30), "B.MI": quotes("2024-01-01", 30)}
+        provider.failing = {"C.MI": ConnectionError("boom")}
+        reported: list[str] = []
+        engine = QuoteIngestionEngine(provider, SqliteQuoteSink(quote_service, staged=staged), batch_size=2)
+
+        counts, errors, _ = engine.run(["A.MI", "B.MI", "C.MI"], lambda done, failed: reported.extend(done))
+
+        assert counts["A.MI"]["inserted"] == counts["B.MI"]["inserted"] == 30
+        assert set(errors) == {"C.MI"}
+        assert sorted(reported) == ["A.MI", "B.MI"]
+        assert len(quote_service.get_quote_series("B.MI", QuotePeriod.MAX)[0]) == 30
@@ -0,0 +1,118 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the write-invalidated quote series cache"""
+from dto import QuotePeriod
+from services import QuoteCache
+
+
+def series(size: int) -> tuple[list[str], list[float]]:
+    """(dates, closes) series of the given length"""
+    return [f"2024-01-{day:02d}" for day in range(1, size + 1)], [float(day) for day in range(size)]
+
+
+class TestQuoteCache:
+    """LRU eviction, ticker invalidation and counters"""
+
+    def test_get_returns_what_was_put(self):
+        cache = QuoteCache()
+        cache.put(("SWDA.MI", "1Y"), series(3))
+
+        assert cache.get(("SWDA.MI", "1Y")) == series(3)
+        assert cache.get(("SWDA.MI", "5Y")) is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_least_recently_used_entry_is_evicted_first(self):
+        entry_size = QuoteCache()._estimate_size(series(10))
+        cache = QuoteCache(max_bytes=entry_size * 2)
+        cache.put(("A.MI",), series(10))
+        cache.put(("B.MI",), series(10))
+        cache.get(("A.MI",))  # A becomes the most recently used
+
+        cache.put(("C.MI",), series(10))
+
+        assert cache.get(("B.MI",)) is None
+        assert cache.get(("A.MI",)) is not None and cache.get(("C.MI",)) is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+    def test_values_larger_than_the_budget_are_not_cached(self):
+        cache = QuoteCache(max_bytes=100)
+        cache.put(("A.MI",), series(100))
+
+        assert cache.get(("A.MI",)) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_drops_every_key_of_the_ticker_only(self):
+        cache = QuoteCache()
+        cache.put(("A.MI", "1Y", None), series(2))
+        cache.put(("A.MI", "Max", 100), series(2))
+        cache.put(("B.MI", "1Y", None), series(2))
+
+        assert cache.invalidate("A.MI") == 2
+        assert cache.get(("A.MI", "1Y", None)) is None
+        assert cache.get(("B.MI", "1Y", None)) is not None
+
+    def test_put_after_an_invalidation_of_the_ticker_is_dropped(self):
+        cache = QuoteCache()
+        generation = cache.generation("A.MI")
+        other = cache.generation("B.MI")
+
+        cache.invalidate("A.MI")
+        cache.put(("A.MI", "1Y"), series(2), generation=generation)
+        cache.put(("B.MI", "1Y"), series(2), generation=other)
+
+        assert cache.get(("A.MI", "1Y")) is None
+        assert cache.get(("B.MI", "1Y")) is not None
+
+    def test_put_after_a_clear_is_dropped(self):
+        cache = QuoteCache()
+        generation = cache.generation("A.MI")
+
+        cache.clear()
+        cache.put(("A.MI", "1Y"), series(2), generation=generation)
+
+        assert cache.get(("A.MI", "1Y")) is None
+
+
+class TestQuoteServiceCaching:
+    """QuoteService keys the cache by ticker, period, day and points, and invalidates it on writes"""
+
+    def test_series_are_cached_per_period_and_points(self, quote_service, quotes):
+        quote_service.cache = QuoteCache()
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 50))
+
+        full = quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)
+        downsampled = quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX, points=10)
+
+        assert len(full[0]) == 50 and len(downsampled[0]) == 10
+        assert quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX) is full
+        assert quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX, points=10) is downsampled
+
+    def test_storing_quotes_invalidates_the_ticker(self, quote_service, quotes):
+        quote_service.cache = QuoteCache()
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+        assert len(quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)[0]) == 5
+
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 8))
+
+        assert len(quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)[0]) == 8
+        assert quote_service.cache.stats()["invalidations"] >= 1
+
+    def test_series_read_before_a_concurrent_write_is_not_cached(self, quote_service, quotes):
+        quote_service.cache = QuoteCache()
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+        query = quote_service._query_quote_series
+
+        def query_then_write(ticker, period):
+            # The write commits (and invalidates the ticker) after the rows were read
+            stale = query(ticker, period)
+            quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 8))
+            return stale
+
+        quote_service._query_quote_series = query_then_write
+        assert len(quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)[0]) == 5
+        quote_service._query_quote_series = query
+
+        assert len(quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)[0]) == 8
@@ -0,0 +1,182 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the conditional (ETag / Last-Modified) quotes endpoint"""
+import datetime as dt
+import pytest
+from sqlalchemy import update
+from werkzeug.http import http_date
+from controllers import QuoteController
+from models import QuoteSyncStateDAO
+
+
+@pytest.fixture
+def controller(quote_service, etf_service) -> QuoteController:
+    """QuoteController without a job queue (the update endpoints are not exercised)"""
+    return QuoteController(quote_service, etf_service, job_queue=None)
+
+
+def get_quotes(
+    app,
+    controller: QuoteController,
+    ticker: str,
+    headers: dict[str, str] | None = None,
+    period: str = "Max",
+    points: str | None = None,
+):
+    """Call get_quotes in a request context and return (response, status)"""
+    query: str = f"period={period}" + (f"&points={points}" if points is not None else "")
+    with app.test_request_context(f"/etfs/{ticker}/quotes?{query}", headers=headers or {}):
+        return controller.get_quotes(ticker)
+
+
+class TestConditionalQuotes:
+    """304 answers from the metadata lookup, 200 once the quotes change"""
+
+    def test_first_response_carries_validators(self, app, controller, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+
+        response, status = get_quotes(app, controller, "SWDA.MI")
+
+        assert status == 200
+        assert response.headers["ETag"] and response.headers["Last-Modified"]
+        assert len(response.get_json()["data"]) == 5
+
+    def test_matching_etag_is_not_modified(self, app, controller, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+        first, _ = get_quotes(app, controller, "SWDA.MI")
+
+        response, status = get_quotes(app, controller, "SWDA.MI", {"If-None-Match": first.headers["ETag"]})
+
+        assert status == 304
+        assert response.headers["ETag"] == first.headers["ETag"]
+        assert response.get_data() == b""
+
+    def test_if_modified_since_last_ingestion_is_not_modified(self, app, controller, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+        first, _ = get_quotes(app, controller, "SWDA.MI")
+
+        _, status = get_quotes(app, controller, "SWDA.MI", {"If-Modified-Since": first.headers["Last-Modified"]})
+
+        assert status == 304
+
+    def test_new_quotes_change_the_etag(self, app, controller, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+        first, _ = get_quotes(app, controller, "SWDA.MI")
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 6))
+
+        response, status = get_quotes(app, controller, "SWDA.MI", {"If-None-Match": first.headers["ETag"]})
+
+        assert status == 200
+        assert response.headers["ETag"] != first.headers["ETag"]
+
+    def test_restated_history_changes_the_etag(self, app, controller, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 10))
+        first, _ = get_quotes(app, controller, "SWDA.MI")
+        # Same dates and row count, every adjusted close rescaled
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-08", 5, close=105.0, adjust=0.9))
+
+        _, status = get_quotes(app, controller, "SWDA.MI", {"If-None-Match": first.headers["ETag"]})
+
+        assert status == 200
+
+    def test_if_modified_since_does_not_validate_yesterdays_window(
+        self, app, controller, db_manager, quote_service, quotes
+    ):
+        start = (dt.date.today() - dt.timedelta(days=60)).isoformat()
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes(start, 30))
+        # Last ingestion two days ago; the client cached the response yesterday
+        two_days_ago = dt.datetime.now(dt.timezone.utc).replace(tzinfo=None) - dt.timedelta(days=2)
+        with db_manager.write_session() as session:
+            session.execute(update(QuoteSyncStateDAO).values(updated_at=two_days_ago))
+        yesterday = {"If-Modified-Since": http_date(dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=1, hours=1))}
+
+        windowed, windowed_status = get_quotes(app, controller, "SWDA.MI", yesterday, period="1M")
+        _, max_status = get_quotes(app, controller, "SWDA.MI", yesterday, period="Max")
+
+        assert windowed_status == 200 and max_status == 304
+        midnight = dt.datetime.combine(dt.date.today(), dt.time()).astimezone(dt.timezone.utc)
+        assert windowed.last_modified == midnight
+
+    def test_unknown_ticker_is_not_found(self, app, controller):
+        _, status = get_quotes(app, controller, "NOPE.MI")
+
+        assert status == 404
+
+
+class TestChartPoints:
+    """Validation of the points (downsampling target) query parameter"""
+
+    @pytest.fixture(autouse=True)
+    def stored(self, quote_service, quotes):
+        """Twenty sessions of SWDA.MI"""
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+
+    def test_points_downsample_the_series(self, app, controller):
+        response, status = get_quotes(app, controller, "SWDA.MI", points="5")
+
+        assert status == 200 and len(response.get_json()["data"]) == 5
+
+    @pytest.mark.parametrize("points", ["abc", "5.5", "", "-1", "0", "2"])
+    def test_invalid_points_are_bad_requests(self, app, controller, points):
+        response, status = get_quotes(app, controller, "SWDA.MI", points=points)
+
+        assert status == 400
+        assert "points must be" in response.get_json()["error"]
+
+    def test_invalid_period_is_a_bad_request(self, app, controller):
+        response, status = get_quotes(app, controller, "SWDA.MI", period="2W")
+
+        assert status == 400 and response.get_json()["error"]
+
+
+def get_aligned_quotes(app, controller: QuoteController, query: str):
+    """Call get_aligned_quotes in a request context and return (response, status)"""
+    with app.test_request_context(f"/quotes?{query}"):
+        return controller.get_aligned_quotes()
+
+
+class TestAlignedQuotesEndpoint:
+    """Parameter validation and payload of /quotes"""
+
+    def test_matrix_payload(self, app, controller, quote_service, quotes):
+        quote_service.store_downloaded_quotes("A.MI", quotes("2024-01-01", 5))
+        quote_service.store_downloaded_quotes("B.MI", quotes("2024-01-02", 5, close=50.0))
+
+        response, status = get_aligned_quotes(app, controller, "tickers=b.mi,A.MI,B.MI&period=Max&normalize=100")
+
+        payload = response.get_json()
+        assert status == 200
+        assert payload["tickers"] == ["B.MI", "A.MI"] and payload["normalize"] == 100.0
+        assert len(payload["labels"]) == 6
+        assert payload["series"]["A.MI"][1] == payload["series"]["B.MI"][1] == 100.0
+
+    def test_too_many_tickers_is_a_bad_request(self, app, controller):
+        tickers = ",".join(f"T{index}.MI" for index in range(QuoteController.MAX_ALIGNED_TICKERS + 1))
+
+        _, status = get_aligned_quotes(app, controller, f"tickers={tickers}")
+
+        assert status == 400
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "",
+            "tickers=,",
+            "tickers=A.MI&normalize=0",
+            "tickers=A.MI&normalize=-1",
+            "tickers=A.MI&normalize=abc",
+            "tickers=A.MI&normalize=nan",
+            "tickers=A.MI&period=2W",
+        ],
+    )
+    def test_invalid_parameters_are_bad_requests(self, app, controller, query):
+        _, status = get_aligned_quotes(app, controller, query)
+
+        assert status == 400
+
+    def test_unknown_tickers_are_not_found(self, app, controller):
+        _, status = get_aligned_quotes(app, controller, "tickers=NOPE.MI&period=Max")
+
+        assert status == 404
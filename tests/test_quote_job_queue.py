@@ -0,0 +1,116 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the persisted background quote job queue"""
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Iterator
+import pytest
+from models import QuoteJobDAO
+from services import QuoteJobQueue
+
+
+class FakeEtfService:
+    """EtfService stand-in recording the updates it runs; blocks them until released"""
+
+    def __init__(self) -> None:
+        """Initialize FakeEtfService (released: updates return immediately)"""
+        self.calls: list[tuple[str, Any]] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def update_etf_quotes(self, ticker: str) -> dict[str, Any]:
+        """Record a single-ETF update"""
+        self.calls.append(("ticker", ticker))
+        assert self.release.wait(5)
+        return {"success": ticker != "FAIL.MI", "message": "Aggiornato" if ticker != "FAIL.MI" else "boom"}
+
+    def update_all_etf_quotes(self, resume: bool = False, source: str = "api") -> dict[str, Any]:
+        """Record a bulk update"""
+        self.calls.append(("all", resume))
+        assert self.release.wait(5)
+        return {"success": True, "message": "ok", "resumed": resume}
+
+
+@pytest.fixture
+def etf_service() -> FakeEtfService:
+    """Fake EtfService (overrides the real one of conftest)"""
+    return FakeEtfService()
+
+
+@pytest.fixture
+def job_queue(db_manager, app, etf_service) -> Iterator[QuoteJobQueue]:
+    """Job queue with its table and a single worker, drained on teardown"""
+    job_queue = QuoteJobQueue(db_manager, app, etf_service=etf_service, max_workers=1)
+    job_queue.ensure_tables()
+    yield job_queue
+    etf_service.release.set()
+    job_queue._executor.shutdown(wait=True)
+
+
+def wait_for_status(job_queue: QuoteJobQueue, job_id: str, statuses: tuple[str, ...], timeout: float = 5.0) -> dict:
+    """Poll a job until it reaches one of the statuses (fails the test on timeout)"""
+    deadline: float = time.monotonic() + timeout
+    while True:
+        job: dict = job_queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        assert time.monotonic() < deadline, f"job still {job['status']}"
+        time.sleep(0.01)
+
+
+class TestQuoteJobQueue:
+    """Submission, deduplication, outcomes and requeue on start"""
+
+    def test_ticker_job_succeeds_with_the_update_result(self, job_queue, etf_service):
+        job = job_queue.submit_ticker("SWDA.MI")
+
+        done = wait_for_status(job_queue, job["id"], ("succeeded", "failed"))
+
+        assert done["status"] == "succeeded" and done["result"]["message"] == "Aggiornato"
+        assert done["started_at"] and done["finished_at"]
+        assert etf_service.calls == [("ticker", "SWDA.MI")]
+
+    def test_unsuccessful_update_fails_the_job(self, job_queue):
+        job = job_queue.submit_ticker("FAIL.MI")
+
+        done = wait_for_status(job_queue, job["id"], ("succeeded", "failed"))
+
+        assert done["status"] == "failed" and done["error"] == "boom"
+
+    def test_active_jobs_are_deduplicated(self, job_queue, etf_service):
+        etf_service.release.clear()
+        running = job_queue.submit_ticker("SWDA.MI")
+        wait_for_status(job_queue, running["id"], ("running",))
+        # The single worker is busy: this one stays queued
+        queued = job_queue.submit_all()
+
+        assert job_queue.submit_ticker("SWDA.MI")["id"] == running["id"]
+        assert job_queue.submit_all(resume=True)["id"] == queued["id"]
+        assert job_queue.submit_ticker("CSSPX.MI")["id"] not in (running["id"], queued["id"])
+
+        etf_service.release.set()
+        wait_for_status(job_queue, queued["id"], ("succeeded",))
+        assert job_queue.submit_ticker("SWDA.MI")["id"] != running["id"]
+
+    def test_unfinished_jobs_are_requeued_on_start(self, job_queue, etf_service, db_manager):
+        with db_manager.write_session() as session:
+            for status in ("running", "succeeded"):
+                session.add(
+                    QuoteJobDAO(
+                        id=f"{status}-job", kind="all", resume=False, status=status, created_at=datetime.now()
+                    )
+                )
+
+        job_queue.start()
+
+        done = wait_for_status(job_queue, "running-job", ("succeeded", "failed"))
+        assert done["status"] == "succeeded" and done["resume"]
+        # An interrupted bulk update continues its checkpointed run
+        assert etf_service.calls == [("all", True)]
+
+    def test_unknown_job_is_none(self, job_queue):
+        assert job_queue.get(uuid.uuid4().hex) is None
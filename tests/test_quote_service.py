@@ -0,0 +1,340 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for QuoteService reads and writes on SQLite"""
+import datetime as dt
+import re
+import pytest
+from sqlalchemy import delete, event, func, select, text, update
+from core.database import db
+from dto import QuotePeriod
+from models import DividendDAO, QuoteDAO, QuoteSyncStateDAO
+
+
+def recent_start(days: int) -> str:
+    """Date string days before today"""
+    return (dt.date.today() - dt.timedelta(days=days)).isoformat()
+
+
+class TestQuoteSeries:
+    """(Date, Close) read path used by the chart endpoint"""
+
+    def test_series_matches_orm_quotes(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes(recent_start(60), 30))
+
+        dates, closes = quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)
+        orm_quotes = quote_service.get_quotes("SWDA.MI", QuotePeriod.MAX)
+
+        assert dates == [quote.date for quote in orm_quotes]
+        assert closes == [quote.close for quote in orm_quotes]
+        assert dates == sorted(dates) and len(dates) == 30
+
+    def test_series_is_limited_to_the_period(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes(recent_start(800), 500))
+
+        dates, _ = quote_service.get_quote_series("SWDA.MI", QuotePeriod.ONE_YEAR)
+
+        start = QuotePeriod.ONE_YEAR.get_start_date().date().isoformat()
+        assert dates and all(date > start for date in dates)
+        assert len(dates) < 500
+
+    def test_unknown_ticker_has_an_empty_series(self, quote_service):
+        assert quote_service.get_quote_series("NOPE.MI", QuotePeriod.MAX) == ([], [])
+
+
+class TestQuoteUpsert:
+    """INSERT ... ON CONFLICT counts in ignore and update mode"""
+
+    def test_first_store_inserts_every_row(self, quote_service, quotes):
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+
+        assert counts == {"inserted": 5, "updated": 0, "skipped": 0}
+
+    def test_ignore_mode_skips_stored_dates_and_keeps_their_values(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+        # Three stored dates with a different close (same Adj Close: no restatement) and two new dates
+        download = quotes("2024-01-03", 5, close=500.0)
+        download["Adj Close"] = quotes("2024-01-03", 5, close=102.0)["Adj Close"]
+
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", download)
+
+        assert counts == {"inserted": 2, "updated": 0, "skipped": 3}
+        dates, closes = quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)
+        assert len(dates) == 7
+        assert closes[2] == 102.0
+
+    def test_update_mode_overwrites_stored_dates(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+        download = quotes("2024-01-03", 5, close=500.0)
+        download["Adj Close"] = quotes("2024-01-03", 5, close=102.0)["Adj Close"]
+
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", download, restate=True)
+
+        assert counts == {"inserted": 2, "updated": 3, "skipped": 0}
+        _, closes = quote_service.get_quote_series("SWDA.MI", QuotePeriod.MAX)
+        assert closes[2] == 500.0
+
+    def test_repeated_download_is_all_skipped(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+
+        assert counts == {"inserted": 0, "updated": 0, "skipped": 5}
+
+    def test_empty_download_without_stored_quotes_fails(self, quote_service):
+        with pytest.raises(ValueError):
+            quote_service.store_downloaded_quotes("SWDA.MI", None)
+
+
+class TestRestatement:
+    """Adjusted closes restated by the provider after a distribution"""
+
+    def test_restated_overlap_rescales_the_older_history(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+        version = quote_service.get_quote_metadata("SWDA.MI")[2]
+
+        # The last 5 stored days downloaded again with every adjusted close 10% lower
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-22", 5, close=115.0, adjust=0.9))
+
+        assert counts == {"inserted": 0, "updated": 20, "skipped": 0}
+        stored = quote_service.get_quotes("SWDA.MI", QuotePeriod.MAX)
+        assert [quote.adj_close for quote in stored] == [round((100.0 + day) * 0.9, 2) for day in range(20)]
+        assert [quote.close for quote in stored] == [100.0 + day for day in range(20)]
+        assert quote_service.get_quote_metadata("SWDA.MI")[2] > version
+
+    def test_restatement_is_detected_in_ignore_mode_with_new_rows(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-22", 7, close=115.0, adjust=0.9))
+
+        assert counts == {"inserted": 2, "updated": 20, "skipped": 0}
+        assert quote_service.get_quotes("SWDA.MI", QuotePeriod.MAX)[0].adj_close == 90.0
+
+    def test_differences_within_the_tolerance_are_not_restatements(self, quote_service, quotes):
+        quote_service.restatement_tolerance = 0.05
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 20))
+        version = quote_service.get_quote_metadata("SWDA.MI")[2]
+        download = quotes("2024-01-22", 5, close=115.0)
+        download["Adj Close"] += 0.03
+
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", download)
+
+        assert counts == {"inserted": 0, "updated": 0, "skipped": 5}
+        assert quote_service.get_quotes("SWDA.MI", QuotePeriod.MAX)[0].adj_close == 100.0
+        assert quote_service.get_quote_metadata("SWDA.MI")[2] == version
+
+
+def sync_state(db_manager, ticker: str) -> tuple[str | None, int] | None:
+    """(last_date, row_count) of a ticker's sync state (None without a state row)"""
+    with db_manager.read_session() as session:
+        state = session.get(QuoteSyncStateDAO, ticker)
+        return (state.last_date, state.row_count) if state is not None else None
+
+
+def quotes_aggregate(db_manager, ticker: str) -> tuple[int | None, int]:
+    """(MAX(Date), COUNT(*)) of a ticker's stored quotes"""
+    with db_manager.read_session() as session:
+        stmt = select(func.max(QuoteDAO.Date), func.count()).where(QuoteDAO.Ticker == ticker)
+        last_day, row_count = session.execute(stmt).one()
+        return last_day, row_count
+
+
+class TestSyncState:
+    """quote_sync_state maintained incrementally by the write path"""
+
+    def test_state_follows_inserts_updates_and_backfills(self, quote_service, db_manager, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-02-01", 10))
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-02-08", 10), restate=True)
+        # Older history filled in later: last_date must not move back
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 5))
+
+        assert sync_state(db_manager, "SWDA.MI") == quotes_aggregate(db_manager, "SWDA.MI")
+        assert sync_state(db_manager, "SWDA.MI")[1] == 20
+
+    def test_writes_do_not_aggregate_the_quotes(self, quote_service, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 10))
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lower())
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 15))
+            quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-15", 10), restate=True)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+        assert statements and not any("count(" in statement for statement in statements)
+
+    def test_counts_do_not_depend_on_a_stale_state(self, quote_service, db_manager, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 10))
+        with db_manager.write_session() as session:
+            session.execute(update(QuoteSyncStateDAO).values(row_count=999))
+
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 15), restate=True)
+
+        assert counts == {"inserted": 5, "updated": 10, "skipped": 0}
+
+    def test_missing_state_is_initialized_from_the_quotes(self, quote_service, db_manager, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 10))
+        with db_manager.write_session() as session:
+            session.execute(delete(QuoteSyncStateDAO))
+
+        counts = quote_service.store_downloaded_quotes("SWDA.MI", quotes("2024-01-01", 12))
+
+        assert counts["inserted"] == 2
+        assert sync_state(db_manager, "SWDA.MI") == quotes_aggregate(db_manager, "SWDA.MI")
+
+
+class TestAlignedQuotes:
+    """Date x ticker matrix of several ETFs"""
+
+    @pytest.fixture(autouse=True)
+    def stored(self, quote_service, quotes):
+        """A.MI from 2024-01-01 (10 sessions), B.MI from 2024-01-03 (10 sessions, 2024-01-09 missing)"""
+        quote_service.store_downloaded_quotes("A.MI", quotes("2024-01-01", 10))
+        b_quotes = quotes("2024-01-03", 10, close=50.0)
+        quote_service.store_downloaded_quotes("B.MI", b_quotes.drop(index=b_quotes.index[4]))
+
+    def test_dates_are_the_union_with_forward_fill(self, quote_service):
+        dates, series = quote_service.get_aligned_quotes(["A.MI", "B.MI"], QuotePeriod.MAX)
+
+        assert dates[0] == "2024-01-01" and dates[-1] == "2024-01-16" and len(dates) == 12
+        assert series["A.MI"][-3:] == [109.0, 109.0, 109.0]
+        assert series["B.MI"][:3] == [None, None, 50.0]
+        # 2024-01-09 is missing for B.MI: the previous close is carried forward
+        assert series["B.MI"][dates.index("2024-01-09")] == series["B.MI"][dates.index("2024-01-08")] == 53.0
+
+    def test_normalization_rebases_on_the_first_common_date(self, quote_service):
+        dates, series = quote_service.get_aligned_quotes(["A.MI", "B.MI"], QuotePeriod.MAX, normalize=100.0)
+
+        common = dates.index("2024-01-03")
+        assert series["A.MI"][common] == series["B.MI"][common] == 100.0
+        assert series["A.MI"][0] == round(100.0 / 102.0 * 100, 4)
+        assert series["B.MI"][-1] == round(59.0 / 50.0 * 100, 4)
+
+    def test_unknown_tickers_have_empty_values(self, quote_service):
+        dates, series = quote_service.get_aligned_quotes(["A.MI", "NOPE.MI"], QuotePeriod.MAX, normalize=100.0)
+
+        assert series["NOPE.MI"] == [None] * len(dates)
+        assert series["A.MI"][0] == 100.0
+        assert quote_service.get_aligned_quotes(["NOPE.MI"], QuotePeriod.MAX) == ([], {"NOPE.MI": []})
+
+
+def stored_rows(db_manager, ticker: str) -> int:
+    """Number of stored quotes of a ticker"""
+    with db_manager.read_session() as session:
+        return session.scalar(select(func.count()).select_from(QuoteDAO).where(QuoteDAO.Ticker == ticker))
+
+
+class TestStagedCommit:
+    """store_staged_quotes: one transaction, one savepoint per ticker"""
+
+    @staticmethod
+    def without_close(frame, position: int):
+        """Copy of frame with a missing Close (NOT NULL in quotes) at the given row"""
+        frame = frame.copy()
+        frame.iloc[position, frame.columns.get_loc("Close")] = float("nan")
+        return frame
+
+    def test_failing_ticker_is_rolled_back_alone(self, quote_service, db_manager, quotes):
+        counts, errors = quote_service.store_staged_quotes(
+            {"A.MI": quotes("2024-01-01", 5), "B.MI": self.without_close(quotes("2024-01-01", 5), 2)}
+        )
+
+        assert counts == {"A.MI": {"inserted": 5, "updated": 0, "skipped": 0}}
+        assert list(errors) == ["B.MI"] and "NOT NULL" in errors["B.MI"]
+        assert stored_rows(db_manager, "A.MI") == 5 and stored_rows(db_manager, "B.MI") == 0
+        with db_manager.read_session() as session:
+            assert session.get(QuoteSyncStateDAO, "A.MI").last_status == "ok"
+            assert session.get(QuoteSyncStateDAO, "B.MI").last_status == "error"
+
+    def test_failed_ticker_keeps_its_stored_quotes_and_state(self, quote_service, db_manager, quotes):
+        quote_service.store_downloaded_quotes("B.MI", quotes("2024-01-01", 3))
+
+        _, errors = quote_service.store_staged_quotes(
+            {"A.MI": quotes("2024-01-01", 5), "B.MI": self.without_close(quotes("2024-01-01", 5), 3)}
+        )
+
+        assert list(errors) == ["B.MI"]
+        assert stored_rows(db_manager, "B.MI") == 3
+        with db_manager.read_session() as session:
+            state = session.get(QuoteSyncStateDAO, "B.MI")
+            assert (state.last_status, state.row_count) == ("error", 3)
+        assert sync_state(db_manager, "B.MI") == quotes_aggregate(db_manager, "B.MI")
+
+
+def stored_dividends(db_manager, ticker: str) -> list[tuple[str, float]]:
+    """(Date, Dividend) rows stored for a ticker"""
+    with db_manager.read_session() as session:
+        stmt = select(DividendDAO.Date, DividendDAO.Dividend).where(DividendDAO.Ticker == ticker)
+        return [(date, dividend) for date, dividend in session.execute(stmt.order_by(DividendDAO.Date)).all()]
+
+
+class TestDividends:
+    """Dividends downloaded with the quotes (actions=True adds a Dividends column)"""
+
+    @staticmethod
+    def with_dividend(frame, position: int, amount: float):
+        """Copy of frame with a Dividends column paying amount at the given row"""
+        frame = frame.copy()
+        frame["Dividends"] = 0.0
+        frame.iloc[position, frame.columns.get_loc("Dividends")] = amount
+        return frame
+
+    def test_repeated_download_does_not_duplicate_dividends(self, quote_service, db_manager, quotes):
+        frame = self.with_dividend(quotes("2024-01-01", 5), 3, 0.5)
+
+        quote_service.store_downloaded_quotes("SWDA.MI", frame)
+        quote_service.store_downloaded_quotes("SWDA.MI", frame)
+
+        assert stored_dividends(db_manager, "SWDA.MI") == [("2024-01-04", 0.5)]
+
+    def test_restated_download_updates_the_amount(self, quote_service, db_manager, quotes):
+        quote_service.store_downloaded_quotes("SWDA.MI", self.with_dividend(quotes("2024-01-01", 5), 3, 0.5))
+
+        quote_service.store_downloaded_quotes(
+            "SWDA.MI", self.with_dividend(quotes("2024-01-01", 5), 3, 0.55), restate=True
+        )
+
+        assert stored_dividends(db_manager, "SWDA.MI") == [("2024-01-04", 0.55)]
+
+    def test_staged_commit_does_not_duplicate_dividends(self, quote_service, db_manager, quotes):
+        frames = {"SWDA.MI": self.with_dividend(quotes("2024-01-01", 5), 3, 0.5), "CSSPX.MI": quotes("2024-01-01", 5)}
+
+        quote_service.store_staged_quotes(frames)
+        quote_service.store_staged_quotes(frames)
+
+        assert stored_dividends(db_manager, "SWDA.MI") == [("2024-01-04", 0.5)]
+        assert stored_dividends(db_manager, "CSSPX.MI") == []
+
+
+class TestQuoteSchema:
+    """Startup check of the quotes.Date column type"""
+
+    def replace_quotes_table(self, db_manager, ddl: str | None) -> None:
+        """Drop the quotes table and optionally recreate it with a legacy definition"""
+        with db_manager.write_session() as session:
+            session.execute(text(f"DROP TABLE {QuoteDAO.__tablename__}"))
+            if ddl is not None:
+                session.execute(text(ddl))
+
+    def test_integer_dates_pass(self, quote_service):
+        quote_service.check_quote_schema()
+
+    @pytest.mark.parametrize("date_type", ["VARCHAR(20)", "REAL"])
+    def test_legacy_dates_ask_for_the_migration(self, quote_service, db_manager, date_type):
+        self.replace_quotes_table(
+            db_manager,
+            f"CREATE TABLE quotes (Ticker VARCHAR(10), Date {date_type}, Close FLOAT, PRIMARY KEY (Ticker, Date))",
+        )
+
+        with pytest.raises(RuntimeError, match=f"{re.escape(date_type)}.*migrate_quote_dates.py"):
+            quote_service.check_quote_schema()
+
+    def test_missing_table_is_left_to_create_all(self, quote_service, db_manager):
+        self.replace_quotes_table(db_manager, None)
+
+        quote_service.check_quote_schema()
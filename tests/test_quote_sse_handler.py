@@ -0,0 +1,77 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the bulk quote update SSE stream"""
+import datetime as dt
+import json
+from typing import Any
+import pytest
+from controllers.quote_sse_handler import QuoteSSEHandler
+
+SLOW_S = 0.3
+
+
+def parse_events(chunks: list[str]) -> tuple[list[dict[str, Any]], int]:
+    """(data events in stream order, number of heartbeat comments)"""
+    events: list[dict[str, Any]] = [json.loads(chunk[len("data: "):]) for chunk in chunks if chunk.startswith("data: ")]
+    return events, chunks.count(QuoteSSEHandler.HEARTBEAT)
+
+
+class TestBulkQuoteUpdateEvents:
+    """Parallel updates streamed in completion order through a slow provider"""
+
+    @pytest.fixture
+    def etfs(self, app, add_etfs, provider, quotes, etf_service) -> list:
+        """SLOW.MI (slow download), FAIL.MI (download error) and FAST.MI, in list order"""
+        tickers: list[str] = ["SLOW.MI", "FAIL.MI", "FAST.MI"]
+        add_etfs(tickers)
+        start: str = (dt.date.today() - dt.timedelta(days=30)).isoformat()
+        provider.frames = {ticker: quotes(start, 20) for ticker in tickers}
+        provider.delays = {"SLOW.MI": SLOW_S, "FAIL.MI": SLOW_S / 3}
+        provider.failing = {"FAIL.MI": ConnectionError("boom")}
+        return [etf_service.get_by_ticker(ticker) for ticker in tickers]
+
+    @pytest.fixture
+    def update_etf(self, app, etf_service):
+        """Update function as wired by QuoteController (own app context per worker thread)"""
+
+        def update_etf(etf) -> None:
+            with app.app_context():
+                result: dict[str, Any] = etf_service.update_etf_quotes(etf.ticker)
+            if not result["success"]:
+                raise ValueError(result["message"])
+
+        return update_etf
+
+    def test_events_follow_completion_order_with_heartbeats(self, etfs, update_etf):
+        handler = QuoteSSEHandler(max_workers=3, heartbeat_s=0.05)
+
+        events, heartbeats = parse_events(list(handler.generate_bulk_quote_update_events(etfs, update_etf)))
+
+        progress: list[dict[str, Any]] = events[:-1]
+        assert [event["ticker"] for event in progress] == ["FAST.MI", "FAIL.MI", "SLOW.MI"]
+        assert [event["status"] for event in progress] == ["success", "error", "success"]
+        assert [event["current"] for event in progress] == [1, 2, 3]
+        assert heartbeats >= 1
+
+    def test_completion_payload_reports_wall_time_and_latency_percentiles(self, etfs, update_etf):
+        handler = QuoteSSEHandler(max_workers=3, heartbeat_s=0.05)
+
+        events, _ = parse_events(list(handler.generate_bulk_quote_update_events(etfs, update_etf)))
+
+        completion: dict[str, Any] = events[-1]
+        assert completion["done"] and completion["progress"] == 100
+        assert (completion["total"], completion["success_count"], completion["failed_count"]) == (3, 2, 1)
+        assert [failed["ticker"] for failed in completion["failed_etfs"]] == ["FAIL.MI"]
+        assert completion["wall_time_s"] >= SLOW_S
+        assert set(completion["latency_ms"]) == {"p50", "p90", "p95", "p99", "max"}
+        assert completion["latency_ms"]["max"] >= SLOW_S * 1000
+        assert completion["latency_ms"]["p50"] <= completion["latency_ms"]["p99"] <= completion["latency_ms"]["max"]
+
+    def test_empty_etf_list_reports_an_error(self):
+        handler = QuoteSSEHandler()
+
+        events, _ = parse_events(list(handler.generate_bulk_quote_update_events([], lambda etf: None)))
+
+        assert events == [{"error": "Nessun ETF trovato nel database"}]
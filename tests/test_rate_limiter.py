@@ -0,0 +1,164 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for the token bucket rate limiter and its retry backoff (on a fake clock)"""
+import pytest
+from core import rate_limiter
+from core.config import RateLimitConfig
+from core.rate_limiter import RateLimiter, ThrottledError, TokenBucket, TransientError, get_rate_limiter
+
+
+class FakeClock:
+    """Stand-in for the time module: sleep() advances monotonic() instantly"""
+
+    def __init__(self) -> None:
+        """Initialize FakeClock at an arbitrary origin"""
+        self.now: float = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        """Current fake time"""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the fake time"""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Fake clock used by core.rate_limiter, with the backoff jitter pinned to its ceiling"""
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    return clock
+
+
+def failing(*errors: Exception):
+    """Function raising the given errors in turn, then returning "ok" """
+    remaining = list(errors)
+
+    def func() -> str:
+        if remaining:
+            raise remaining.pop(0)
+        return "ok"
+
+    return func
+
+
+class TestTokenBucket:
+    """Burst, refill and pause"""
+
+    def test_burst_is_free_then_callers_wait_for_the_refill(self, clock):
+        bucket = TokenBucket(rate=2.0, capacity=3)
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert bucket.acquire() == pytest.approx(0.5)
+
+    def test_idle_time_refills_up_to_the_capacity(self, clock):
+        bucket = TokenBucket(rate=2.0, capacity=3)
+        bucket.acquire(3)
+        clock.now += 60
+
+        assert bucket.acquire(3) == 0.0
+        assert bucket.acquire() == pytest.approx(0.5)
+
+    def test_requests_above_the_capacity_wait_for_a_full_bucket_and_go_in_debt(self, clock):
+        bucket = TokenBucket(rate=1.0, capacity=2)
+
+        assert bucket.acquire(5) == 0.0
+        # Three tokens of debt plus the one requested
+        assert bucket.acquire() == pytest.approx(4.0)
+
+    def test_pause_blocks_even_a_full_bucket(self, clock):
+        bucket = TokenBucket(rate=2.0, capacity=3)
+        bucket.pause(10)
+
+        assert bucket.acquire() == pytest.approx(10.0)
+
+    def test_configure_keeps_tokens_up_to_the_new_capacity(self, clock):
+        bucket = TokenBucket(rate=2.0, capacity=10)
+        bucket.configure(rate=1.0, capacity=2)
+
+        assert bucket.acquire(2) == 0.0
+        assert bucket.acquire() == pytest.approx(1.0)
+
+
+class TestRateLimiter:
+    """Retries, backoff and metrics"""
+
+    def test_retries_transient_errors_with_exponential_backoff(self, clock):
+        limiter = RateLimiter(requests_per_second=100, burst=10, max_retries=3, backoff_base_s=1.0)
+
+        assert limiter.call(failing(TransientError("reset"), TransientError("reset"))) == "ok"
+        assert clock.sleeps == [1.0, 2.0]
+        stats = limiter.stats()
+        assert stats["calls"] == 3 and stats["retries"] == 2 and stats["transient_errors"] == 2
+
+    def test_throttling_pauses_the_shared_bucket(self, clock):
+        limiter = RateLimiter(requests_per_second=100, burst=10, backoff_base_s=4.0)
+
+        assert limiter.call(failing(ThrottledError("429"))) == "ok"
+        assert limiter.bucket._paused_until == pytest.approx(1000.0 + 4.0)
+        assert limiter.stats()["throttle_events"] == 1
+
+    def test_backoff_is_capped(self, clock):
+        limiter = RateLimiter(requests_per_second=100, burst=10, max_retries=4, backoff_base_s=1.0, backoff_max_s=3.0)
+
+        limiter.call(failing(*[TransientError("timeout")] * 4))
+
+        assert clock.sleeps == [1.0, 2.0, 3.0, 3.0]
+
+    def test_gives_up_after_max_retries(self, clock):
+        limiter = RateLimiter(requests_per_second=100, burst=10, max_retries=2)
+
+        with pytest.raises(ThrottledError):
+            limiter.call(failing(*[ThrottledError("429")] * 3))
+        assert limiter.stats()["calls"] == 3 and limiter.stats()["failures"] == 1
+
+    def test_other_exceptions_are_not_retried(self, clock):
+        limiter = RateLimiter(requests_per_second=100, burst=10)
+
+        with pytest.raises(KeyError):
+            limiter.call(failing(KeyError("SWDA.MI")))
+        assert limiter.stats()["calls"] == 1 and limiter.stats()["retries"] == 0
+
+    def test_callable_cost_is_evaluated_before_each_attempt(self, clock):
+        limiter = RateLimiter(requests_per_second=100, burst=10)
+        pending = ["A.MI", "B.MI", "C.MI", "D.MI", "E.MI"]
+
+        def download() -> str:
+            if len(pending) == 5:
+                del pending[2:]
+                raise TransientError("partial")
+            return "ok"
+
+        limiter.call(download, cost=lambda: len(pending))
+
+        assert limiter.stats()["tokens"] == 7
+
+    def test_arguments_are_passed_through(self, clock):
+        limiter = RateLimiter()
+
+        assert limiter.call(lambda a, b=0: a + b, 1, b=2, cost=3) == 3
+        assert limiter.stats()["tokens"] == 3
+
+
+class TestGetRateLimiter:
+    """Process-wide limiters shared by name"""
+
+    def test_same_name_returns_the_same_limiter(self):
+        assert get_rate_limiter("test-shared") is get_rate_limiter("test-shared")
+        assert get_rate_limiter("test-shared") is not get_rate_limiter("test-other")
+
+    def test_a_new_config_reconfigures_the_existing_limiter(self):
+        limiter = get_rate_limiter("test-reconfigured", config=RateLimitConfig(requests_per_second=1.0, burst=5))
+
+        same = get_rate_limiter("test-reconfigured", config=RateLimitConfig(requests_per_second=4.0, burst=2))
+
+        assert same is limiter
+        assert (limiter.bucket.rate, limiter.bucket.capacity) == (4.0, 2)
+        assert limiter.configure(RateLimitConfig(requests_per_second=4.0, burst=2)) is False
@@ -0,0 +1,118 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for single-flight coalescing of concurrent work"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import pytest
+from core.single_flight import SingleFlight, get_single_flight
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    """Poll condition until it holds (fails the test on timeout)"""
+    deadline: float = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.005)
+
+
+class BlockingWork:
+    """Work function that blocks until released and counts its calls"""
+
+    def __init__(self, result=None, error: Exception | None = None) -> None:
+        """
+        Initialize BlockingWork
+
+        Args:
+            result: Value returned once released
+            error: Exception raised once released instead
+        """
+        self.result = result
+        self.error = error
+        self.calls: int = 0
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def executor():
+    """Thread pool for concurrent callers"""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def call_concurrently(executor, flights: SingleFlight, work: BlockingWork, callers: int) -> list[Future]:
+    """Start one leader and callers - 1 followers on the same key, then release the work"""
+    futures: list[Future] = [executor.submit(flights.do, "SWDA.MI", work)]
+    wait_until(lambda: work.calls == 1)
+    futures += [executor.submit(flights.do, "SWDA.MI", work) for _ in range(callers - 1)]
+    wait_until(lambda: flights.stats()["coalesced"] == callers - 1)
+    work.release.set()
+    return futures
+
+
+class TestSingleFlight:
+    """Leaders, followers and key release"""
+
+    def test_concurrent_calls_share_one_execution(self, executor):
+        flights = SingleFlight("test")
+        work = BlockingWork(result={"inserted": 5})
+
+        futures = call_concurrently(executor, flights, work, callers=4)
+
+        assert [future.result(timeout=5) for future in futures] == [{"inserted": 5}] * 4
+        assert work.calls == 1
+        assert flights.stats() == {"name": "test", "in_flight": 0, "leaders": 1, "coalesced": 3}
+
+    def test_the_leader_error_is_raised_in_every_caller(self, executor):
+        flights = SingleFlight("test")
+        work = BlockingWork(error=ConnectionError("boom"))
+
+        futures = call_concurrently(executor, flights, work, callers=3)
+
+        for future in futures:
+            with pytest.raises(ConnectionError, match="boom"):
+                future.result(timeout=5)
+        assert work.calls == 1
+
+    def test_keys_are_released_once_resolved(self):
+        flights = SingleFlight("test")
+        calls: list[int] = []
+
+        flights.do("SWDA.MI", calls.append, 1)
+        flights.do("SWDA.MI", calls.append, 2)
+
+        assert calls == [1, 2]
+        assert flights.stats()["leaders"] == 2 and flights.stats()["in_flight"] == 0
+
+    def test_claim_leads_free_keys_and_follows_busy_ones(self):
+        flights = SingleFlight("test")
+        led, _ = flights.claim(["A.MI", "B.MI"])
+
+        second_led, followed = flights.claim(["B.MI", "C.MI", "B.MI"])
+
+        assert led == ["A.MI", "B.MI"]
+        assert second_led == ["C.MI"] and list(followed) == ["B.MI"]
+        flights.resolve("B.MI", result=7)
+        assert followed["B.MI"].wait(timeout=1) == 7
+        assert flights.stats()["in_flight"] == 2
+
+    def test_unresolved_flight_times_out(self):
+        flights = SingleFlight("test")
+        flights.claim(["A.MI"])
+        _, followed = flights.claim(["A.MI"])
+
+        with pytest.raises(TimeoutError):
+            followed["A.MI"].wait(timeout=0.01)
+
+    def test_registries_are_shared_by_name(self):
+        assert get_single_flight("test-shared") is get_single_flight("test-shared")
+        assert get_single_flight("test-shared") is not get_single_flight("test-other")
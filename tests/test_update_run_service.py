@@ -0,0 +1,93 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2025 Salvatore D'Angelo, Code4Projects
+# Licensed under the MIT License. See LICENSE.md for details.
+# -----------------------------------------------------------------------------
+"""Tests for checkpointed bulk quote update runs"""
+import datetime as dt
+from datetime import datetime
+import pytest
+
+END_DATE = datetime(2024, 1, 20)
+TICKERS = ["A.MI", "B.MI", "C.MI", "D.MI"]
+
+
+class TestUpdateRunService:
+    """Start, checkpoint and resume"""
+
+    def test_new_run_has_every_ticker_pending(self, run_service):
+        run_id, tickers, resumed = run_service.start(TICKERS, END_DATE, source="api")
+
+        assert tickers == TICKERS and not resumed
+        assert run_service.get_counts(run_id) == {"pending": 4, "ok": 0, "error": 0}
+
+    def test_resume_returns_failed_and_pending_tickers_in_request_order(self, run_service):
+        run_id, _, _ = run_service.start(TICKERS, END_DATE, source="cron")
+        run_service.checkpoint(run_id, {"A.MI": None, "C.MI": "boom"})
+
+        resumed_id, tickers, resumed = run_service.start(TICKERS, END_DATE, source="cron", resume=True)
+
+        assert resumed and resumed_id == run_id
+        assert tickers == ["B.MI", "C.MI", "D.MI"]
+        assert run_service.get_counts(run_id) == {"pending": 2, "ok": 1, "error": 1}
+        assert run_service.get_errors(run_id) == {"C.MI": "boom"}
+
+    def test_resume_with_nothing_left_continues_the_finished_run(self, run_service):
+        run_id, _, _ = run_service.start(TICKERS, END_DATE, source="api")
+        run_service.checkpoint(run_id, dict.fromkeys(TICKERS))
+        run_service.finish(run_id)
+
+        assert run_service.start(TICKERS, END_DATE, source="api", resume=True) == (run_id, [], True)
+
+    def test_a_new_end_date_starts_a_new_run(self, run_service):
+        run_id, _, _ = run_service.start(TICKERS, END_DATE, source="cron")
+
+        next_id, tickers, resumed = run_service.start(
+            TICKERS, END_DATE + dt.timedelta(days=1), source="cron", resume=True
+        )
+
+        assert next_id != run_id and tickers == TICKERS and not resumed
+
+    def test_without_resume_a_new_run_is_started(self, run_service):
+        run_id, _, _ = run_service.start(TICKERS, END_DATE, source="cron")
+
+        next_id, tickers, resumed = run_service.start(TICKERS, END_DATE, source="cron")
+
+        assert next_id != run_id and tickers == TICKERS and not resumed
+
+
+class TestResumedBulkUpdate:
+    """EtfService.update_all_etf_quotes over a checkpointed run"""
+
+    @pytest.fixture(autouse=True)
+    def etfs(self, add_etfs, provider, quote_service, quotes):
+        """Two ETFs with a month of recent quotes; one batch per ticker so failures stay isolated"""
+        add_etfs(["A.MI", "B.MI"])
+        start = (dt.date.today() - dt.timedelta(days=30)).isoformat()
+        provider.frames = {ticker: quotes(start, 30) for ticker in ("A.MI", "B.MI")}
+        quote_service.download_batch_size = 1
+
+    def test_resume_only_updates_failed_etfs(self, etf_service, provider):
+        provider.failing = {"B.MI": ConnectionError("boom")}
+        first = etf_service.update_all_etf_quotes(source="cron")
+        assert first["success_count"] == 1 and first["failed_etfs"][0]["ticker"] == "B.MI"
+        provider.failing.clear()
+        provider.calls.clear()
+
+        second = etf_service.update_all_etf_quotes(resume=True, source="cron")
+
+        assert second["resumed"] and second["run_id"] == first["run_id"]
+        assert [result["ticker"] for result in second["results"]] == ["B.MI"]
+        assert [tickers for tickers, _, _ in provider.calls] == [["B.MI"]]
+
+    def test_resume_with_nothing_left_reports_the_run(self, etf_service, provider):
+        provider.failing = {"B.MI": ConnectionError("boom")}
+        first = etf_service.update_all_etf_quotes(source="cron")
+        provider.failing.clear()
+        etf_service.update_all_etf_quotes(resume=True, source="cron")
+
+        summary = etf_service.update_all_etf_quotes(resume=True, source="cron")
+
+        assert summary["resumed"] and summary["run_id"] == first["run_id"]
+        assert summary["success"] and summary["results"] == []
+        assert (summary["total"], summary["success_count"], summary["failed_count"]) == (2, 2, 0)
+        assert summary["message"] == "Nessun ETF da riprendere: 2 successi, 0 errori"